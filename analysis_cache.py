@@ -0,0 +1,278 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from job_specific_scorer import load_criteria_plan
+from matcher import analyze_resume
+from parser import PdfExtractionResult, extract_text_from_pdf
+from tfidf_model import get_tfidf_model
+
+# Bump whenever the analysis output can change for identical inputs (for
+# example after a scoring heuristic changes) so stale entries are never served.
+CACHE_VERSION = 2
+
+# Optional path of the SQLite tier used by the default cache.
+CACHE_DB_ENV = "RESUME_REVIEWER_CACHE_DB"
+
+
+def _sha256(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def analysis_key(resume_text, job_desc_text, resume_sections, job_type, criteria_digest, tfidf_digest=None):
+    """Content-addressed key for one ``analyze_resume`` call."""
+    payload = json.dumps(
+        [CACHE_VERSION, "analysis", _sha256(resume_text), _sha256(job_desc_text),
+         resume_sections, job_type, criteria_digest, tfidf_digest],
+        sort_keys=True,
+    )
+    return _sha256(payload)
+
+
+def pdf_key(pdf_bytes):
+    """Content-addressed key for the text extracted from a PDF."""
+    return _sha256(json.dumps([CACHE_VERSION, "pdf", _sha256(pdf_bytes)]))
+
+
+def extraction_key(pdf_bytes, options):
+    """Content-addressed key for a bounded extraction of a PDF with the given limits."""
+    return _sha256(json.dumps([CACHE_VERSION, "extraction", _sha256(pdf_bytes), options], sort_keys=True))
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of JSON-serializable analysis results.
+
+    The first tier is an in-memory LRU bounded by entry count and by the total
+    size of the serialized values. The optional second tier is an SQLite
+    database on disk that survives restarts; it is bounded by size and evicts
+    the least recently used entries first. Values are stored as JSON, so every
+    hit returns a fresh copy the caller is free to mutate.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, db_path=None,
+                 max_db_bytes=512 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory.
+            max_bytes: Maximum total size of the serialized values kept in memory.
+            db_path: Path of the SQLite tier, or None to keep the cache in memory only.
+            max_db_bytes: Maximum total size of the values kept in the SQLite tier.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_db_bytes = max_db_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        self._db_bytes = 0
+        if db_path is not None:
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._db.commit()
+            self._db_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key):
+        """Returns a copy of the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            serialized = self._memory.get(key)
+            if serialized is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return json.loads(serialized)
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self.stats["disk_hits"] += 1
+                    self._remember(key, row[0])
+                    return json.loads(row[0])
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        """Stores ``value`` under ``key`` in every tier."""
+        serialized = json.dumps(value)
+        with self._lock:
+            self._remember(key, serialized)
+            if self._db is not None:
+                self._store(key, serialized)
+
+    def clear(self):
+        """Drops every entry from both tiers. Counters are kept."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+                self._db_bytes = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _remember(self, key, serialized):
+        size = len(serialized)
+        if size > self.max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = serialized
+        self._memory_bytes += size
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
+
+    def _store(self, key, serialized):
+        size = len(serialized)
+        if size > self.max_db_bytes:
+            return
+        row = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._db_bytes -= row[0]
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, serialized, size, time.time()),
+        )
+        self._db_bytes += size
+        while self._db_bytes > self.max_db_bytes:
+            oldest = self._db.execute(
+                "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed LIMIT 1", (key,)
+            ).fetchone()
+            if oldest is None:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (oldest[0],))
+            self._db_bytes -= oldest[1]
+            self.stats["evictions"] += 1
+        self._db.commit()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """
+    Returns the process-wide cache, creating it on first use.
+
+    The SQLite tier is enabled when the ``RESUME_REVIEWER_CACHE_DB`` environment
+    variable names a database file.
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = AnalysisCache(db_path=os.environ.get(CACHE_DB_ENV) or None)
+    return _default_cache
+
+
+def cached_extract_text_from_pdf(pdf_file, cache=None):
+    """
+    ``extract_text_from_pdf`` keyed by a hash of the PDF bytes.
+
+    Args:
+        pdf_file: The PDF as bytes or a file-like object.
+        cache: The AnalysisCache to use (default: the process-wide cache).
+
+    Returns:
+        The extracted text as a string.
+    """
+    if cache is None:
+        cache = get_default_cache()
+    pdf_bytes = pdf_file if isinstance(pdf_file, bytes) else pdf_file.read()
+    key = pdf_key(pdf_bytes)
+    text = cache.get(key)
+    if text is None:
+        text = extract_text_from_pdf(io.BytesIO(pdf_bytes))
+        cache.put(key, text)
+    return text
+
+
+def cached_extraction(pdf_bytes, extract, cache=None, **options):
+    """
+    A bounded extraction of a PDF keyed by its bytes and the extraction limits.
+
+    Failed extractions raise and are not cached, so a retry tries again.
+
+    Args:
+        pdf_bytes: The PDF as bytes.
+        extract: Called as ``extract(pdf_bytes, **options)`` on a miss; returns
+            a ``parser.PdfExtractionResult``, e.g. from ``extract_text_bounded``.
+        cache: The AnalysisCache to use (default: the process-wide cache).
+        options: The limits that determine the result, e.g. ``max_pages``.
+
+    Returns:
+        The ``parser.PdfExtractionResult``.
+    """
+    if cache is None:
+        cache = get_default_cache()
+    key = extraction_key(pdf_bytes, options)
+    cached = cache.get(key)
+    if cached is not None:
+        return PdfExtractionResult(*cached)
+    result = extract(pdf_bytes, **options)
+    cache.put(key, list(result))
+    return result
+
+
+def current_analysis_key(resume_text, job_desc_text, resume_sections, job_type="general"):
+    """The ``analysis_key`` of an ``analyze_resume`` call under the current criteria and TF-IDF model."""
+    tfidf_model = get_tfidf_model()
+    return analysis_key(resume_text, job_desc_text, resume_sections, job_type, load_criteria_plan().digest,
+                        tfidf_model.digest if tfidf_model is not None else None)
+
+
+def put_analysis(cache, key, analysis):
+    """Stores an ``analyze_resume`` result under ``key``."""
+    # Timings describe this call only and must not be replayed on later hits.
+    cache.put(key, {name: value for name, value in analysis.items() if name != "trace"})
+
+
+def cached_analyze_resume(resume_text, job_desc_text, resume_sections, job_type="general", cache=None,
+                          context=None):
+    """
+    ``analyze_resume`` keyed by the resume, job description, job type, criteria and TF-IDF model version.
+
+    Args:
+        resume_text: The extracted resume text
+        job_desc_text: The job description text
+        resume_sections: Dictionary of detected resume sections
+        job_type: The type of job being applied for (default: "general")
+        cache: The AnalysisCache to use (default: the process-wide cache)
+        context: An AnalysisContext for the analysis on a miss, e.g. with already parsed Docs
+
+    Returns:
+        A dictionary containing scores and feedback, as from ``analyze_resume``.
+    """
+    if cache is None:
+        cache = get_default_cache()
+    key = current_analysis_key(resume_text, job_desc_text, resume_sections, job_type)
+    analysis = cache.get(key)
+    if analysis is None:
+        analysis = analyze_resume(resume_text, job_desc_text, resume_sections, job_type, context=context)
+        put_analysis(cache, key, analysis)
+    return analysis
@@ -0,0 +1,145 @@
+import threading
+
+from nlp_provider import is_long, parse, parse_chunks
+from resume_features import extract_resume_features
+
+# Functions ``func(doc, text)`` of one parsed text that contexts run over
+# every chunk of a long text in a single pass; see ``doc_consumer``.
+_doc_consumers = []
+
+
+def doc_consumer(func):
+    """
+    Registers ``func(doc, text)`` to run in the single pass over a long text.
+
+    A long text is streamed through the pipeline in chunks whose Docs are not
+    kept (see ``nlp_provider.parse_chunks``). So that it is parsed once rather
+    than once per check, every registered function runs on each chunk during
+    that pass and only its results are kept. An unregistered function still
+    works with ``ParsedText.doc_results``, but streams the text again.
+
+    Returns:
+        ``func``, so this can be used as a decorator.
+    """
+    if func not in _doc_consumers:
+        _doc_consumers.append(func)
+    return func
+
+
+class ParsedText:
+    """
+    A text and its parse, which several contexts may share.
+
+    A text of ordinary length is parsed into one ``Doc`` on first use. A long
+    text is streamed in chunks once, feeding every registered ``doc_consumer``.
+    """
+
+    def __init__(self, text, doc=None):
+        """
+        Args:
+            text: The text.
+            doc: Its already parsed ``Doc``, e.g. from ``nlp.pipe``.
+        """
+        self.text = text
+        self._doc = doc
+        self._chunk_results = None
+        self._lock = threading.Lock()
+
+    @property
+    def doc(self):
+        """The parsed text, parsed on first access."""
+        if self._doc is None:
+            self._doc = parse(self.text)
+        return self._doc
+
+    @property
+    def parsed(self):
+        """Whether the whole text has been parsed into one ``doc`` already."""
+        return self._doc is not None
+
+    def doc_results(self, func):
+        """
+        ``func(doc, text)`` for every Doc of the parsed text, in text order.
+
+        This is one result for the shared ``doc``, except for a long text that
+        has not been parsed yet: that one gets a result per chunk, all taken
+        from the single pass over its chunks.
+        """
+        if self.parsed or not is_long(self.text):
+            return [func(self.doc, self.text)]
+        with self._lock:
+            if self._chunk_results is None:
+                consumers = list(_doc_consumers)
+                results = {consumer: [] for consumer in consumers}
+                for text, doc in parse_chunks(self.text, with_text=True):
+                    for consumer in consumers:
+                        results[consumer].append(consumer(doc, text))
+                self._chunk_results = results
+            if func not in self._chunk_results:
+                self._chunk_results[func] = [func(doc, text)
+                                             for text, doc in parse_chunks(self.text, with_text=True)]
+            return self._chunk_results[func]
+
+
+class AnalysisContext:
+    """
+    Per-request cache of the parsed resume and job description.
+
+    Each document is parsed at most once, with its original casing, and the
+    resulting ``Doc`` is shared by every analysis stage. Stages that compare
+    text case-insensitively (such as keyword extraction) read the lowercase
+    view off the same tokens instead of parsing a lowercased copy. A long
+    document is streamed in chunks once for all stages (see ``doc_consumer``).
+    """
+
+    def __init__(self, resume_text, job_desc_text="", resume_doc=None, job_desc_doc=None, job_desc=None):
+        """
+        Args:
+            resume_text: The extracted resume text.
+            job_desc_text: The job description text.
+            resume_doc: An already parsed resume ``Doc``, e.g. from ``nlp.pipe``.
+            job_desc_doc: An already parsed job description ``Doc``.
+            job_desc: A ``ParsedText`` of the job description to share with
+                other contexts, e.g. across a batch; it replaces ``job_desc_doc``.
+        """
+        self.resume_text = resume_text
+        self.job_desc_text = job_desc_text
+        self.resume = ParsedText(resume_text, resume_doc)
+        self.job_desc = job_desc if job_desc is not None else ParsedText(job_desc_text, job_desc_doc)
+        self._resume_features = None
+        self._keyword_hits = {}
+
+    @property
+    def resume_doc(self):
+        """The parsed resume, parsed on first access."""
+        return self.resume.doc
+
+    @property
+    def job_desc_doc(self):
+        """The parsed job description, parsed on first access."""
+        return self.job_desc.doc
+
+    @property
+    def resume_features(self):
+        """The regex-based ResumeFeatures of the resume, computed on first access."""
+        if self._resume_features is None:
+            self._resume_features = extract_resume_features(self.resume_text)
+        return self._resume_features
+
+    def keyword_hits(self, keyword_matcher):
+        """
+        Scans the resume with ``keyword_matcher`` once and caches the per-group hits.
+
+        Every Keywords criterion of a plan shares one matcher, so the resume is
+        scanned a single time no matter how many criteria read the result. An
+        already parsed resume is scanned as it is; otherwise it is only
+        tokenized, which is enough to match keywords.
+        """
+        hits = self._keyword_hits.get(keyword_matcher)
+        if hits is None:
+            if self.resume.parsed:
+                hits = keyword_matcher.scan_docs([self.resume.doc])
+            else:
+                hits = keyword_matcher.scan(self.resume_text)
+            self._keyword_hits[keyword_matcher] = hits
+        return hits
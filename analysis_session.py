@@ -0,0 +1,299 @@
+"""
+Incremental re-analysis of one resume against changing job descriptions.
+
+``AnalysisSession`` models ``analyze_resume`` as a graph of stages with
+explicit inputs. Every stage remembers the versions of the inputs it was last
+computed from, so when only the job description changes, only its downstream
+stages (job description keywords, TF-IDF, skill match and missing keywords)
+run again. Resume-only stages, such as the parsed resume, its keywords and the
+job-specific scoring (which never reads the job description), are reused.
+Flipping the job type only selects a different final stage.
+
+``analyze_progressively`` computes the same stages one at a time, cheapest
+first, and reports a partial analysis after each: the section and regex-based
+scores come first, then the TF-IDF score, then the spaCy keyword match and,
+for software engineering, the NLP-based criteria.
+"""
+import copy
+import threading
+from contextlib import nullcontext
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import tracing
+from analysis_context import AnalysisContext
+from job_specific_scorer import JobSpecificScorer
+from matcher import (_general_analysis, _keyword_match, _software_engineering_analysis,
+                     calculate_tfidf_similarity, extract_keywords, keywords_from_parsed)
+
+# Values supplied by the caller rather than computed by a stage.
+INPUTS = ("scorer", "resume_text", "resume_sections", "job_desc_text")
+
+
+class Stage(NamedTuple):
+    """One node of the analysis graph: a function of the named inputs and stages."""
+    inputs: Tuple[str, ...]
+    compute: Callable
+
+
+def _resume_keywords(context):
+    with tracing.span("keywords"):
+        return keywords_from_parsed(context.resume)
+
+
+def _job_desc_keywords(job_desc_text):
+    with tracing.span("keywords"):
+        return extract_keywords(job_desc_text)
+
+
+def _job_specific(scorer, context, resume_sections):
+    with tracing.span("job_specific"):
+        return scorer.score_software_engineering_resume(context.resume_text, resume_sections, context)
+
+
+def _job_specific_fast(scorer, context, resume_sections):
+    with tracing.span("job_specific_fast"):
+        return scorer.score_software_engineering_resume(context.resume_text, resume_sections, context,
+                                                        include_nlp=False)
+
+
+STAGES: Dict[str, Stage] = {
+    "resume_context": Stage(("resume_text",), AnalysisContext),
+    "resume_keywords": Stage(("resume_context",), _resume_keywords),
+    "job_desc_keywords": Stage(("job_desc_text",), _job_desc_keywords),
+    "keyword_score": Stage(("resume_text", "job_desc_text"), calculate_tfidf_similarity),
+    "keyword_match": Stage(("resume_keywords", "job_desc_keywords"), _keyword_match),
+    "job_specific": Stage(("scorer", "resume_context", "resume_sections"), _job_specific),
+    "job_specific_fast": Stage(("scorer", "resume_context", "resume_sections"), _job_specific_fast),
+    "general": Stage(
+        ("resume_text", "resume_sections", "keyword_score", "keyword_match"),
+        lambda resume_text, resume_sections, keyword_score, match: _general_analysis(
+            resume_text, resume_sections, keyword_score, *match)),
+    "software_engineering": Stage(
+        ("resume_sections", "keyword_score", "keyword_match", "job_specific"),
+        lambda resume_sections, keyword_score, match, job_specific: _software_engineering_analysis(
+            resume_sections, keyword_score, *match, job_specific)),
+}
+
+# The inputs or stages ``analyze_progressively`` brings up to date, in order,
+# reporting a partial analysis after each.
+PROGRESSIVE_STEPS = {
+    "general": ("resume_sections", "keyword_score", "keyword_match"),
+    "software_engineering": ("job_specific_fast", "keyword_score", "keyword_match", "job_specific"),
+}
+
+
+class AnalysisSession:
+    """
+    Memoized analysis graph for a sequence of ``analyze`` calls.
+
+    Each call returns what ``analyze_resume`` returns for the same arguments.
+    A session is safe to share between threads; calls are serialized.
+    """
+
+    def __init__(self, scorer=None):
+        """
+        Args:
+            scorer: The JobSpecificScorer to use (default: one for the default criteria file).
+        """
+        self._values = {}
+        self._versions = {}
+        # Stage name -> versions of its inputs when it was last computed
+        self._computed_from = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+        # Names of the stages the last ``analyze`` call computed, in order
+        self.last_computed: List[str] = []
+        self._set("scorer", scorer or JobSpecificScorer())
+
+    def _set(self, name, value):
+        """Stores a value, giving it a new version unless it equals the current one."""
+        if name in self._values and self._values[name] == value:
+            return
+        self._values[name] = value
+        self._clock += 1
+        self._versions[name] = self._clock
+
+    def _get(self, name):
+        """Returns an input or a stage's value, recomputing stale stages first."""
+        stage = STAGES.get(name)
+        if stage is None:
+            return self._values[name]
+        arguments = [self._get(dependency) for dependency in stage.inputs]
+        versions = tuple(self._versions[dependency] for dependency in stage.inputs)
+        if self._computed_from.get(name) != versions:
+            self._set(name, stage.compute(*arguments))
+            self._computed_from[name] = versions
+            self.last_computed.append(name)
+        return self._values[name]
+
+    def _current(self, name):
+        """Returns an input or a stage's value if it is up to date, without computing anything, else None."""
+        stage = STAGES.get(name)
+        if stage is None:
+            return self._values.get(name)
+        if any(self._current(dependency) is None for dependency in stage.inputs):
+            return None
+        if self._computed_from.get(name) != tuple(self._versions[dependency] for dependency in stage.inputs):
+            return None
+        return self._values[name]
+
+    def _set_inputs(self, resume_text, job_desc_text, resume_sections):
+        self.last_computed = []
+        self._set("resume_text", resume_text)
+        self._set("resume_sections", resume_sections)
+        self._set("job_desc_text", job_desc_text)
+
+    def _analysis(self, job_type, trace):
+        if job_type == "software_engineering":
+            analysis = copy.deepcopy(self._get("software_engineering"))
+        else:
+            analysis = copy.deepcopy(self._get("general"))
+            analysis["job_type"] = job_type
+        if trace is not None:
+            analysis["trace"] = trace.as_dict()
+        return analysis
+
+    def _partial_analysis(self, job_type):
+        """The analysis assembled from the stages computed so far, with the rest set to None."""
+        resume_sections = self._values["resume_sections"]
+        keyword_score = self._current("keyword_score")
+        match = self._current("keyword_match")
+        skill_match_score, missing_keywords = match if match is not None else (0.0, [])
+        if job_type == "software_engineering":
+            job_specific = self._current("job_specific")
+            analysis = _software_engineering_analysis(
+                resume_sections, keyword_score or 0.0, skill_match_score, missing_keywords,
+                job_specific or self._current("job_specific_fast"))
+        else:
+            analysis = _general_analysis(self._values["resume_text"], resume_sections, keyword_score or 0.0,
+                                         skill_match_score, missing_keywords, job_type)
+
+        pending = []
+        if keyword_score is None:
+            analysis["keyword_score"] = None
+            pending.append("keyword_score")
+        if match is None:
+            analysis["skill_match_score"] = analysis["missing_keywords"] = None
+            pending.append("keyword_match")
+        if job_type == "software_engineering" and job_specific is None:
+            analysis["job_specific_score"] = None
+            pending.append("job_specific")
+        if pending:
+            analysis["total_score"] = None
+        analysis["pending"] = pending
+        return copy.deepcopy(analysis)
+
+    def analyze(self, resume_text, job_desc_text, resume_sections, job_type="general"):
+        """
+        Analyzes the resume against the job description, reusing every stage whose inputs are unchanged.
+
+        Args:
+            resume_text: The extracted resume text
+            job_desc_text: The job description text
+            resume_sections: Dictionary of detected resume sections
+            job_type: The type of job being applied for (default: "general")
+
+        Returns:
+            A new analysis dictionary, as returned by ``analyze_resume``.
+        """
+        with self._lock, tracing.request("analyze_resume") as trace:
+            self._set_inputs(resume_text, job_desc_text, resume_sections)
+            return self._analysis(job_type, trace)
+
+    def analyze_progressively(self, resume_text, job_desc_text, resume_sections, job_type="general",
+                              on_update=None, cancel=None):
+        """
+        Analyzes like ``analyze``, reporting a partial analysis as each step of ``PROGRESSIVE_STEPS`` finishes.
+
+        A partial analysis has the keys of the full one. Values that depend on
+        a stage still to come are None (``total_score`` until every stage is
+        done, and the NLP-based criteria of the job-specific scores), and its
+        ``pending`` key lists the stages still to come.
+
+        Args:
+            resume_text: The extracted resume text
+            job_desc_text: The job description text
+            resume_sections: Dictionary of detected resume sections
+            job_type: The type of job being applied for (default: "general")
+            on_update: Called with each partial analysis.
+            cancel: A ``threading.Event``; once set, the analysis stops before its next step.
+
+        Returns:
+            A new analysis dictionary, as returned by ``analyze``, or None if cancelled.
+        """
+        steps = PROGRESSIVE_STEPS["software_engineering" if job_type == "software_engineering" else "general"]
+        with self._lock, tracing.request("analyze_resume") as trace:
+            self._set_inputs(resume_text, job_desc_text, resume_sections)
+            for step in steps:
+                if cancel is not None and cancel.is_set():
+                    return None
+                self._get(step)
+                if on_update is not None:
+                    on_update(self._partial_analysis(job_type))
+            return self._analysis(job_type, trace)
+
+
+class AnalysisJob:
+    """
+    One ``analyze_progressively`` call running on a background thread.
+
+    The latest partial analysis can be polled with ``wait``, and ``cancel``
+    stops the run before its next step, e.g. when the inputs have changed.
+    """
+
+    def __init__(self, session, resume_text, job_desc_text, resume_sections, job_type="general", timed=False):
+        """
+        Args:
+            session: The AnalysisSession to run on.
+            resume_text, job_desc_text, resume_sections, job_type: As for ``analyze_progressively``.
+            timed: Trace the run, so the final analysis carries a ``trace`` breakdown.
+        """
+        self.analysis = None
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self._updates = 0
+        self._cancel = threading.Event()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, args=(session, resume_text, job_desc_text, resume_sections, job_type, timed),
+            name="analysis-job", daemon=True)
+        self._thread.start()
+
+    def _publish(self, analysis):
+        with self._condition:
+            self.analysis = analysis
+            self._updates += 1
+            self._condition.notify_all()
+
+    def _run(self, session, resume_text, job_desc_text, resume_sections, job_type, timed):
+        try:
+            with tracing.trace("streamlit") if timed else nullcontext():
+                analysis = session.analyze_progressively(resume_text, job_desc_text, resume_sections, job_type,
+                                                         on_update=self._publish, cancel=self._cancel)
+            if analysis is None:
+                self.cancelled = True
+            else:
+                self._publish(analysis)
+        except Exception as e:
+            self.error = e
+        finally:
+            with self._condition:
+                self.done = True
+                self._condition.notify_all()
+
+    def cancel(self):
+        """Asks the run to stop before its next step."""
+        self._cancel.set()
+
+    def wait(self, seen=0, timeout=None):
+        """
+        Waits until there is an update newer than ``seen`` or the run is done.
+
+        Returns:
+            An ``(updates, analysis)`` tuple: the number of updates so far,
+            to pass back as ``seen``, and the latest analysis (None before the first).
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._updates > seen or self.done, timeout)
+            return self._updates, self.analysis
@@ -1,15 +1,132 @@
+import hashlib
+
 import streamlit as st
-from parser import extract_text_from_pdf, extract_sections
-from matcher import analyze_resume
+from analysis_cache import cached_extract_text_from_pdf
+from analysis_session import AnalysisJob, AnalysisSession
+from job_specific_scorer import JobSpecificScorer, load_criteria_plan
+from nlp_provider import get_nlp
+from parser import extract_sections
+from tfidf_model import get_tfidf_model
 
 st.set_page_config(page_title="AI Resume Reviewer", layout="wide")
 
+# Every widget interaction reruns this script, so each stage below is cached:
+# process-wide resources once per server, and per-resume results keyed by the
+# hash of the uploaded file's bytes. Parameters starting with an underscore are
+# excluded from Streamlit's cache keys; the hash stands in for them. Scoring
+# results are also keyed by the criteria and TF-IDF model digests, so editing
+# either file never serves stale scores.
+CACHE_ENTRIES = 32
+
+
+@st.cache_resource
+def load_pipeline():
+    """The shared spaCy pipeline, loaded once per server."""
+    return get_nlp()
+
+
+@st.cache_resource(max_entries=1)
+def load_scorer(criteria_digest):
+    """The JobSpecificScorer for the default criteria file, built once per criteria version."""
+    return JobSpecificScorer()
+
+
+def _model_digests():
+    tfidf_model = get_tfidf_model()
+    return load_criteria_plan().digest, tfidf_model.digest if tfidf_model is not None else None
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def extract_resume(resume_hash, _pdf_bytes):
+    """
+    Extracts the text and sections of an uploaded resume.
+
+    Behind the in-memory ``st.cache_data``, extraction goes through the
+    ``analysis_cache``, whose SQLite tier outlives app restarts.
+    """
+    resume_text = cached_extract_text_from_pdf(_pdf_bytes)
+    return resume_text, extract_sections(resume_text)
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def resume_session(resume_hash, digests):
+    """
+    The AnalysisSession of one resume, shared by every analysis of it.
+
+    Pasting another job description reuses the session's resume-only stages,
+    including the job-specific scoring.
+    """
+    load_pipeline()
+    return AnalysisSession(load_scorer(digests[0]))
+
+
+def start_analysis(resume_hash, job_desc, job_type, resume_text, resume_sections, timed=False):
+    """
+    The background analysis of one resume for one job description and job type.
+
+    The job is kept in the session state, so reruns keep polling the same
+    run. Changing any input cancels the previous run and starts a new one on
+    the resume's AnalysisSession, which reuses every stage whose inputs did
+    not change: switching the job type only reruns the scoring that differs.
+    """
+    digests = _model_digests()
+    key = (resume_hash, job_desc, job_type, digests, timed)
+    job = st.session_state.get("analysis_job")
+    if job is not None and st.session_state.get("analysis_key") == key:
+        return job
+    if job is not None:
+        job.cancel()
+    job = AnalysisJob(resume_session(resume_hash, digests), resume_text, job_desc, resume_sections, job_type,
+                      timed=timed)
+    st.session_state.analysis_job = job
+    st.session_state.analysis_key = key
+    return job
+
+
+def stream_results(job, placeholder):
+    """
+    Redraws the results in ``placeholder`` each time the job publishes a more complete analysis.
+
+    Returns:
+        The final analysis.
+    """
+    seen = 0
+    while True:
+        # Read before waiting: a job that finishes right after wait returns gets one more round.
+        done = job.done
+        updates, analysis = job.wait(seen)
+        if updates != seen:
+            seen = updates
+            with placeholder.container():
+                display_results(analysis)
+        if done:
+            break
+    if job.error is not None:
+        raise job.error
+    return analysis
+
+
+PENDING = "⏳ calculating..."
+
+
+def _percent(value):
+    return PENDING if value is None else f"{value * 100:.2f}%"
+
+
 def display_results(analysis):
-    """Displays the analysis results in a user-friendly format."""
+    """
+    Displays the analysis results in a user-friendly format.
+
+    A partial analysis (see ``AnalysisSession.analyze_progressively``) shows
+    its missing scores as still being calculated.
+    """
     st.subheader("Analysis Results")
 
-    score = analysis['total_score'] * 100
-    st.progress(int(score), text=f"Overall Match Score: {score:.2f}%")
+    if analysis['total_score'] is None:
+        st.progress(0, text=f"Overall Match Score: {PENDING}")
+    else:
+        score = analysis['total_score'] * 100
+        st.progress(int(score), text=f"Overall Match Score: {score:.2f}%")
 
     # Show job type specific information
     job_type = analysis.get('job_type', 'general')
@@ -23,13 +140,13 @@ def display_results(analysis):
     with col1:
         st.info("Score Breakdown")
         if job_type == 'software_engineering':
-            st.markdown(f"- **Job-Specific Score:** {analysis.get('job_specific_score', 0)*100:.2f}%")
-            st.markdown(f"- **Keyword/Semantic Match:** {analysis['keyword_score']*100:.2f}%")
-            st.markdown(f"- **Skill Match:** {analysis['skill_match_score']*100:.2f}%")
+            st.markdown(f"- **Job-Specific Score:** {_percent(analysis.get('job_specific_score', 0))}")
+            st.markdown(f"- **Keyword/Semantic Match:** {_percent(analysis['keyword_score'])}")
+            st.markdown(f"- **Skill Match:** {_percent(analysis['skill_match_score'])}")
         else:
-            st.markdown(f"- **Keyword/Semantic Match:** {analysis['keyword_score']*100:.2f}%")
-            st.markdown(f"- **Skill Match:** {analysis['skill_match_score']*100:.2f}%")
-            st.markdown(f"- **Structure & Readability:** {analysis['structure_score']*100:.2f}%")
+            st.markdown(f"- **Keyword/Semantic Match:** {_percent(analysis['keyword_score'])}")
+            st.markdown(f"- **Skill Match:** {_percent(analysis['skill_match_score'])}")
+            st.markdown(f"- **Structure & Readability:** {_percent(analysis['structure_score'])}")
 
     with col2:
         st.info("Resume Structure")
@@ -66,7 +183,9 @@ def display_results(analysis):
                     st.markdown("---")
     
     st.info("Missing Keywords & Suggestions")
-    if analysis['missing_keywords']:
+    if analysis['missing_keywords'] is None:
+        st.caption(f"Keywords: {PENDING}")
+    elif analysis['missing_keywords']:
         st.warning("**Keywords to Consider Adding:**")
         st.markdown(f"`{', '.join(analysis['missing_keywords'])}`")
     else:
@@ -78,6 +197,16 @@ def display_results(analysis):
         )
 
 
+def display_timings(trace):
+    """Displays where the time of one analysis went, slowest stage first."""
+    with st.expander(f"⏱️ Timing Breakdown ({trace['total_ms']:.0f} ms total)"):
+        st.caption("Stage times include nested stages, e.g. keywords includes spaCy parsing.")
+        st.table([
+            {"Stage": stage, "Calls": timing["count"], "Time (ms)": round(timing["ms"], 2)}
+            for stage, timing in trace["stages"].items()
+        ])
+
+
 def main():
     st.title("📄 AI Resume Reviewer")
     st.markdown("Upload your resume and paste a job description to get an instant analysis and improvement tips.")
@@ -102,22 +231,34 @@ def main():
 
     resume_file = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
     job_desc = st.text_area("Paste the Job Description here", height=300)
+    show_timings = st.checkbox("Show timing breakdown", value=False)
 
+    # Keep showing results after the click, so later interactions such as
+    # switching the job type update them instead of clearing them.
     if st.button("Analyze Resume", type="primary"):
-        if resume_file is not None and job_desc:
-            with st.spinner("Analyzing... This may take a moment."):
-                try:
-                    resume_text = extract_text_from_pdf(resume_file)
-                    resume_sections = extract_sections(resume_text)
-                    
-                    analysis_results = analyze_resume(resume_text, job_desc, resume_sections, selected_job_type)
-                    
-                    display_results(analysis_results)
-
-                except Exception as e:
-                    st.error(f"An error occurred during analysis: {e}")
-        else:
+        st.session_state.analyze_requested = True
+        if resume_file is None or not job_desc:
+            st.session_state.analyze_requested = False
             st.warning("Please upload a resume and paste a job description.")
 
+    # The analysis runs in the background: the section and regex-based scores
+    # show up at once, and the TF-IDF, keyword and NLP results as they finish.
+    # Changing an input mid-run cancels it (see start_analysis).
+    if st.session_state.get("analyze_requested") and resume_file is not None and job_desc:
+        try:
+            with st.spinner("Extracting resume text..."):
+                pdf_bytes = resume_file.getvalue()
+                resume_hash = hashlib.sha256(pdf_bytes).hexdigest()
+                resume_text, resume_sections = extract_resume(resume_hash, pdf_bytes)
+
+            job = start_analysis(resume_hash, job_desc, selected_job_type, resume_text, resume_sections,
+                                 timed=show_timings)
+            analysis_results = stream_results(job, st.empty())
+            if analysis_results is not None and "trace" in analysis_results:
+                display_timings(analysis_results["trace"])
+
+        except Exception as e:
+            st.error(f"An error occurred during analysis: {e}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
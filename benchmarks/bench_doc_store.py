@@ -0,0 +1,74 @@
+"""
+Benchmark loading resumes from the doc store against parsing them again.
+
+Stores seeded synthetic resumes in a ``doc_store.DocStore`` and then times
+``get_many`` for the whole batch against ``extract_sections`` plus
+``nlp.pipe`` over the same texts, which is what a re-scoring run without the
+store repeats for every resume (on top of PDF extraction, not timed here).
+Checks that the loaded Docs carry the same tokens and tags as fresh ones.
+
+Usage:
+    python benchmarks/bench_doc_store.py [--resumes 200] [--pages 1 3] [--repeat 3]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from doc_store import DocStore, content_key
+from generator import generate_resume
+from nlp_provider import parse_many
+from parser import PdfExtractionResult, extract_sections
+
+
+def reparse(texts):
+    """Sections and parses every text, used as the baseline."""
+    return [extract_sections(text) for text in texts], list(parse_many(texts))
+
+
+def _best_seconds(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'pages':>5} {'resumes':>8} {'MB stored':>10} {'parse ms/doc':>13} {'load ms/doc':>12} {'speedup':>8}")
+    for pages in args.pages:
+        texts = [generate_resume(pages, seed=seed) for seed in range(args.resumes)]
+        keys = [content_key(text) for text in texts]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "docs.db"
+            store = DocStore(path)
+            store.add_many((key, PdfExtractionResult(text, pages, False), None) for key, text in zip(keys, texts))
+
+            _, fresh = reparse(texts)
+            loaded = store.get_many(keys)
+            for key, doc in zip(keys, fresh):
+                stored = loaded[key].doc
+                if [(t.text, t.tag_, t.lemma_) for t in stored] != [(t.text, t.tag_, t.lemma_) for t in doc]:
+                    raise SystemExit(f"Loaded Doc differs from a fresh parse for {pages}-page resumes")
+
+            parse_ms = _best_seconds(lambda: reparse(texts), args.repeat) * 1000 / len(texts)
+            load_ms = _best_seconds(lambda: store.get_many(keys), args.repeat) * 1000 / len(texts)
+            store.close()
+            megabytes = sum(f.stat().st_size for f in Path(directory).iterdir()) / 1e6
+        print(f"{pages:>5} {len(texts):>8} {megabytes:>10.1f} {parse_ms:>13.2f} {load_ms:>12.2f} "
+              f"{parse_ms / load_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
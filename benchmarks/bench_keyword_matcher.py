@@ -0,0 +1,77 @@
+"""
+Benchmark keyword scans as the keyword taxonomy grows.
+
+Times three ways of finding which keywords of a taxonomy occur in a seeded
+synthetic resume: the previous per-keyword substring check on the lowercased
+text (``keyword in text_lower``), ``KeywordMatcher.scan_docs`` over a Doc the
+analysis has already parsed, and ``KeywordMatcher.scan`` which tokenizes the
+text first. The taxonomy is the shipped criteria keywords padded with
+synthetic skill names; substring checks grow with it, token lookups do not.
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py [--keywords 20 200 2000 20000] [--pages 5] [--repeat 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from generator import generate_resume
+from job_specific_scorer import load_criteria_plan
+from keyword_matcher import KeywordMatcher
+from nlp_provider import parse
+
+
+def make_taxonomy(size):
+    """The shipped criteria keywords followed by synthetic ones, ``size`` in total."""
+    keywords = list(dict.fromkeys(
+        keyword for group in load_criteria_plan().keyword_matcher.groups for keyword in group
+    ))
+    keywords += [f"skill{index}" for index in range(size - len(keywords))]
+    return keywords[:size]
+
+
+def substring_scan(keywords, text):
+    """The previous approach: one substring check per keyword."""
+    text_lower = text.lower()
+    return {keyword for keyword in keywords if keyword in text_lower}
+
+
+def _best_seconds(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keywords", type=int, nargs="+", default=[20, 200, 2000, 20000])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    text = generate_resume(args.pages, seed=args.pages)
+    doc = parse(text)
+    print(f"resume: {len(text)} chars, {len(doc)} tokens")
+    print(f"{'keywords':>9} {'substring ms':>13} {'scan_docs ms':>13} {'scan ms':>9} {'found':>6}")
+    for size in args.keywords:
+        keywords = make_taxonomy(size)
+        matcher = KeywordMatcher([keywords])
+        found = matcher.scan_docs([doc])[0]
+        if found != matcher.scan(text)[0]:
+            raise SystemExit(f"scan and scan_docs disagree for {size} keywords")
+
+        substring = _best_seconds(lambda: substring_scan(keywords, text), args.repeat)
+        docs = _best_seconds(lambda: matcher.scan_docs([doc]), args.repeat)
+        tokenized = _best_seconds(lambda: matcher.scan(text), args.repeat)
+        print(f"{size:>9} {substring * 1000:>13.3f} {docs * 1000:>13.3f} {tokenized * 1000:>9.3f} {len(found):>6}")
+
+
+if __name__ == "__main__":
+    main()
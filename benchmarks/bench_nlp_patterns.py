@@ -0,0 +1,96 @@
+"""
+Benchmark the compiled passive-voice and action-verb checks.
+
+Compares ``nlp_patterns.passive_counts`` and ``nlp_patterns.action_verb_counts``
+(called as the scorer calls it, through ``ParsedText.doc_results``) with
+Python loops over the tokens (kept below as the reference): the previous
+passive-voice loop over every sentence, and a per-bullet token lookup that
+applies the same lemma, inflected form and verb tag rule. Every document is
+parsed once, outside the timed region, so only the checks themselves are
+timed. Reports throughput for each and checks that the counts are identical.
+
+Usage:
+    python benchmarks/bench_nlp_patterns.py [--pages 1 10 50] [--repeat 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from analysis_context import ParsedText
+from generator import generate_resume
+from nlp_patterns import (ACTION_VERB_FORMS, ACTION_VERB_LEMMAS, VERB_TAGS, action_verb_counts, get_patterns,
+                          passive_counts)
+from nlp_provider import parse
+from resume_features import BULLET_PATTERN
+
+
+def reference_passive_counts(doc):
+    """The previous token loop of ``_check_passive_voice``, used as the baseline."""
+    total_sentences = 0
+    passive_sentences = 0
+    for sent in doc.sents:
+        total_sentences += 1
+        tokens = [token for token in sent]
+        for i, token in enumerate(tokens[:-1]):
+            if token.lemma_ in ['be'] and tokens[i+1].tag_ in ['VBN']:
+                passive_sentences += 1
+                break
+    return total_sentences, passive_sentences
+
+
+def reference_action_verb_counts(doc):
+    """The action-verb rule as a Python lookup of each bullet's first token, used as the baseline."""
+    tokens = {token.idx: token for token in doc}
+    bullets = list(BULLET_PATTERN.finditer(doc.text))
+    count = 0
+    for bullet in bullets:
+        token = tokens.get(bullet.start(1))
+        if token is None:
+            words = bullet.group(1).split()
+            count += bool(words and words[0].lower() in ACTION_VERB_FORMS)
+        elif token.lemma_ in ACTION_VERB_LEMMAS or token.lower_ in ACTION_VERB_FORMS:
+            count += token.pos_ == "VERB" or token.tag_ in VERB_TAGS
+    return len(bullets), count
+
+
+def _throughput(func, argument, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(argument)
+        best = min(best, time.perf_counter() - start)
+    return 1.0 / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    get_patterns()
+    print(f"{'pages':>6} {'check':>12} {'reference/s':>12} {'current/s':>10} {'speedup':>8} {'reference':>10} {'current':>10}")
+    for pages in args.pages:
+        text = generate_resume(pages, seed=pages)
+        doc = parse(text)
+        checks = (
+            ("passive", reference_passive_counts, passive_counts),
+            ("action verb", reference_action_verb_counts,
+             lambda doc: ParsedText(text, doc).doc_results(action_verb_counts)[0]),
+        )
+        for name, reference, current in checks:
+            expected, actual = reference(doc), current(doc)
+            if expected != actual:
+                raise SystemExit(f"{name} counts differ from the reference for {pages} pages")
+            reference_rate = _throughput(reference, doc, args.repeat)
+            current_rate = _throughput(current, doc, args.repeat)
+            print(f"{pages:>6} {name:>12} {reference_rate:>12.1f} {current_rate:>10.1f} "
+                  f"{current_rate / reference_rate:>7.1f}x {'%d/%d' % expected[::-1]:>10} {'%d/%d' % actual[::-1]:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark the shared, lazily loaded spaCy pipeline against per-module loading.
+
+Each scenario runs in a fresh interpreter. The baseline imports ``matcher``
+and ``job_specific_scorer`` plus what they used to do at import time: two
+module-level ``spacy.load`` calls with every component enabled, whose
+pipeline then parses the documents. The current scenario imports the same
+modules, which no longer touches spaCy, and parses through ``nlp_provider``,
+which loads one pipeline without NER on first use. Reports the import time, the time to the first
+parsed document, the per-document parse latency and the peak RSS.
+
+Usage:
+    python benchmarks/bench_nlp_provider.py [--resumes 50] [--pages 1] [--repeat 3]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PRELUDE = f"""
+import json, resource, sys, time
+sys.path.append({str(ROOT)!r})
+sys.path.append({str(ROOT / "benchmarks")!r})
+from generator import generate_resume
+texts = [generate_resume(PAGES, seed=seed) for seed in range(RESUMES)]
+start = time.perf_counter()
+"""
+
+SCENARIOS = {
+    "per-module load": """
+import matcher, job_specific_scorer
+import spacy
+nlp = spacy.load("en_core_web_sm")
+scorer_nlp = spacy.load("en_core_web_sm")
+import_seconds = time.perf_counter() - start
+nlp(texts[0])
+parse = nlp
+""",
+    "shared pipeline": """
+import matcher, job_specific_scorer
+from nlp_provider import parse
+import_seconds = time.perf_counter() - start
+parse(texts[0])
+""",
+}
+
+EPILOGUE = """
+first_seconds = time.perf_counter() - start
+best = float("inf")
+for _ in range(REPEAT):
+    begin = time.perf_counter()
+    for text in texts:
+        parse(text)
+    best = min(best, time.perf_counter() - begin)
+print(json.dumps({
+    "import_s": import_seconds,
+    "first_s": first_seconds,
+    "parse_ms": best * 1000 / len(texts),
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def run_scenario(body, resumes, pages, repeat):
+    """Runs one scenario in a fresh interpreter and returns its measurements."""
+    code = (PRELUDE + body + EPILOGUE).replace("RESUMES", str(resumes)).replace(
+        "PAGES", str(pages)).replace("REPEAT", str(repeat))
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'scenario':>16} {'import s':>9} {'first doc s':>12} {'parse ms/doc':>13} {'peak RSS MB':>12}")
+    for name, body in SCENARIOS.items():
+        result = run_scenario(body, args.resumes, args.pages, args.repeat)
+        print(f"{name:>16} {result['import_s']:>9.3f} {result['first_s']:>12.3f} "
+              f"{result['parse_ms']:>13.2f} {result['rss_mb']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark top-k queries of the resume index as the pool grows.
+
+Builds ``resume_index.ResumeIndex`` pools of synthetic keyword sets (terms
+drawn from a Zipf distribution, as keywords are in real resumes) and times
+MaxScore ``search`` against exhaustively scoring every resume with one sparse
+matrix product over the same weights. Reports the median query latency of
+each and checks that both return the same top-k scores.
+
+Usage:
+    python benchmarks/bench_resume_index.py [--sizes 10000 100000] [--k 100] [--queries 20]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from resume_index import ResumeIndex, _term_hashes
+
+VOCABULARY_SIZE = 50_000
+TERMS_PER_RESUME = 60
+TERMS_PER_QUERY = 30
+
+
+def _sample_terms(rng, count):
+    return ["term%d" % term for term in np.unique(rng.zipf(1.3, size=count) % VOCABULARY_SIZE)]
+
+
+def exhaustive_search(index, keywords, k):
+    """Scores every resume with one sparse product over the index's weights, used as the baseline."""
+    arrays = index._arrays
+    matrix = csr_matrix((arrays["weights"], arrays["postings"], arrays["offsets"]),
+                        shape=(len(arrays["terms"]), len(index)))
+    query = _term_hashes(keywords)
+    columns = np.searchsorted(arrays["terms"], query)
+    known = columns < len(arrays["terms"])
+    known[known] = arrays["terms"][columns[known]] == query[known]
+    vector = np.zeros(len(arrays["terms"]))
+    vector[columns[known]] = arrays["idf"][columns[known]]
+    scores = matrix.T @ vector / np.linalg.norm(vector)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return np.sort(scores[top])[::-1]
+
+
+def _median_ms(func, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    queries = [_sample_terms(rng, TERMS_PER_QUERY) for _ in range(args.queries)]
+    print(f"{'resumes':>9} {'postings':>10} {'build s':>8} {'exhaustive ms':>14} {'maxscore ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        index = ResumeIndex()
+        for i in range(size):
+            index.add("resume_%d" % i, None, keywords=_sample_terms(rng, TERMS_PER_RESUME))
+        index.search(keywords=queries[0], k=args.k)
+        build_seconds = time.perf_counter() - start
+
+        for query in queries:
+            expected = exhaustive_search(index, query, args.k)
+            actual = [match.score for match in index.search(keywords=query, k=args.k)]
+            if not np.allclose(actual, expected[:len(actual)], rtol=1e-5):
+                raise SystemExit(f"Top-{args.k} scores differ from exhaustive search for {size} resumes")
+        exhaustive_ms = _median_ms(lambda query: exhaustive_search(index, query, args.k), queries)
+        maxscore_ms = _median_ms(lambda query: index.search(keywords=query, k=args.k), queries)
+        print(f"{size:>9} {len(index._arrays['postings']):>10} {build_seconds:>8.1f} {exhaustive_ms:>14.2f} "
+              f"{maxscore_ms:>12.2f} {exhaustive_ms / maxscore_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
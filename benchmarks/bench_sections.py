@@ -0,0 +1,115 @@
+"""
+Benchmark ``parser.extract_sections`` on large multi-page resume texts.
+
+Compares the current implementation with the previous per-line, per-section
+regex implementation (kept below as the reference), checks that both return
+identical output and reports the speedup.
+
+Usage:
+    python benchmarks/bench_sections.py [--pages 1 10 50] [--repeat 5]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from parser import extract_sections
+from utils import RESUME_SECTIONS
+
+
+def reference_extract_sections(text):
+    """The previous implementation of ``extract_sections``, used as the baseline."""
+    sections = {}
+    text_lines = text.split("\n")
+    current_section = None
+    section_content = []
+
+    section_patterns = {
+        canonical: r"^\s*(?:" + "|".join(re.escape(s) for s in synonyms) + r")\s*$"
+        for canonical, synonyms in RESUME_SECTIONS.items()
+    }
+
+    for line in text_lines:
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+
+        section_found = None
+        for section_name, pattern in section_patterns.items():
+            if re.match(pattern, line_stripped, re.IGNORECASE):
+                section_found = section_name
+                break
+
+        if section_found:
+            if current_section and section_content:
+                sections[current_section] = "\n".join(section_content).strip()
+            current_section = section_found
+            section_content = []
+        elif current_section:
+            section_content.append(line)
+
+    if current_section and section_content:
+        sections[current_section] = "\n".join(section_content).strip()
+
+    for canonical, synonyms in RESUME_SECTIONS.items():
+        if canonical not in sections:
+            for synonym in synonyms:
+                if re.search(r"\b" + re.escape(synonym) + r"\b", text, re.IGNORECASE):
+                    sections[canonical] = True
+                    break
+
+    return sections
+
+
+WORDS = (
+    "developed implemented designed scalable services python java kubernetes "
+    "reduced latency customers pipeline data platform team led migration cloud "
+    "tested deployed monitored improved reliability api backend frontend"
+).split()
+
+
+def make_resume(pages, seed=0, headers=("EXPERIENCE", "Projects", "Technical Skills")):
+    """Builds a resume of roughly ``pages`` pages (about 50 lines each)."""
+    rng = random.Random(seed)
+    lines = ["Jane Doe", "jane@example.com"]
+    for page in range(pages):
+        lines.append(headers[page % len(headers)])
+        for _ in range(48):
+            lines.append("- " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 16))))
+    # Mention a section only in running text so implicit detection is exercised.
+    lines.append("References and certifications available on request.")
+    return "\n".join(lines)
+
+
+def _time(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'pages':>6} {'lines':>7} {'reference ms':>13} {'current ms':>11} {'speedup':>8}")
+    for pages in args.pages:
+        text = make_resume(pages, seed=pages)
+        if extract_sections(text) != reference_extract_sections(text):
+            raise SystemExit(f"Output differs from the reference implementation for {pages} pages")
+        reference = _time(reference_extract_sections, text, args.repeat)
+        current = _time(extract_sections, text, args.repeat)
+        lines = text.count("\n") + 1
+        print(f"{pages:>6} {lines:>7} {reference * 1000:>13.2f} {current * 1000:>11.2f} {reference / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
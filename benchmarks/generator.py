@@ -0,0 +1,143 @@
+"""
+Seeded generator of synthetic resumes and job descriptions for benchmarks.
+
+The same ``(pages, seed)`` always produces the same text, so timings from
+different runs are measured on identical inputs. Resumes are built from the
+kinds of lines the scorer looks at: section headers, bullets that start with
+action (or weak) verbs, quantified metrics, technology keywords and the
+occasional passive sentence. A page is about 50 lines.
+
+Usage:
+    python benchmarks/generator.py --pages 10 --seed 3 > resume.txt
+    python benchmarks/generator.py --job --seed 3 > job.txt
+"""
+import argparse
+import random
+
+LINES_PER_PAGE = 50
+
+FIRST_NAMES = ("Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie")
+LAST_NAMES = ("Nguyen", "Smith", "Garcia", "Patel", "Kim", "Okafor", "Novak", "Silva")
+COMPANIES = ("Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Hooli", "Vandelay")
+TITLES = ("Software Engineer", "Senior Software Engineer", "Backend Developer", "Data Engineer",
+          "Platform Engineer", "Full Stack Developer")
+ACTION_VERBS = ("Developed", "Implemented", "Designed", "Built", "Created", "Led", "Managed", "Optimized",
+                "Improved", "Reduced", "Increased", "Deployed", "Migrated", "Automated", "Architected")
+WEAK_VERBS = ("Worked on", "Helped with", "Was responsible for", "Participated in", "Assisted with")
+TECHNOLOGIES = ("Python", "Java", "C++", "Go", "SQL", "PostgreSQL", "MongoDB", "AWS", "GCP", "Azure",
+                "Docker", "Kubernetes", "REST", "gRPC", "GraphQL", "React", "Node.js", "TypeScript",
+                "Kafka", "Redis", "Spark", "Terraform")
+OBJECTS = ("a payment service", "the data pipeline", "internal APIs", "a recommendation engine",
+           "the CI/CD workflow", "a customer dashboard", "the search backend", "monitoring and alerting",
+           "a caching layer", "the onboarding flow")
+OUTCOMES = ("cutting latency by {pct}%", "saving ${amount}K per year", "serving {users}K daily users",
+            "improving throughput by {pct}%", "reducing incidents by {pct}%", "across {teams} teams")
+PASSIVE = ("The system was designed by a team of {teams} engineers.",
+           "Requirements were gathered from {teams} stakeholder groups.",
+           "The migration was completed ahead of schedule.")
+DEGREES = ("B.S. in Computer Science", "M.S. in Software Engineering", "B.Eng. in Computer Engineering")
+SCHOOLS = ("State University", "Institute of Technology", "City College")
+
+JOB_DUTIES = ("design and build scalable backend services", "own features end to end",
+              "collaborate with product and design", "improve reliability and observability",
+              "mentor junior engineers", "write clean, tested code", "participate in code reviews")
+
+
+def _outcome(rng):
+    return rng.choice(OUTCOMES).format(pct=rng.randint(5, 80), amount=rng.randint(10, 900),
+                                       users=rng.randint(1, 500), teams=rng.randint(2, 12))
+
+
+def _bullet(rng, quality):
+    marker = rng.choice(("•", "-", "*"))
+    verb = rng.choice(ACTION_VERBS) if rng.random() < quality else rng.choice(WEAK_VERBS)
+    tech = ", ".join(rng.sample(TECHNOLOGIES, rng.randint(1, 3)))
+    line = "%s %s %s with %s" % (marker, verb, rng.choice(OBJECTS), tech)
+    if rng.random() < quality:
+        line += ", " + _outcome(rng)
+    if rng.random() < 0.15:
+        line += " " + " ".join(rng.choice(OBJECTS).split()[-1] for _ in range(rng.randint(15, 30)))
+    return line + "."
+
+
+def _experience_block(rng, quality):
+    lines = ["%s, %s (%d - %d)" % (rng.choice(TITLES), rng.choice(COMPANIES),
+                                   rng.randint(2010, 2018), rng.randint(2019, 2025))]
+    lines.extend(_bullet(rng, quality) for _ in range(rng.randint(3, 6)))
+    if rng.random() > quality:
+        lines.append(rng.choice(PASSIVE).format(teams=rng.randint(2, 9)))
+    return lines
+
+
+def generate_resume(pages=1, seed=0, quality=0.7):
+    """
+    Generates a resume of about ``pages`` pages.
+
+    Args:
+        pages: Approximate length in pages of about 50 lines (1 to 50 in the benchmarks).
+        seed: Random seed; the same arguments always give the same text.
+        quality: Between 0 and 1, how often bullets use action verbs and metrics.
+
+    Returns:
+        The resume text.
+    """
+    rng = random.Random("resume:%d:%d:%s" % (pages, seed, quality))
+    lines = ["%s %s" % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)),
+             "email@example.com | (555) 555-0100 | github.com/example", "",
+             "Summary",
+             "Engineer with %d years of experience building %s." % (rng.randint(2, 15), rng.choice(OBJECTS)),
+             "", "Experience"]
+    target = pages * LINES_PER_PAGE
+    body_budget = max(target - 25, 5)
+    # Experience fills most of the resume; longer resumes also grow a Projects section.
+    while len(lines) < body_budget * 0.75:
+        lines.extend(_experience_block(rng, quality))
+    lines.extend(["", "Projects"])
+    while len(lines) < body_budget:
+        lines.append("%s Project %d: %s" % (rng.choice(ACTION_VERBS), rng.randint(1, 99), rng.choice(OBJECTS)))
+        lines.append(_bullet(rng, quality))
+    lines.extend(["", "Technical Skills", ", ".join(rng.sample(TECHNOLOGIES, 10)), "",
+                  "Education", "%s, %s, %d" % (rng.choice(DEGREES), rng.choice(SCHOOLS), rng.randint(2005, 2020))])
+    if rng.random() < 0.5:
+        lines.extend(["", "Certifications", "AWS Certified Developer"])
+    while len(lines) < target:
+        lines.append(_bullet(rng, quality))
+    return "\n".join(lines)
+
+
+def generate_job_description(seed=0, paragraphs=3):
+    """
+    Generates a job description with a summary, responsibilities and requirements.
+
+    Args:
+        seed: Random seed; the same arguments always give the same text.
+        paragraphs: Number of responsibility/requirement blocks.
+
+    Returns:
+        The job description text.
+    """
+    rng = random.Random("job:%d:%d" % (seed, paragraphs))
+    title = rng.choice(TITLES)
+    lines = ["%s at %s" % (title, rng.choice(COMPANIES)), "",
+             "We are looking for a %s to %s." % (title.lower(), rng.choice(JOB_DUTIES))]
+    for _ in range(paragraphs):
+        lines.extend(["", "Responsibilities:"])
+        lines.extend("- %s" % duty.capitalize() for duty in rng.sample(JOB_DUTIES, 3))
+        lines.extend(["", "Requirements:"])
+        lines.append("- %d+ years of experience with %s" % (rng.randint(2, 8), ", ".join(rng.sample(TECHNOLOGIES, 3))))
+        lines.append("- Experience with %s and %s" % tuple(rng.sample(TECHNOLOGIES, 2)))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a synthetic resume or job description.")
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quality", type=float, default=0.7)
+    parser.add_argument("--job", action="store_true", help="Generate a job description instead")
+    args = parser.parse_args(argv)
+    print(generate_job_description(args.seed) if args.job else generate_resume(args.pages, args.seed, args.quality))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Load test for the HTTP scoring service in ``service.py``.
+
+Sends ``/analyze`` requests built from synthetic resumes (see
+``benchmarks/generator.py``) from a number of concurrent keep-alive
+connections, then reports throughput, latency percentiles, 429 rejections and
+the average micro-batch size the service formed.
+
+Usage:
+    python benchmarks/load_test.py --spawn --workers 2 --requests 200 --concurrency 16
+    python benchmarks/load_test.py --url http://127.0.0.1:8080 --requests 500
+"""
+import argparse
+import asyncio
+import json
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from generator import generate_job_description, generate_resume
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b""):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(("%s %s HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                           "Content-Length: %d\r\n\r\n" % (method, path, self.host, len(body))).encode("latin-1")
+                          + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        payload = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+async def run_load(host, port, bodies, total, concurrency):
+    latencies, statuses = [], {}
+    counter = iter(range(total))
+
+    async def client():
+        connection = Connection(host, port)
+        try:
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    status, _ = await connection.request("POST", "/analyze", bodies[i % len(bodies)])
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    status = "connection error"
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(time.perf_counter() - started)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+async def fetch_metrics(host, port):
+    connection = Connection(host, port)
+    try:
+        _, payload = await connection.request("GET", "/metrics")
+    finally:
+        connection.close()
+    return payload.decode("utf-8")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_service(port, args):
+    command = [sys.executable, str(ROOT / "service.py"), "--port", str(port),
+               "--max-batch-size", str(args.max_batch_size), "--max-wait-ms", str(args.max_wait_ms),
+               "--queue-size", str(args.queue_size)]
+    if args.workers is not None:
+        command += ["--workers", str(args.workers)]
+    process = subprocess.Popen(command, cwd=str(ROOT))
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("service exited with status %d" % process.returncode)
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("service did not start within %.0fs" % args.startup_timeout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the resume scoring service.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running service")
+    target.add_argument("--spawn", action="store_true", help="Start a local service on a free port")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--unique", type=int, default=20, help="Number of distinct resumes to cycle through")
+    parser.add_argument("--job-type", default="general", choices=["general", "software_engineering"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Workers for --spawn")
+    parser.add_argument("--max-batch-size", type=int, default=16, help="For --spawn")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0, help="For --spawn")
+    parser.add_argument("--queue-size", type=int, default=256, help="For --spawn")
+    parser.add_argument("--startup-timeout", type=float, default=180.0)
+    args = parser.parse_args(argv)
+
+    job_desc_text = generate_job_description(args.seed)
+    bodies = [json.dumps({"resume_text": generate_resume(args.pages, args.seed + i), "job_desc_text": job_desc_text,
+                          "job_type": args.job_type}).encode("utf-8") for i in range(args.unique)]
+
+    process = None
+    if args.spawn:
+        host, port = "127.0.0.1", _free_port()
+        process = spawn_service(port, args)
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    try:
+        elapsed, latencies, statuses = asyncio.run(run_load(host, port, bodies, args.requests, args.concurrency))
+        metrics = asyncio.run(fetch_metrics(host, port))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print("requests: %d in %.2fs (%.1f req/s), concurrency %d" % (
+        args.requests, elapsed, args.requests / elapsed, args.concurrency))
+    print("status codes: %s" % ", ".join("%s=%d" % item for item in sorted(statuses.items(), key=str)))
+    if latencies:
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        print("latency of 200s: p50 %.1f ms, p95 %.1f ms, p99 %.1f ms" % (p50, p95, p99))
+    batch_sum = re.search(r"^resume_reviewer_batch_size_sum (\S+)$", metrics, re.M)
+    batch_count = re.search(r"^resume_reviewer_batch_size_count (\S+)$", metrics, re.M)
+    if batch_sum and batch_count and float(batch_count.group(1)):
+        print("average batch size: %.2f over %d batches" % (
+            float(batch_sum.group(1)) / float(batch_count.group(1)), int(float(batch_count.group(1)))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Benchmark suite for the resume analysis pipeline.
+
+Times each stage on synthetic resumes from ``benchmarks/generator.py``:
+``extract_sections``, ``extract_keywords``, ``calculate_tfidf_similarity``,
+every ``JobSpecificScorer._check_*`` method and ``analyze_resume`` end to end.
+For each stage and resume size it reports throughput, p50/p95/p99 latency and
+peak Python memory (from a separate ``tracemalloc`` run, so tracing does not
+distort the timings).
+
+Results can be saved as a JSON baseline and compared on later runs; the run
+exits with status 1 if any stage's p50 latency regressed beyond the threshold.
+
+Usage:
+    python benchmarks/run.py --pages 1 10 50 --save benchmarks/baseline.json
+    python benchmarks/run.py --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/run.py --stages extract_sections check_ --pages 50
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from generator import generate_job_description, generate_resume
+from job_specific_scorer import JobSpecificScorer
+from matcher import analyze_resume, calculate_tfidf_similarity, extract_keywords
+from nlp_patterns import action_verb_counts
+from nlp_provider import get_nlp, parse
+from parser import extract_sections
+from resume_features import extract_resume_features
+
+BASELINE_VERSION = 1
+
+
+def build_stages(resume_text, job_desc_text):
+    """
+    Returns ``{stage name: zero-argument callable}`` for one resume.
+
+    Inputs each stage needs (sections, features, keyword hits, the parsed
+    Doc) are computed here, outside the timed region, so a stage is timed on
+    its own.
+    """
+    scorer = JobSpecificScorer()
+    sections = extract_sections(resume_text)
+    features = extract_resume_features(resume_text)
+    matcher = scorer.plan.keyword_matcher
+    doc = parse(resume_text)
+    hits = matcher.scan_docs([doc])
+
+    checks = {
+        "_check_section_presence": lambda: scorer._check_section_presence(sections, "Experience"),
+        "_check_action_verbs": lambda: scorer._check_action_verbs([action_verb_counts(doc, resume_text)]),
+        "_check_quantified_metrics": lambda: scorer._check_quantified_metrics(features),
+        "_check_keyword_match": lambda: [scorer._check_keyword_match(hits, matcher, group)
+                                         for group in range(len(matcher.groups))],
+        "_check_bullet_count": lambda: scorer._check_bullet_count(features),
+        "_check_sentence_length": lambda: scorer._check_sentence_length(features),
+        # Includes parsing the resume, which is what the check costs without a shared Doc.
+        "_check_passive_voice": lambda: scorer._check_passive_voice(resume_text),
+        "_check_graphics": lambda: scorer._check_graphics(features),
+    }
+    uncovered = sorted(name for name in dir(JobSpecificScorer) if name.startswith("_check_") and name not in checks)
+    if uncovered:
+        raise SystemExit("No benchmark for %s; add one to build_stages" % ", ".join(uncovered))
+
+    stages = {
+        "extract_sections": lambda: extract_sections(resume_text),
+        "extract_keywords": lambda: extract_keywords(resume_text),
+        "calculate_tfidf_similarity": lambda: calculate_tfidf_similarity(resume_text, job_desc_text),
+        "extract_resume_features": lambda: extract_resume_features(resume_text),
+        "keyword_scan": lambda: matcher.scan_docs([doc]),
+    }
+    stages.update((name.lstrip("_"), check) for name, check in checks.items())
+    stages["analyze_resume[general]"] = lambda: analyze_resume(resume_text, job_desc_text, sections)
+    stages["analyze_resume[software_engineering]"] = lambda: analyze_resume(
+        resume_text, job_desc_text, sections, "software_engineering")
+    return stages
+
+
+def measure(func, iterations, warmup=1):
+    """Times ``func`` and returns latency percentiles, throughput and peak traced memory."""
+    for _ in range(warmup):
+        func()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "iterations": iterations,
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "throughput_per_s": iterations / latencies.sum() if latencies.sum() > 0 else float("inf"),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def run(pages_list, iterations, warmup=1, stage_filters=None, seed=0, out=sys.stdout):
+    """Runs every selected stage for each resume size and returns the results by ``"stage@pages"``."""
+    results = {}
+    job_desc_text = generate_job_description(seed)
+    out.write("%-40s %6s %10s %10s %10s %12s %12s\n" % ("stage", "pages", "p50 ms", "p95 ms", "p99 ms",
+                                                       "ops/s", "peak KB"))
+    for pages in pages_list:
+        resume_text = generate_resume(pages, seed)
+        for name, func in build_stages(resume_text, job_desc_text).items():
+            if stage_filters and not any(f in name for f in stage_filters):
+                continue
+            stats = measure(func, iterations, warmup)
+            results["%s@%d" % (name, pages)] = stats
+            out.write("%-40s %6d %10.3f %10.3f %10.3f %12.1f %12.1f\n" % (
+                name, pages, stats["p50_ms"], stats["p95_ms"], stats["p99_ms"],
+                stats["throughput_per_s"], stats["peak_memory_kb"]))
+            out.flush()
+    return results
+
+
+def compare(results, baseline, threshold, min_delta_ms=0.05):
+    """
+    Compares p50 latencies against a baseline.
+
+    Stages that got slower by less than ``min_delta_ms`` in absolute terms are
+    ignored, since sub-microsecond checks are dominated by timer noise.
+
+    Returns:
+        A list of ``(key, baseline_ms, current_ms, change)`` for every stage
+        that got slower by more than ``threshold`` (a fraction, e.g. 0.2 = 20%).
+    """
+    regressions = []
+    for key, stats in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if not previous or previous["p50_ms"] <= 0:
+            continue
+        change = stats["p50_ms"] / previous["p50_ms"] - 1.0
+        if change > threshold and stats["p50_ms"] - previous["p50_ms"] > min_delta_ms:
+            regressions.append((key, previous["p50_ms"], stats["p50_ms"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stages", nargs="+", help="Only run stages whose name contains one of these strings")
+    parser.add_argument("--save", help="Write the results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed p50 slowdown before a stage counts as regressed (default: 0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    # Load the model up front so the first NLP stage does not pay for it.
+    get_nlp()
+    results = run(args.pages, args.iterations, args.warmup, args.stages, args.seed)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"version": BASELINE_VERSION, "python": platform.python_version(),
+                       "machine": platform.machine(), "seed": args.seed, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for key, before, after, change in regressions:
+            print("REGRESSION %s: p50 %.3f ms -> %.3f ms (+%.0f%%)" % (key, before, after, change * 100))
+        if regressions:
+            raise SystemExit(1)
+        print("No p50 regressions beyond %.0f%%" % (args.threshold * 100))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,623 @@
+"""
+Score a directory or glob of resume PDFs against one job description.
+
+Each PDF goes through ``extract_sections`` and ``analyze_resume``, with text
+extraction bounded by ``extract_text_bounded`` (or ``extract_text_isolated``
+when a timeout is given). Files are spread over a process pool whose workers
+load the spaCy model and parse the job description once. Results are appended
+to a JSONL file as they finish, so the output doubles as a checkpoint: a
+re-run skips every file already recorded and continues where it stopped.
+With ``--dedupe``, duplicate resumes (byte-identical PDFs, identical or
+near-identical text) are analyzed once per group; see ``dedupe.py``. With
+``--doc-store``, extracted text, sections and parsed Docs are kept in (and on
+later runs, such as re-scoring after the criteria change, loaded in batches
+from) a ``doc_store.DocStore``, which skips pdfminer and spaCy for every
+resume seen before.
+
+Usage:
+    python bulk_score.py resumes/ --job-desc posting.txt --output scores.jsonl
+    python bulk_score.py "resumes/**/*.pdf" --job-desc posting.txt --output scores.jsonl \\
+        --job-type software_engineering --workers 8 --max-tasks-per-worker 200
+    python bulk_score.py resumes/ --job-desc posting.txt --output scores.jsonl --dedupe
+    python bulk_score.py resumes/ --job-desc posting.txt --output scores.jsonl --doc-store docs.db
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from analysis_cache import cached_extraction, current_analysis_key, get_default_cache, put_analysis
+from analysis_context import AnalysisContext, ParsedText
+from dedupe import DEFAULT_THRESHOLD, DuplicateIndex, fingerprint
+from doc_store import DocStore, content_key
+from job_specific_scorer import load_criteria_plan
+from matcher import analyze_resume_shared, reuse_analysis
+from nlp_provider import is_long, parse
+from parser import extract_sections, extract_text_bounded, extract_text_isolated
+from tfidf_model import get_tfidf_model
+
+# PDFs a worker loads from (or adds to) the doc store at a time.
+STORE_BATCH = 32
+
+_worker_state = {}
+
+
+def collect_inputs(patterns):
+    """
+    Expands directories (searched recursively for PDFs) and glob patterns.
+
+    Returns:
+        A sorted list of unique file paths.
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in files if name.lower().endswith(".pdf"))
+        else:
+            paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(paths)
+
+
+def load_checkpoint(output_path, retry_errors=False):
+    """
+    Reads the paths already recorded in an output JSONL file.
+
+    A partially written last line (from a crash mid-write) is cut off so that
+    new records are appended after the last complete one.
+
+    Args:
+        output_path: The JSONL results file.
+        retry_errors: If True, files recorded with an error are not treated as done.
+
+    Returns:
+        The set of paths that do not need to be scored again.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    valid_end = 0
+    with open(output_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            valid_end += len(line)
+            if record.get("status") == "ok" or not retry_errors:
+                done.add(record["path"])
+
+    if valid_end < os.path.getsize(output_path):
+        with open(output_path, "r+b") as f:
+            f.truncate(valid_end)
+    return done
+
+
+def _init_worker(job_desc_text, job_type, options):
+    """Loads the models and criteria and parses the job description once per worker."""
+    _worker_state.update(
+        job_desc_text=job_desc_text,
+        job_type=job_type,
+        options=options,
+        # A long job description is streamed in chunks once, on first use.
+        job_desc=ParsedText(job_desc_text, None if is_long(job_desc_text) else parse(job_desc_text)),
+        store=DocStore(options["doc_store"]) if options.get("doc_store") else None,
+    )
+    load_criteria_plan()
+    get_tfidf_model()
+
+
+def _extract_bytes(pdf_bytes, **limits):
+    options = _worker_state["options"]
+    if options["timeout"]:
+        return extract_text_isolated(pdf_bytes, timeout=options["timeout"], max_memory_mb=options["max_memory_mb"],
+                                     **limits)
+    return extract_text_bounded(io.BytesIO(pdf_bytes), **limits)
+
+
+def _extract(path):
+    """Extracts the text of one PDF with the worker's extraction options, through its ``analysis_cache``."""
+    options = _worker_state["options"]
+    with open(path, "rb") as f:
+        pdf_bytes = f.read()
+    return cached_extraction(pdf_bytes, _extract_bytes, max_pages=options["max_pages"],
+                             max_chars=options["max_chars"], layout=options["layout"])
+
+
+def _store_key(path):
+    """The doc store key of one PDF under the worker's extraction options."""
+    options = _worker_state["options"]
+    with open(path, "rb") as f:
+        return content_key(f.read(), max_pages=options["max_pages"], max_chars=options["max_chars"],
+                           layout=options["layout"])
+
+
+def _load_documents(paths):
+    """
+    Loads a batch of PDFs from the worker's doc store with one query.
+
+    PDFs not in the store are extracted, and together with stored ones that
+    lack a Doc for the current model, parsed in one ``nlp.pipe`` call and
+    added to the store.
+
+    Returns:
+        A ``doc_store.StoredDocument`` or an error record per path, in input order.
+    """
+    store = _worker_state["store"]
+    results, keys = {}, {}
+    for path in paths:
+        try:
+            keys[path] = _store_key(path)
+        except OSError as e:
+            results[path] = _error_record(path, e)
+    stored = store.get_many(keys.values())
+
+    missing = []
+    for path, key in keys.items():
+        document = stored.get(key)
+        if document is not None and (document.doc is not None or is_long(document.text)):
+            results[path] = document
+            continue
+        try:
+            extraction = document if document is not None else _extract(path)
+        except Exception as e:
+            results[path] = _error_record(path, e)
+            continue
+        missing.append((path, key, extraction))
+    if missing:
+        added = store.add_many([(key, extraction, getattr(extraction, "sections", None))
+                                for _, key, extraction in missing])
+        results.update((path, document) for (path, _, _), document in zip(missing, added))
+    return [results[path] for path in paths]
+
+
+def _record(path, extraction, analysis):
+    return {
+        "path": path,
+        "status": "ok",
+        "pages": extraction.pages,
+        "truncated": extraction.truncated,
+        "diagnostic": extraction.diagnostic,
+        "analysis": analysis,
+    }
+
+
+def _analyze(path, extraction, resume_sections=None, resume_doc=None):
+    """
+    Sections and analyzes one extracted PDF.
+
+    An analysis already in the worker's ``analysis_cache`` (the same text
+    scored against the same job description before) is reused without parsing.
+
+    Returns:
+        Its result record and the ``matcher.SharedAnalysis`` its near-duplicates
+        can reuse, which is None for a cached analysis.
+    """
+    job_desc_text = _worker_state["job_desc_text"]
+    job_type = _worker_state["job_type"]
+    if resume_sections is None:
+        resume_sections = extract_sections(extraction.text)
+    cache = get_default_cache()
+    key = current_analysis_key(extraction.text, job_desc_text, resume_sections, job_type)
+    analysis = cache.get(key)
+    if analysis is not None:
+        return _record(path, extraction, analysis), None
+    context = AnalysisContext(extraction.text, job_desc_text, resume_doc=resume_doc,
+                              job_desc=_worker_state["job_desc"])
+    analysis, shared = analyze_resume_shared(extraction.text, job_desc_text, resume_sections, job_type,
+                                             context=context)
+    put_analysis(cache, key, analysis)
+    return _record(path, extraction, analysis), shared
+
+
+def _error_record(path, error):
+    return {"path": path, "status": "error", "error": "%s: %s" % (type(error).__name__, error)}
+
+
+def _score_file(path):
+    """Extracts, sections and analyzes one PDF inside a worker."""
+    try:
+        return _analyze(path, _extract(path))[0]
+    except Exception as e:
+        return _error_record(path, e)
+
+
+def _analyze_document(path, document):
+    """Analyzes one result of ``_load_documents`` like ``_analyze``, passing error records through."""
+    if isinstance(document, dict):
+        return document, None
+    try:
+        return _analyze(path, document, document.sections, document.doc)
+    except Exception as e:
+        return _error_record(path, e), None
+
+
+def _score_files(paths):
+    """Scores a batch of PDFs inside a worker, through the doc store if there is one."""
+    if _worker_state["store"] is None:
+        return [_score_file(path) for path in paths]
+    try:
+        documents = _load_documents(paths)
+    except Exception as e:
+        return [_error_record(path, e) for path in paths]
+    return [_analyze_document(path, document)[0] for path, document in zip(paths, documents)]
+
+
+def _extract_file(path):
+    """
+    Extracts and fingerprints one PDF inside a worker, for deduplicated runs.
+
+    Returns:
+        A ``(path, extraction, fingerprint, seconds)`` tuple, or
+        ``(error record, None, None, seconds)`` if extraction failed.
+    """
+    started = time.perf_counter()
+    try:
+        if _worker_state["store"] is None:
+            extraction = _extract(path)
+        else:
+            extraction = _load_documents([path])[0]
+            if isinstance(extraction, dict):
+                return extraction, None, None, time.perf_counter() - started
+            # Docs stay in the worker's store rather than being pickled; _analyze_file loads them again.
+            extraction = extraction._replace(doc=None)
+        return path, extraction, fingerprint(extraction.text), time.perf_counter() - started
+    except Exception as e:
+        return _error_record(path, e), None, None, time.perf_counter() - started
+
+
+def _analyze_file(path, extraction):
+    """Analyzes one extracted PDF inside a worker; returns ``(record, shared analysis, seconds)``."""
+    started = time.perf_counter()
+    if _worker_state["store"] is None:
+        try:
+            record, shared = _analyze(path, extraction)
+        except Exception as e:
+            record, shared = _error_record(path, e), None
+    else:
+        try:
+            document = _load_documents([path])[0]
+        except Exception as e:
+            document = _error_record(path, e)
+        record, shared = _analyze_document(path, document)
+    return record, shared, time.perf_counter() - started
+
+
+def _reuse_file(path, extraction, shared):
+    """
+    Analyzes a near-duplicate inside a worker from its representative's SharedAnalysis.
+
+    Returns:
+        A ``(record, seconds)`` tuple.
+    """
+    started = time.perf_counter()
+    try:
+        resume_sections = getattr(extraction, "sections", None)
+        if resume_sections is None:
+            resume_sections = extract_sections(extraction.text)
+        analysis = reuse_analysis(shared, extraction.text, resume_sections, _worker_state["job_type"])
+        record = _record(path, extraction, analysis)
+    except Exception as e:
+        record = _error_record(path, e)
+    return record, time.perf_counter() - started
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _InlineExecutor:
+    """Runs submitted calls immediately, so in-process runs share the pool code path."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _score_deduplicated(executor, pending, record_result, threshold, max_in_flight):
+    """
+    Scores ``pending`` so that each group of duplicate resumes is analyzed once.
+
+    Every file is hashed first. A file whose bytes equal an earlier file's is
+    not even extracted; it gets a copy of that file's record as soon as that
+    one is written. Every other file is extracted and fingerprinted, and if
+    its text is within ``threshold`` of an earlier representative's (see
+    ``dedupe.DuplicateIndex``), it is not parsed: with identical text it gets
+    a copy of the representative's analysis, and otherwise
+    ``matcher.reuse_analysis`` of it, which computes everything but the TF-IDF
+    and spaCy results from the file's own text and sections. Either way it
+    keeps its own extraction details. Reused records carry ``duplicate_of``
+    (the representative's path) and ``similarity``. Only the representatives'
+    records are held until the run ends; every other record is written and
+    dropped once it and its byte copies are done.
+
+    Returns:
+        A dict with the number of ``duplicate_groups``, reused ``duplicates``
+        and the worker ``seconds_saved`` (the measured cost of what was reused).
+    """
+    index = DuplicateIndex(threshold)
+    byte_copies = {}   # first path with some bytes -> later paths with the same bytes
+    leaders = []       # first path of each distinct file, in input order
+    seen = {}          # file SHA-256 -> first path with those bytes
+    for path in pending:
+        try:
+            key = _file_digest(path)
+        except OSError as e:
+            record_result(_error_record(path, e))
+            continue
+        if key in seen:
+            byte_copies[seen[key]].append(path)
+        else:
+            seen[key] = path
+            byte_copies[path] = []
+            leaders.append(path)
+    del seen
+
+    representatives = {}  # path -> (record, analysis seconds, SharedAnalysis, exact text hash)
+    followers = {}        # representative path -> callbacks waiting for its record
+    groups = set()
+    stats = {"duplicates": 0, "seconds_saved": 0.0}
+    in_flight = {}        # future -> callback taking its result
+
+    def emit(record, cost, saved=0.0):
+        record_result(record)
+        if "duplicate_of" in record:
+            groups.add(record["duplicate_of"])
+            stats["duplicates"] += 1
+            stats["seconds_saved"] += saved
+        for path in byte_copies.pop(record["path"], ()):
+            emit(dict(record, path=path, duplicate_of=record.get("duplicate_of", record["path"]),
+                      similarity=record.get("similarity", 1.0)), (0.0, 0.0), saved=sum(cost))
+
+    def when_recorded(representative, follow):
+        if representative in representatives:
+            follow(*representatives[representative])
+        else:
+            followers.setdefault(representative, []).append(follow)
+
+    def analyze(path, extraction, extract_seconds, exact=None):
+        in_flight[executor.submit(_analyze_file, path, extraction)] = \
+            lambda result: on_analyzed(result, extract_seconds, exact)
+
+    def reuse_representative(path, extraction, exact, extract_seconds, similarity):
+        def follow(record, representative_seconds, shared, representative_exact):
+            representative = record["path"]
+            if record["status"] != "ok" or shared is None:
+                # Without the representative's SharedAnalysis (it failed, or came from the cache), analyze afresh.
+                analyze(path, extraction, extract_seconds)
+            elif exact == representative_exact:
+                copied = dict(record, path=path, pages=extraction.pages, truncated=extraction.truncated,
+                              diagnostic=extraction.diagnostic, duplicate_of=representative, similarity=similarity)
+                emit(copied, (extract_seconds, representative_seconds), saved=representative_seconds)
+            else:
+                in_flight[executor.submit(_reuse_file, path, extraction, shared)] = \
+                    lambda result: on_reused(result, extract_seconds, representative_seconds, representative,
+                                             similarity)
+        return follow
+
+    def on_extracted(result):
+        if result[1] is None:
+            error, _, _, extract_seconds = result
+            emit(error, (extract_seconds, 0.0))
+            return
+        path, extraction, fp, extract_seconds = result
+        match = index.add(path, fp)
+        if match is None:
+            analyze(path, extraction, extract_seconds, fp.exact)
+        else:
+            representative, similarity = match
+            when_recorded(representative, reuse_representative(path, extraction, fp.exact, extract_seconds,
+                                                                similarity))
+
+    def on_analyzed(result, extract_seconds, exact):
+        record, shared_analysis, analysis_seconds = result
+        emit(record, (extract_seconds, analysis_seconds))
+        if exact is not None:
+            # A representative: keep what its near-duplicates, now or later, reuse.
+            representatives[record["path"]] = (record, analysis_seconds, shared_analysis, exact)
+            for follow in followers.pop(record["path"], ()):
+                follow(*representatives[record["path"]])
+
+    def on_reused(result, extract_seconds, representative_seconds, representative, similarity):
+        record, reuse_seconds = result
+        if record["status"] == "ok":
+            record.update(duplicate_of=representative, similarity=similarity)
+        emit(record, (extract_seconds, reuse_seconds), saved=max(representative_seconds - reuse_seconds, 0.0))
+
+    remaining = iter(leaders)
+    while True:
+        while len(in_flight) < max_in_flight:
+            path = next(remaining, None)
+            if path is None:
+                break
+            in_flight[executor.submit(_extract_file, path)] = on_extracted
+        if not in_flight:
+            break
+        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+        for future in done:
+            in_flight.pop(future)(future.result())
+    return {"duplicate_groups": len(groups), "duplicates": stats["duplicates"],
+            "seconds_saved": round(stats["seconds_saved"], 3)}
+
+
+def _batches(paths, size):
+    for start in range(0, len(paths), size):
+        yield paths[start:start + size]
+
+
+class _Progress:
+    """Single-line progress display on stderr, redrawn at most a few times per second."""
+
+    def __init__(self, total, stream=sys.stderr, enabled=True):
+        self.total = total
+        self.done = 0
+        self.errors = 0
+        self.stream = stream
+        self.enabled = enabled
+        self.started = time.monotonic()
+        self._last_draw = 0.0
+
+    def update(self, record):
+        self.done += 1
+        if record["status"] != "ok":
+            self.errors += 1
+        now = time.monotonic()
+        if self.enabled and (now - self._last_draw > 0.25 or self.done == self.total):
+            self._last_draw = now
+            elapsed = max(now - self.started, 1e-9)
+            rate = self.done / elapsed
+            eta = (self.total - self.done) / rate if rate else 0.0
+            self.stream.write(
+                "\r%d/%d files  %d errors  %.1f files/s  ETA %ds " % (self.done, self.total, self.errors, rate, eta)
+            )
+            if self.done == self.total:
+                self.stream.write("\n")
+            self.stream.flush()
+
+
+def run_bulk(inputs, job_desc_text, output_path, job_type="general", workers=None, max_tasks_per_worker=100,
+             max_pages=50, max_chars=None, layout="default", timeout=None, max_memory_mb=1024,
+             retry_errors=False, progress=True, dedupe=False, dedupe_threshold=DEFAULT_THRESHOLD, doc_store=None):
+    """
+    Scores every input PDF and appends one JSON record per file to ``output_path``.
+
+    Args:
+        inputs: Directories and/or glob patterns of resume PDFs.
+        job_desc_text: The job description text.
+        output_path: The JSONL results file, also used as the checkpoint.
+        job_type: The type of job being applied for (default: "general").
+        workers: Number of worker processes (default: CPU count); 0 scores in-process.
+        max_tasks_per_worker: Files a worker handles before it is replaced, which
+            returns memory held by pdfminer to the OS.
+        max_pages: Maximum number of pages extracted per PDF.
+        max_chars: Maximum number of characters extracted per PDF.
+        layout: pdfminer layout profile, "default" or "fast".
+        timeout: If set, extract each PDF in an isolated subprocess with this time limit.
+        max_memory_mb: Memory cap for isolated extraction.
+        retry_errors: Re-score files whose previous attempt was recorded as an error.
+        progress: Show a progress line on stderr.
+        dedupe: Analyze one representative per group of exact or near-duplicate
+            resumes and reuse its result for the rest (within this run only).
+        dedupe_threshold: Minimum estimated Jaccard similarity of near-duplicates.
+        doc_store: Path of a ``doc_store.DocStore`` database to load extracted and
+            parsed resumes from, in batches of ``STORE_BATCH``, and to add new ones to.
+
+    Returns:
+        A dict with the number of files ``scored``, ``errors`` and ``skipped``;
+        with ``dedupe``, also the ``duplicate_groups``, reused ``duplicates``
+        and ``seconds_saved`` of worker time.
+    """
+    paths = collect_inputs(inputs)
+    done = load_checkpoint(output_path, retry_errors=retry_errors)
+    pending = [path for path in paths if path not in done]
+    options = {"max_pages": max_pages, "max_chars": max_chars, "layout": layout,
+               "timeout": timeout, "max_memory_mb": max_memory_mb, "doc_store": doc_store}
+    tracker = _Progress(len(pending), enabled=progress)
+    # Without a store each file is its own task, as batching would only delay results.
+    batch_size = STORE_BATCH if doc_store and not dedupe else 1
+    summary = {"scored": 0, "errors": 0, "skipped": len(paths) - len(pending)}
+
+    with open(output_path, "a", encoding="utf-8") as output:
+        def record_result(record):
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+            summary["scored" if record["status"] == "ok" else "errors"] += 1
+            tracker.update(record)
+
+        if not pending:
+            return summary
+
+        if workers == 0:
+            _init_worker(job_desc_text, job_type, options)
+            if dedupe:
+                summary.update(_score_deduplicated(_InlineExecutor(), pending, record_result, dedupe_threshold, 1))
+                return summary
+            for batch in _batches(pending, batch_size):
+                for record in _score_files(batch):
+                    record_result(record)
+            return summary
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(job_desc_text, job_type, options),
+            max_tasks_per_child=max(1, max_tasks_per_worker // batch_size),
+        ) as pool:
+            if dedupe:
+                summary.update(_score_deduplicated(pool, pending, record_result, dedupe_threshold, workers * 2))
+                return summary
+            # Keep a bounded number of batches in flight so huge inputs don't queue up in memory.
+            remaining = _batches(pending, batch_size)
+            in_flight = set()
+            for batch in remaining:
+                in_flight.add(pool.submit(_score_files, batch))
+                if len(in_flight) >= workers * 2:
+                    break
+            while in_flight:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for record in future.result():
+                        record_result(record)
+                    next_batch = next(remaining, None)
+                    if next_batch is not None:
+                        in_flight.add(pool.submit(_score_files, next_batch))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score resume PDFs against a job description and write JSONL.")
+    parser.add_argument("inputs", nargs="+", help="Directories or glob patterns of resume PDFs")
+    parser.add_argument("--job-desc", required=True, help="Path of a text file with the job description")
+    parser.add_argument("--output", required=True, help="JSONL results file (appended to and used as checkpoint)")
+    parser.add_argument("--job-type", default="general", choices=["general", "software_engineering"])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--max-tasks-per-worker", type=int, default=100)
+    parser.add_argument("--max-pages", type=int, default=50)
+    parser.add_argument("--max-chars", type=int, default=None)
+    parser.add_argument("--layout", default="default", choices=["default", "fast"])
+    parser.add_argument("--timeout", type=float, default=None, help="Per-PDF extraction time limit in seconds")
+    parser.add_argument("--max-memory-mb", type=int, default=1024)
+    parser.add_argument("--retry-errors", action="store_true")
+    parser.add_argument("--quiet", action="store_true", help="Do not show progress")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Score one resume per group of exact or near-duplicates and reuse its result")
+    parser.add_argument("--dedupe-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum estimated text similarity of near-duplicates (default: %(default)s)")
+    parser.add_argument("--doc-store", default=None,
+                        help="SQLite file of extracted and parsed resumes to reuse and add to")
+    args = parser.parse_args(argv)
+
+    with open(args.job_desc, "r", encoding="utf-8") as f:
+        job_desc_text = f.read()
+
+    summary = run_bulk(
+        args.inputs, job_desc_text, args.output, job_type=args.job_type, workers=args.workers,
+        max_tasks_per_worker=args.max_tasks_per_worker, max_pages=args.max_pages, max_chars=args.max_chars,
+        layout=args.layout, timeout=args.timeout, max_memory_mb=args.max_memory_mb,
+        retry_errors=args.retry_errors, progress=not args.quiet, dedupe=args.dedupe,
+        dedupe_threshold=args.dedupe_threshold, doc_store=args.doc_store,
+    )
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Columnar storage for large batches of analysis results.
+
+An ``analyze_resume`` result is a nested dict that repeats every criterion's
+weight and notes. ``write_results`` stores a batch of them as columns instead:
+
+    id                          one string per result (e.g. the resume path)
+    total_score, keyword_score  float64, one column per top-level score (NaN if absent)
+    criterion:<group>/<pattern> float32, one column per criterion (NaN if not scored);
+                                weights and notes are stored once, in the metadata
+    job_type                    dictionary-encoded
+    present_sections, missing_sections, missing_keywords, detailed_feedback
+                                lists of dictionary codes
+    score_groups                uint8 bitmask of the score dicts a result has
+
+The file is an uncompressed Arrow IPC file when pyarrow is installed and an
+uncompressed NumPy ``.npz`` archive otherwise (Parquet is not used because
+it cannot be read without decoding). ``read_results`` memory-maps either
+format, so numeric columns and dictionary codes are NumPy views of the file
+and loading a file of any size costs almost nothing until a column is read.
+
+Usage:
+    python columnar.py export results.jsonl results.arrow
+"""
+import argparse
+import json
+import struct
+import sys
+import zipfile
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Optional; results are written as .npz without it
+    pa = None
+
+FORMAT_VERSION = 1
+
+# Top-level numeric fields of an analysis.
+SCORE_FIELDS = ("total_score", "job_specific_score", "keyword_score", "skill_match_score", "structure_score")
+
+# Per-criterion score dicts, in the order of their ``score_groups`` bits.
+SCORE_GROUPS = ("section_scores", "keyword_scores", "formatting_scores", "bullet_quality_scores",
+                "readability_scores", "ats_friendly_scores")
+
+# List fields, stored as dictionary codes. Feedback entries are encoded as JSON strings.
+LIST_FIELDS = ("present_sections", "missing_sections", "missing_keywords", "detailed_feedback")
+
+_METADATA_KEY = "resume_reviewer.columnar"
+_ARROW_MAGIC = b"ARROW1"
+
+# .npz members are padded so that their data starts on this boundary.
+_NPZ_ALIGNMENT = 64
+# Extra field id used for the padding (the one Android's zipalign uses).
+_PADDING_EXTRA_ID = 0xD935
+
+
+class _Encoder:
+    """Assigns consecutive integer codes to distinct values."""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _feedback_key(entry):
+    return json.dumps(entry, sort_keys=True)
+
+
+def encode_strings(values):
+    """UTF-8 bytes and int64 offsets of a sequence of strings, as Arrow lays them out."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class StringColumn:
+    """A read-only sequence of strings backed by UTF-8 bytes and offsets."""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+
+class ListColumn:
+    """One list of dictionary codes per row: row ``i`` is ``codes[offsets[i]:offsets[i + 1]]``."""
+
+    def __init__(self, offsets, codes, dictionary):
+        self.offsets = offsets
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def row_codes(self, row):
+        return self.codes[self.offsets[row]:self.offsets[row + 1]]
+
+    def row(self, row):
+        return [self.dictionary[code] for code in self.row_codes(row)]
+
+    def counts(self):
+        """How many rows contain each dictionary value, as an array indexed by code."""
+        size = len(self.dictionary)
+        if not size:
+            return np.zeros(0, dtype=np.int64)
+        # One (row, code) pair per distinct value of a row, so repeats within a row count once.
+        rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+        pairs = np.unique(rows * size + self.codes)
+        return np.bincount(pairs % size, minlength=size)
+
+
+class ResultTable:
+    """A batch of analysis results read back by ``read_results``."""
+
+    def __init__(self, ids, scores, criteria, criterion_scores, job_type_codes, job_types, score_groups, lists):
+        # StringColumn of result ids
+        self.ids = ids
+        # Top-level score name -> float64 array
+        self.scores = scores
+        # Metadata per criterion column: column, group, pattern, weight, notes
+        self.criteria = criteria
+        # Criterion column name -> float32 array
+        self.criterion_scores = criterion_scores
+        self.job_type_codes = job_type_codes
+        self.job_types = job_types
+        self.score_groups = score_groups
+        # List field name -> ListColumn
+        self.lists = lists
+
+    def __len__(self):
+        return len(self.ids)
+
+    def job_type(self, row):
+        return self.job_types[self.job_type_codes[row]]
+
+    def analysis(self, row):
+        """Rebuilds the analysis dict of one row (criterion scores at float32 precision)."""
+        analysis = {}
+        for name, column in self.scores.items():
+            if not np.isnan(column[row]):
+                analysis[name] = float(column[row])
+        groups = int(self.score_groups[row])
+        for bit, group in enumerate(SCORE_GROUPS):
+            if groups & (1 << bit):
+                analysis[group] = {}
+        for criterion in self.criteria:
+            score = self.criterion_scores[criterion["column"]][row]
+            if not np.isnan(score) and criterion["group"] in analysis:
+                analysis[criterion["group"]][criterion["pattern"]] = {
+                    "score": float(score), "weight": criterion["weight"], "notes": criterion["notes"]}
+        for name, column in self.lists.items():
+            if name == "detailed_feedback":
+                if groups:
+                    analysis[name] = [json.loads(entry) for entry in column.row(row)]
+            else:
+                analysis[name] = column.row(row)
+        analysis["job_type"] = self.job_type(row)
+        return analysis
+
+
+def _columns(analyses, ids):
+    """Encodes analyses into plain arrays, shared by both file formats."""
+    scores = {name: [] for name in SCORE_FIELDS}
+    criteria = {}
+    criterion_rows = {}
+    job_types = _Encoder()
+    job_type_codes, score_groups = [], []
+    lists = {name: (_Encoder(), [0], []) for name in LIST_FIELDS}
+
+    for row, analysis in enumerate(analyses):
+        for name in SCORE_FIELDS:
+            scores[name].append(analysis.get(name, np.nan))
+        groups = 0
+        for bit, group in enumerate(SCORE_GROUPS):
+            if group not in analysis:
+                continue
+            groups |= 1 << bit
+            for pattern, result in analysis[group].items():
+                column = "criterion:%s/%s" % (group, pattern)
+                if column not in criteria:
+                    criteria[column] = {"column": column, "group": group, "pattern": pattern,
+                                        "weight": result.get("weight"), "notes": result.get("notes")}
+                    criterion_rows[column] = ([], [])
+                criterion_rows[column][0].append(row)
+                criterion_rows[column][1].append(result["score"])
+        score_groups.append(groups)
+        job_type_codes.append(job_types.code(analysis.get("job_type", "general")))
+        for name, (encoder, offsets, codes) in lists.items():
+            values = analysis.get(name, [])
+            if name == "detailed_feedback":
+                values = map(_feedback_key, values)
+            codes.extend(encoder.code(value) for value in values)
+            offsets.append(len(codes))
+
+    rows = len(score_groups)
+    if len(ids) != rows:
+        raise ValueError("Got %d ids for %d analyses" % (len(ids), rows))
+    criterion_scores = {}
+    for column, (indices, values) in criterion_rows.items():
+        criterion_scores[column] = np.full(rows, np.nan, dtype=np.float32)
+        criterion_scores[column][indices] = values
+    return {
+        "ids": list(ids),
+        "scores": {name: np.array(values, dtype=np.float64) for name, values in scores.items()},
+        "criteria": list(criteria.values()),
+        "criterion_scores": criterion_scores,
+        "job_type_codes": np.array(job_type_codes, dtype=np.int32),
+        "job_types": job_types.values,
+        "score_groups": np.array(score_groups, dtype=np.uint8),
+        "lists": {name: (np.array(offsets, dtype=np.int64), np.array(codes, dtype=np.int32), encoder.values)
+                  for name, (encoder, offsets, codes) in lists.items()},
+    }
+
+
+def _metadata(columns):
+    return {"version": FORMAT_VERSION, "criteria": columns["criteria"], "score_fields": list(columns["scores"])}
+
+
+def _write_arrow(path, columns):
+    arrays = {"id": pa.array(columns["ids"], type=pa.large_string())}
+    for name, values in columns["scores"].items():
+        arrays[name] = pa.array(values)
+    for name, values in columns["criterion_scores"].items():
+        arrays[name] = pa.array(values)
+    arrays["job_type"] = pa.DictionaryArray.from_arrays(
+        pa.array(columns["job_type_codes"]), pa.array(columns["job_types"], type=pa.string()))
+    arrays["score_groups"] = pa.array(columns["score_groups"])
+    for name, (offsets, codes, dictionary) in columns["lists"].items():
+        arrays[name] = pa.LargeListArray.from_arrays(
+            pa.array(offsets), pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(dictionary, type=pa.string())))
+    table = pa.table(arrays).replace_schema_metadata({_METADATA_KEY: json.dumps(_metadata(columns))})
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _write_npz(path, columns):
+    arrays = {"metadata": np.frombuffer(json.dumps(_metadata(columns)).encode("utf-8"), dtype=np.uint8)}
+    arrays["ids.data"], arrays["ids.offsets"] = encode_strings(columns["ids"])
+    for name, values in columns["scores"].items():
+        arrays["score." + name] = values
+    for index, criterion in enumerate(columns["criteria"]):
+        arrays["criterion.%d" % index] = columns["criterion_scores"][criterion["column"]]
+    arrays["job_type.codes"] = columns["job_type_codes"]
+    arrays["job_type.dictionary.data"], arrays["job_type.dictionary.offsets"] = encode_strings(columns["job_types"])
+    arrays["score_groups"] = columns["score_groups"]
+    for name, (offsets, codes, dictionary) in columns["lists"].items():
+        arrays[name + ".offsets"], arrays[name + ".codes"] = offsets, codes
+        arrays[name + ".dictionary.data"], arrays[name + ".dictionary.offsets"] = encode_strings(dictionary)
+
+    write_npz(path, arrays)
+
+
+def write_npz(path, arrays: Dict[str, np.ndarray]):
+    """
+    Writes arrays to an uncompressed .npz archive that ``read_npz`` can memory-map.
+
+    Each member's data starts 64-byte aligned in the file.
+    """
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for name, array in arrays.items():
+            info = zipfile.ZipInfo(name + ".npy", date_time=(1980, 1, 1, 0, 0, 0))
+            force_zip64 = array.nbytes > 2 ** 31
+            # Pad the local header so the array data, which follows a
+            # 64-byte multiple .npy header, starts 64-byte aligned in the file.
+            header_end = archive.fp.tell() + 30 + len(info.filename.encode("utf-8")) + (20 if force_zip64 else 0)
+            padding = -(header_end + 4) % _NPZ_ALIGNMENT
+            info.extra = struct.pack("<HH", _PADDING_EXTRA_ID, padding) + bytes(padding)
+            with archive.open(info, "w", force_zip64=force_zip64) as member:
+                np.lib.format.write_array(member, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def write_results(path, analyses: Iterable[Dict], ids: Sequence[str], fmt: Optional[str] = None):
+    """
+    Writes a batch of analysis results as columns.
+
+    Args:
+        path: The output file.
+        analyses: The ``analyze_resume`` results.
+        ids: One id per result, e.g. the resume's path.
+        fmt: "arrow" or "npz" (default: "arrow" when pyarrow is installed, else "npz").
+
+    Returns:
+        The format written.
+    """
+    fmt = fmt or ("arrow" if pa is not None else "npz")
+    if fmt == "arrow" and pa is None:
+        raise ImportError("Writing Arrow files requires pyarrow; use fmt='npz'")
+    if fmt not in ("arrow", "npz"):
+        raise ValueError("Unknown columnar format %r" % fmt)
+    columns = _columns(analyses, ids)
+    (_write_arrow if fmt == "arrow" else _write_npz)(path, columns)
+    return fmt
+
+
+def read_npz(path) -> Dict[str, np.ndarray]:
+    """Maps every member of an uncompressed .npz archive as a read-only array view of the file."""
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError("%s: member %s is compressed and cannot be memory-mapped" % (path, info.filename))
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            count = int(np.prod(shape))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=f.tell()) if count else np.empty(0, dtype)
+            arrays[info.filename[:-len(".npy")]] = array.reshape(shape, order="F" if fortran_order else "C")
+    return arrays
+
+
+def _npz_strings(arrays, name):
+    return StringColumn(arrays[name + ".data"], arrays[name + ".offsets"])
+
+
+def _load_npz(path):
+    arrays = read_npz(path)
+    metadata = json.loads(arrays["metadata"].tobytes())
+    return metadata, ResultTable(
+        ids=_npz_strings(arrays, "ids"),
+        scores={name: arrays["score." + name] for name in metadata["score_fields"]},
+        criteria=metadata["criteria"],
+        criterion_scores={criterion["column"]: arrays["criterion.%d" % index]
+                          for index, criterion in enumerate(metadata["criteria"])},
+        job_type_codes=arrays["job_type.codes"],
+        job_types=list(_npz_strings(arrays, "job_type.dictionary")),
+        score_groups=arrays["score_groups"],
+        lists={name: ListColumn(arrays[name + ".offsets"], arrays[name + ".codes"],
+                                list(_npz_strings(arrays, name + ".dictionary")))
+               for name in LIST_FIELDS},
+    )
+
+
+def _arrow_column(table, name):
+    column = table.column(name)
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+
+def _load_arrow(path):
+    if pa is None:
+        raise ImportError("%s is an Arrow file; reading it requires pyarrow" % path)
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    metadata = json.loads(table.schema.metadata[_METADATA_KEY.encode("utf-8")])
+
+    ids = _arrow_column(table, "id")
+    _, offsets, data = ids.buffers()
+    id_offsets = np.frombuffer(offsets, dtype=np.int64)[ids.offset:ids.offset + len(ids) + 1]
+    job_types = _arrow_column(table, "job_type")
+    lists = {}
+    for name in LIST_FIELDS:
+        column = _arrow_column(table, name)
+        values = column.values
+        lists[name] = ListColumn(column.offsets.to_numpy(zero_copy_only=True),
+                                 values.indices.to_numpy(zero_copy_only=True), values.dictionary.to_pylist())
+    return metadata, ResultTable(
+        ids=StringColumn(np.frombuffer(data, dtype=np.uint8) if data is not None else np.empty(0, np.uint8),
+                         id_offsets),
+        scores={name: _arrow_column(table, name).to_numpy(zero_copy_only=True) for name in metadata["score_fields"]},
+        criteria=metadata["criteria"],
+        criterion_scores={criterion["column"]: _arrow_column(table, criterion["column"]).to_numpy(zero_copy_only=True)
+                          for criterion in metadata["criteria"]},
+        job_type_codes=job_types.indices.to_numpy(zero_copy_only=True),
+        job_types=job_types.dictionary.to_pylist(),
+        score_groups=_arrow_column(table, "score_groups").to_numpy(zero_copy_only=True),
+        lists=lists,
+    )
+
+
+def read_results(path) -> ResultTable:
+    """
+    Memory-maps a file written by ``write_results``; the format is detected from its contents.
+
+    Raises:
+        ValueError: If the file is not a columnar results file of a supported version.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(_ARROW_MAGIC))
+    if magic == _ARROW_MAGIC:
+        metadata, table = _load_arrow(path)
+    elif magic.startswith(b"PK"):
+        metadata, table = _load_npz(path)
+    else:
+        raise ValueError("%s is not a columnar results file" % path)
+    if metadata.get("version") != FORMAT_VERSION:
+        raise ValueError("%s has columnar format version %r, expected %d"
+                         % (path, metadata.get("version"), FORMAT_VERSION))
+    return table
+
+
+def export_jsonl(jsonl_path, output_path, fmt=None):
+    """
+    Converts a ``bulk_score.py`` results file into a columnar file, keyed by resume path.
+
+    Records that failed to score are left out.
+
+    Returns:
+        A tuple of the number of results written and the format used.
+    """
+    ids: List[str] = []
+    analyses: List[Dict] = []
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("status") == "ok":
+                ids.append(record["path"])
+                analyses.append(record["analysis"])
+    return len(ids), write_results(output_path, analyses, ids, fmt)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Columnar storage for analysis results.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Convert bulk_score.py JSONL results to a columnar file")
+    export.add_argument("jsonl", help="Results file written by bulk_score.py")
+    export.add_argument("output", help="Output file (.arrow or .npz)")
+    export.add_argument("--format", choices=["arrow", "npz"], default=None,
+                        help="Default: arrow if pyarrow is installed, else npz")
+    args = parser.parse_args(argv)
+
+    count, fmt = export_jsonl(args.jsonl, args.output, args.format)
+    print("Wrote %d results to %s (%s)" % (count, args.output, fmt), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
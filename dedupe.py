@@ -0,0 +1,196 @@
+"""
+Exact and near-duplicate detection for batches of resumes.
+
+Each extracted resume text gets a ``Fingerprint``: a SHA-256 of the raw text,
+so identical texts (which always get identical analyses) are found exactly,
+and a MinHash signature of its word shingles, whose agreement estimates the
+Jaccard similarity of two texts. ``DuplicateIndex`` finds near-duplicates
+with locality-sensitive hashing: signatures are cut into bands and only texts
+sharing a whole band are compared, so adding a resume costs the same no
+matter how many are indexed.
+
+``group_duplicates`` groups a whole batch with union-find; ``DuplicateIndex``
+assigns a stream of resumes to the first earlier resume they duplicate, as
+``bulk_score.py --dedupe`` does.
+"""
+import hashlib
+import re
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Signature length, and its split into LSH bands of NUM_PERM // BANDS rows.
+# Two texts become candidates with probability 1 - (1 - J**8)**16 for a
+# Jaccard similarity J: above 0.99 for J = 0.9, about 0.06 for J = 0.5.
+NUM_PERM = 128
+BANDS = 16
+
+# Words per shingle. One edited word changes up to this many shingles.
+SHINGLE_WORDS = 5
+
+DEFAULT_THRESHOLD = 0.9
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Shingles hashed per block, which bounds the (NUM_PERM x block) work array.
+_BLOCK = 4096
+
+_rng = np.random.RandomState(20240601)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class Fingerprint(NamedTuple):
+    """The exact key and MinHash signature of one text."""
+    exact: str
+    signature: np.ndarray
+
+
+def _shingle_hashes(text):
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+
+def minhash(text) -> np.ndarray:
+    """
+    MinHash signature of a text's lowercased word shingles.
+
+    Each of the NUM_PERM hash functions is ``(a * x + b) mod (2**61 - 1)``
+    over a 32-bit shingle hash ``x``, truncated to 32 bits.
+
+    Returns:
+        A uint32 array of length NUM_PERM.
+    """
+    hashes = _shingle_hashes(text)
+    signature = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+    for start in range(0, len(hashes), _BLOCK):
+        block = hashes[start:start + _BLOCK]
+        permuted = (_PERM_A[:, None] * block[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        np.minimum(signature, permuted.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def fingerprint(text) -> Fingerprint:
+    """Computes the Fingerprint of an extracted resume text."""
+    return Fingerprint(hashlib.sha256(text.encode("utf-8")).hexdigest(), minhash(text))
+
+
+def similarity(a: Fingerprint, b: Fingerprint) -> float:
+    """Estimated Jaccard similarity of two texts' shingles; 1.0 for identical texts."""
+    if a.exact == b.exact:
+        return 1.0
+    return float(np.mean(a.signature == b.signature))
+
+
+def _bands(signature):
+    return [signature[i::BANDS].tobytes() for i in range(BANDS)]
+
+
+class DuplicateIndex:
+    """
+    Incremental index that assigns each added text to an earlier text it duplicates.
+
+    Only texts that duplicate nothing (representatives) are indexed, so every
+    group is a representative and the texts within ``threshold`` of it.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        """
+        Args:
+            threshold: Minimum estimated Jaccard similarity of a near-duplicate.
+                The LSH banding finds pairs above about 0.7 reliably.
+        """
+        self.threshold = threshold
+        self._exact: Dict[str, object] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[object]] = {}
+        self._fingerprints: Dict[object, Fingerprint] = {}
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def find(self, fp: Fingerprint) -> Optional[Tuple[object, float]]:
+        """Returns ``(representative key, similarity)`` of the best indexed match, or None."""
+        key = self._exact.get(fp.exact)
+        if key is not None:
+            return key, 1.0
+        best = None
+        seen = set()
+        for band, value in enumerate(_bands(fp.signature)):
+            for candidate in self._buckets.get((band, value), ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                score = similarity(fp, self._fingerprints[candidate])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (candidate, score)
+        return best
+
+    def add(self, key, fp: Fingerprint) -> Optional[Tuple[object, float]]:
+        """
+        Adds a text, unless it duplicates an indexed one.
+
+        Returns:
+            ``(representative key, similarity)`` if the text is a duplicate,
+            otherwise None and the text becomes a representative.
+        """
+        match = self.find(fp)
+        if match is None:
+            self._exact[fp.exact] = key
+            self._fingerprints[key] = fp
+            for band, value in enumerate(_bands(fp.signature)):
+                self._buckets.setdefault((band, value), []).append(key)
+        return match
+
+
+def group_duplicates(fingerprints: Sequence[Fingerprint], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """
+    Groups a batch of fingerprints into exact and near-duplicate groups.
+
+    Any two texts within ``threshold`` of each other end up in one group
+    (transitively, through union-find).
+
+    Returns:
+        Lists of indices, one per group including singletons, each sorted and
+        ordered by their first index; the first index is the representative.
+    """
+    parent = list(range(len(fingerprints)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        i, j = root(i), root(j)
+        if i != j:
+            parent[max(i, j)] = min(i, j)
+
+    exact: Dict[str, int] = {}
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+    for i, fp in enumerate(fingerprints):
+        if fp.exact in exact:
+            union(exact[fp.exact], i)
+            continue
+        exact[fp.exact] = i
+        candidates = set()
+        for band, value in enumerate(_bands(fp.signature)):
+            bucket = buckets.setdefault((band, value), [])
+            candidates.update(bucket)
+            bucket.append(i)
+        for j in candidates:
+            if root(i) != root(j) and similarity(fp, fingerprints[j]) >= threshold:
+                union(i, j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(fingerprints)):
+        groups.setdefault(root(i), []).append(i)
+    return sorted(groups.values())
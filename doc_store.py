@@ -0,0 +1,212 @@
+"""
+Persistent store of extracted and parsed resumes, for re-scoring without re-parsing.
+
+Re-scoring a corpus after the criteria or heuristics change does not need
+pdfminer or spaCy again: a resume's text, ``extract_sections`` output and
+parsed ``Doc`` only change with the PDF, the extraction options and the
+model. ``DocStore`` keeps them in SQLite. Documents are keyed by a content
+hash of the PDF bytes and extraction options (``content_key``), and each
+parsed Doc is serialized as a spaCy ``DocBin`` under the version of the model
+that produced it, so a model upgrade re-parses stored text without
+re-extracting it. ``get_many`` loads a batch of documents with one query and
+``add_many`` parses a batch with one ``nlp.pipe`` call and stores it in one
+transaction.
+
+Usage:
+    python bulk_score.py resumes/ --job-desc posting.txt --output scores.jsonl --doc-store docs.db
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+from nlp_provider import get_nlp, is_long, parse_many
+from parser import extract_sections
+
+# Bump whenever text extraction or ``extract_sections`` can return something
+# different for the same PDF, so stale text and sections are never served.
+STORE_VERSION = 1
+
+# Keys per ``SELECT ... IN`` query, below SQLite's bound-parameter limit.
+QUERY_BATCH = 500
+
+
+class StoredDocument(NamedTuple):
+    """
+    A resume as kept in the store.
+
+    The first four fields mirror ``parser.PdfExtractionResult``, so a stored
+    document can stand in for a fresh extraction. ``doc`` is None for a long
+    resume, whose analysis parses it as a stream of chunks instead.
+    """
+    text: str
+    pages: Optional[int]
+    truncated: bool
+    diagnostic: Optional[str]
+    sections: dict
+    doc: Any = None
+
+
+def content_key(data, **options):
+    """
+    Content-addressed key of a PDF (or plain text) under the given extraction options.
+
+    Args:
+        data: The PDF bytes, or the text of a resume that was never a PDF.
+        **options: Options that change the extracted text, e.g. ``max_pages`` and ``layout``.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    payload = json.dumps([STORE_VERSION, hashlib.sha256(data).hexdigest(), options], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def model_version(nlp):
+    """Identifies the pipeline a Doc was parsed with: model name, version and components."""
+    meta = nlp.meta
+    return "%s_%s-%s:%s" % (meta["lang"], meta["name"], meta["version"], ",".join(nlp.pipe_names))
+
+
+class DocStore:
+    """
+    SQLite store of extracted text, sections and serialized Docs.
+
+    Several processes can share one database file: it is opened in WAL mode,
+    so readers do not block each other, and writers wait up to ``timeout``
+    seconds for the write lock. Docs are deserialized against the vocab of
+    the shared pipeline (``nlp_provider.get_nlp``), and only those stored
+    under its ``model_version`` are returned.
+    """
+
+    def __init__(self, db_path, nlp=None, timeout=30.0):
+        """
+        Args:
+            db_path: Path of the SQLite database, created if missing.
+            nlp: The pipeline to parse with and deserialize against (default: the shared one).
+            timeout: Seconds to wait for another process's write lock.
+        """
+        self._nlp = nlp
+        self._model = None
+        self._lock = threading.Lock()
+        self.stats = {"loaded": 0, "parsed": 0}
+        self._db = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, pages INTEGER, truncated INTEGER NOT NULL, "
+            "diagnostic TEXT, sections TEXT NOT NULL, stored REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "key TEXT NOT NULL, model TEXT NOT NULL, doc BLOB NOT NULL, PRIMARY KEY (key, model))"
+        )
+        self._db.commit()
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = get_nlp()
+        return self._nlp
+
+    @property
+    def model(self):
+        """The ``model_version`` Docs are stored and loaded under."""
+        if self._model is None:
+            self._model = model_version(self.nlp)
+        return self._model
+
+    def get(self, key):
+        """Returns the StoredDocument for ``key``, or None if it was never added."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """
+        Loads many documents with one query per ``QUERY_BATCH`` keys.
+
+        A document stored before the current model was in use comes back
+        with ``doc`` None (like a long one); passing it to ``add_many``
+        parses and stores it again.
+
+        Returns:
+            A dict of key to StoredDocument, for the keys that are in the store.
+        """
+        from spacy.tokens import DocBin
+
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), QUERY_BATCH):
+                batch = keys[start:start + QUERY_BATCH]
+                rows = self._db.execute(
+                    "SELECT d.key, d.text, d.pages, d.truncated, d.diagnostic, d.sections, p.doc "
+                    "FROM documents d LEFT JOIN docs p ON p.key = d.key AND p.model = ? "
+                    "WHERE d.key IN (%s)" % ",".join("?" * len(batch)),
+                    [self.model] + batch,
+                ).fetchall()
+                for key, text, pages, truncated, diagnostic, sections, doc_bytes in rows:
+                    doc = None
+                    if doc_bytes is not None:
+                        doc = next(DocBin().from_bytes(doc_bytes).get_docs(self.nlp.vocab))
+                    found[key] = StoredDocument(text, pages, bool(truncated), diagnostic, json.loads(sections), doc)
+            self.stats["loaded"] += len(found)
+        return found
+
+    def add_many(self, entries, batch_size=32):
+        """
+        Sections, parses and stores many extracted resumes in one transaction.
+
+        Resumes that are not long (see ``nlp_provider.is_long``) are parsed
+        together through ``nlp.pipe``; long ones are stored without a Doc.
+
+        Args:
+            entries: ``(key, extraction, sections)`` tuples, where ``extraction``
+                has the fields of a ``PdfExtractionResult`` (a StoredDocument
+                works) and ``sections`` may be None to run ``extract_sections``.
+            batch_size: Number of texts per ``nlp.pipe`` batch.
+
+        Returns:
+            The StoredDocument of each entry, in input order.
+        """
+        from spacy.tokens import DocBin
+
+        entries = list(entries)
+        parsed = iter(parse_many([extraction.text for _, extraction, _ in entries if not is_long(extraction.text)],
+                                 batch_size=batch_size))
+        documents, document_rows, doc_rows = [], [], []
+        stored = time.time()
+        for key, extraction, sections in entries:
+            if sections is None:
+                sections = extract_sections(extraction.text)
+            doc = None if is_long(extraction.text) else next(parsed)
+            documents.append(StoredDocument(extraction.text, extraction.pages, bool(extraction.truncated),
+                                            extraction.diagnostic, sections, doc))
+            document_rows.append((key, extraction.text, extraction.pages, int(extraction.truncated),
+                                  extraction.diagnostic, json.dumps(sections), stored))
+            if doc is not None:
+                doc_bin = DocBin()
+                doc_bin.add(doc)
+                doc_rows.append((key, self.model, doc_bin.to_bytes()))
+
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO documents (key, text, pages, truncated, diagnostic, sections, stored) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", document_rows,
+            )
+            self._db.executemany("INSERT OR REPLACE INTO docs (key, model, doc) VALUES (?, ?, ?)", doc_rows)
+            self.stats["parsed"] += len(doc_rows)
+        return documents
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM documents WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,266 @@
+"""
+Precomputed index of job descriptions for matching one resume against many postings.
+
+Each posting's keywords (noun lemmas and noun chunks, as in ``analyze_resume``)
+and term counts are computed once when it is added. A query scores a resume
+against every posting in two sparse matrix products, combining the TF-IDF
+similarity and the skill match with the weights of the general analysis.
+
+Usage:
+    python job_index.py build postings/ --index jobs.json
+    python job_index.py query resume.pdf --index jobs.json -k 10
+"""
+import argparse
+import itertools
+import json
+import os
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import CountVectorizer
+
+from matcher import extract_keywords, keywords_from_doc
+from nlp_provider import is_long, parse_many
+
+INDEX_VERSION = 1
+
+# Same weights as the keyword (40%) and skill (30%) parts of the general
+# analysis, rescaled so the combined score stays between 0 and 1.
+SEMANTIC_WEIGHT = 0.4
+SKILL_WEIGHT = 0.3
+
+# Tokenizes exactly like the TfidfVectorizer used by calculate_tfidf_similarity.
+_analyze = CountVectorizer(stop_words='english').build_analyzer()
+
+
+class JobMatch(NamedTuple):
+    posting_id: str
+    score: float
+    semantic_score: float
+    skill_score: float
+    metadata: dict
+
+
+class JobIndex:
+    """
+    Incrementally updatable index of job postings.
+
+    Postings are stored as keyword sets and term counts. Document frequencies
+    are kept up to date on every add and remove, so IDF weights always reflect
+    the postings currently in the index (smoothed as in scikit-learn's
+    ``TfidfVectorizer``). The sparse matrices used by ``query`` are rebuilt
+    lazily on the first query after a change.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._term_df = Counter()
+        self._matrices = None
+
+    def __len__(self):
+        return len(self._postings)
+
+    def __contains__(self, posting_id):
+        return posting_id in self._postings
+
+    def add(self, posting_id, text, keywords=None, metadata=None):
+        """
+        Adds or replaces a posting.
+
+        Args:
+            posting_id: A string identifying the posting.
+            text: The job description text.
+            keywords: Precomputed keywords; extracted from ``text`` when omitted.
+            metadata: Optional JSON-serializable data returned with query results.
+        """
+        if keywords is None:
+            keywords = extract_keywords(text)
+        self._insert(posting_id, keywords, Counter(_analyze(text)), metadata)
+
+    def add_many(self, postings, batch_size=32):
+        """
+        Adds many postings, parsing them in batches.
+
+        The postings are read from the iterable one batch at a time, so only
+        ``batch_size`` texts are held at once. Long postings are left out of
+        the batches and streamed in chunks.
+
+        Args:
+            postings: An iterable of ``(posting_id, text)`` or ``(posting_id, text, metadata)`` tuples.
+            batch_size: Number of texts spaCy processes per batch.
+        """
+        postings = iter(postings)
+        while True:
+            batch = [tuple(p) + (None,) * (3 - len(p)) for p in itertools.islice(postings, batch_size)]
+            if not batch:
+                break
+            docs = parse_many([text for _, text, _ in batch if not is_long(text)], batch_size=batch_size)
+            for posting_id, text, metadata in batch:
+                keywords = extract_keywords(text) if is_long(text) else keywords_from_doc(next(docs))
+                self._insert(posting_id, keywords, Counter(_analyze(text)), metadata)
+
+    def remove(self, posting_id):
+        """Removes a posting. Raises KeyError if it is not in the index."""
+        posting = self._postings.pop(posting_id)
+        self._term_df.subtract(posting["term_counts"].keys())
+        self._term_df += Counter()  # drop terms no longer used by any posting
+        self._matrices = None
+
+    def _insert(self, posting_id, keywords, term_counts, metadata):
+        if posting_id in self._postings:
+            self.remove(posting_id)
+        self._postings[posting_id] = {
+            "keywords": sorted(set(keywords)),
+            "term_counts": dict(term_counts),
+            "metadata": metadata or {},
+        }
+        self._term_df.update(term_counts.keys())
+        self._matrices = None
+
+    def _build_matrices(self):
+        ids = list(self._postings)
+        term_columns = {term: i for i, term in enumerate(self._term_df)}
+        keyword_columns = {}
+        term_rows, term_cols, term_vals = [], [], []
+        keyword_rows, keyword_cols = [], []
+        for row, posting_id in enumerate(ids):
+            posting = self._postings[posting_id]
+            for term, count in posting["term_counts"].items():
+                term_rows.append(row)
+                term_cols.append(term_columns[term])
+                term_vals.append(count)
+            for keyword in posting["keywords"]:
+                keyword_rows.append(row)
+                keyword_cols.append(keyword_columns.setdefault(keyword, len(keyword_columns)))
+
+        n = len(ids)
+        df = np.array([self._term_df[term] for term in term_columns], dtype=np.float64)
+        idf = np.log((1 + n) / (1 + df)) + 1.0
+        tfidf = csr_matrix((term_vals, (term_rows, term_cols)), shape=(n, len(term_columns)), dtype=np.float64)
+        tfidf = tfidf.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        keywords = csr_matrix((np.ones(len(keyword_rows)), (keyword_rows, keyword_cols)),
+                              shape=(n, len(keyword_columns)))
+        keyword_counts = np.asarray(keywords.sum(axis=1)).ravel()
+        self._matrices = (ids, term_columns, idf, tfidf, norms, keyword_columns, keywords, keyword_counts)
+
+    def query(self, resume_text, k=10, resume_keywords=None, resume_doc=None):
+        """
+        Finds the postings that best match a resume.
+
+        Args:
+            resume_text: The extracted resume text.
+            k: Number of postings to return.
+            resume_keywords: Precomputed resume keywords; extracted when omitted.
+            resume_doc: An already parsed resume ``Doc`` to take keywords from.
+
+        Returns:
+            Up to ``k`` JobMatch tuples, best match first.
+        """
+        if not self._postings:
+            return []
+        if resume_keywords is None:
+            resume_keywords = keywords_from_doc(resume_doc) if resume_doc is not None else extract_keywords(resume_text)
+        if self._matrices is None:
+            self._build_matrices()
+        ids, term_columns, idf, tfidf, norms, keyword_columns, keywords, keyword_counts = self._matrices
+
+        # Terms no posting uses are dropped, as in TfidfVectorizer.transform.
+        resume_vector = np.zeros(len(term_columns))
+        for term, count in Counter(_analyze(resume_text)).items():
+            column = term_columns.get(term)
+            if column is not None:
+                resume_vector[column] = count
+        resume_vector *= idf
+        resume_norm = np.linalg.norm(resume_vector)
+        semantic = np.zeros(len(ids))
+        if resume_norm > 0:
+            valid = norms > 0
+            semantic[valid] = (tfidf @ resume_vector)[valid] / (norms[valid] * resume_norm)
+
+        resume_indicator = np.zeros(len(keyword_columns))
+        for keyword in set(resume_keywords):
+            column = keyword_columns.get(keyword)
+            if column is not None:
+                resume_indicator[column] = 1.0
+        skill = np.zeros(len(ids))
+        has_keywords = keyword_counts > 0
+        skill[has_keywords] = (keywords @ resume_indicator)[has_keywords] / keyword_counts[has_keywords]
+
+        combined = (SEMANTIC_WEIGHT * semantic + SKILL_WEIGHT * skill) / (SEMANTIC_WEIGHT + SKILL_WEIGHT)
+        k = min(k, len(ids))
+        top = np.argpartition(-combined, k - 1)[:k]
+        top = top[np.lexsort((top, -combined[top]))]
+        return [
+            JobMatch(ids[i], float(combined[i]), float(semantic[i]), float(skill[i]),
+                     self._postings[ids[i]]["metadata"])
+            for i in top
+        ]
+
+    def missing_keywords(self, posting_id, resume_keywords):
+        """Keywords of a posting that the resume does not mention, sorted."""
+        return sorted(set(self._postings[posting_id]["keywords"]) - set(resume_keywords))
+
+    def save(self, path):
+        """Writes the index to a JSON file, replacing it atomically."""
+        tmp_path = "%s.tmp" % path
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "postings": self._postings}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads an index written by ``save``."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError("Unsupported job index version: %r" % data.get("version"))
+        index = cls()
+        for posting_id, posting in data["postings"].items():
+            index._insert(posting_id, posting["keywords"], posting["term_counts"], posting["metadata"])
+        return index
+
+
+def _read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def main(argv=None):
+    from parser import extract_text_from_pdf
+
+    parser = argparse.ArgumentParser(description="Build or query an index of job descriptions.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Add every .txt posting in a directory to the index")
+    build.add_argument("directory")
+    build.add_argument("--index", required=True)
+    query = subcommands.add_parser("query", help="Rank the indexed postings for one resume")
+    query.add_argument("resume", help="Resume as a PDF or text file")
+    query.add_argument("--index", required=True)
+    query.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = JobIndex.load(args.index) if os.path.exists(args.index) else JobIndex()
+        names = sorted(name for name in os.listdir(args.directory) if name.endswith(".txt"))
+        index.add_many((os.path.splitext(name)[0], _read_text(os.path.join(args.directory, name)))
+                       for name in names)
+        index.save(args.index)
+        print("Indexed %d postings (%d total)" % (len(names), len(index)))
+    else:
+        index = JobIndex.load(args.index)
+        if args.resume.lower().endswith(".pdf"):
+            with open(args.resume, "rb") as f:
+                resume_text = extract_text_from_pdf(f)
+        else:
+            with open(args.resume, "r", encoding="utf-8") as f:
+                resume_text = f.read()
+        for match in index.query(resume_text, k=args.k):
+            print("%.3f  %s  (semantic %.3f, skills %.3f)" % (
+                match.score, match.posting_id, match.semantic_score, match.skill_score))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,105 +1,363 @@
+import hashlib
 import json
 import logging
-import re
-import spacy
-from typing import Dict, List, Tuple
-from utils import clean_text
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from analysis_context import AnalysisContext, doc_consumer
+from keyword_matcher import KeywordMatcher
+from nlp_patterns import action_verb_counts, passive_counts
+from nlp_provider import is_long, parse, parse_chunks
+from resume_features import ResumeFeatures
+import tracing
 
 logger = logging.getLogger(__name__)
 
-nlp = spacy.load("en_core_web_sm")
+# Resolved relative to the package so scoring works from any working directory.
+CRITERIA_PATH = Path(__file__).resolve().parent / "data" / "resume_scoring_criteria.json"
+
+REQUIRED_FIELDS = ('Category', 'Type', 'Keyword/Pattern', 'Weight', 'Notes')
+
+DEFAULT_SUGGESTION = 'Consider improving this area based on job requirements.'
+
+# Criteria scoring below this threshold produce a feedback entry.
+FEEDBACK_THRESHOLD = 0.5
+
+SUGGESTIONS = {
+    'Section': {
+        'Education': 'Add an Education section with your degree, institution, and graduation year.',
+        'Experience': 'Include a detailed Work Experience section with your professional roles.',
+        'Skills': 'Add a Skills section listing your technical competencies.',
+        'Projects': 'Include a Projects section showcasing your work outside of employment.'
+    },
+    'Bullet Quality': {
+        'Starts with action verb': 'Start each bullet point with a strong action verb like "Developed", "Implemented", or "Led".',
+        'Contains a number/quantified metric': 'Include specific numbers and metrics in your bullet points (e.g., "Improved performance by 40%").'
+    },
+    'Keywords': {
+        'Python, Java, C++, Go': 'Include relevant programming languages mentioned in the job description.',
+        'SQL, NoSQL, MongoDB, PostgreSQL': 'Mention database technologies you\'ve worked with.',
+        'AWS, GCP, Azure, Docker, Kubernetes': 'Include cloud and DevOps technologies from your experience.',
+        'REST, gRPC, GraphQL': 'Mention API technologies you\'ve used.',
+        'React, Node.js, Express, TypeScript': 'Include web development frameworks and technologies.'
+    }
+}
+
+# An evaluator scores one criterion: (scorer, resume_text, resume_sections, context) -> score
+Evaluator = Callable[['JobSpecificScorer', str, Dict, AnalysisContext], float]
+
+
+class CompiledCriterion(NamedTuple):
+    """A validated scoring criterion with its evaluator and suggestion resolved up front."""
+    category: str
+    type: str
+    pattern: str
+    weight: float
+    notes: str
+    category_key: str
+    evaluator: Evaluator
+    suggestion: str
+    source: Mapping
+    # Stage name under which tracing records this criterion's evaluation time
+    trace_name: str
+    # Whether the evaluator reads the spaCy parse rather than just the text
+    uses_nlp: bool
+
+
+class CriteriaPlan(NamedTuple):
+    """An immutable, compiled form of the scoring criteria file."""
+    criteria: Tuple[CompiledCriterion, ...]
+    total_weight: float
+    digest: str
+    # One PhraseMatcher over the keywords of every Keywords criterion, one group per criterion
+    keyword_matcher: KeywordMatcher
+
+
+EMPTY_PLAN = CriteriaPlan(criteria=(), total_weight=0.0, digest='', keyword_matcher=KeywordMatcher(()))
+
+
+def _constant(score: float) -> Evaluator:
+    return lambda scorer, resume_text, resume_sections, context: score
+
+
+# The per-Doc counts of the NLP checks, computed in the one pass over a long resume.
+doc_consumer(action_verb_counts)
+
+
+@doc_consumer
+def _passive_counts(doc, text):
+    return passive_counts(doc)
+
+
+def _compile_evaluator(category: str, pattern: str, keyword_matcher: KeywordMatcher,
+                       keyword_group: Optional[int]) -> Tuple[Evaluator, bool]:
+    """
+    Resolve the category/pattern dispatch for a criterion once, at compile time.
+
+    Returns the evaluator and whether it reads the spaCy parse rather than just the text.
+    """
+    pattern_lower = pattern.lower()
+
+    if category == 'Section':
+        return lambda scorer, text, sections, context: scorer._check_section_presence(sections, pattern), False
+    elif category == 'Bullet Quality':
+        if "action verb" in pattern_lower:
+            return lambda scorer, text, sections, context: scorer._check_action_verbs(
+                context.resume.doc_results(action_verb_counts)), True
+        elif "number" in pattern_lower or "metric" in pattern_lower:
+            return lambda scorer, text, sections, context: scorer._check_quantified_metrics(context.resume_features), False
+        return _constant(0.0), False
+    elif category == 'Keywords':
+        return lambda scorer, text, sections, context: scorer._check_keyword_match(
+            context.keyword_hits(keyword_matcher), keyword_matcher, keyword_group), False
+    elif category == 'Formatting':
+        if "bullet count" in pattern_lower:
+            return lambda scorer, text, sections, context: scorer._check_bullet_count(context.resume_features), False
+        elif "sentence length" in pattern_lower:
+            return lambda scorer, text, sections, context: scorer._check_sentence_length(context.resume_features), False
+        return _constant(0.5), False  # Default moderate score
+    elif category == 'Readability':
+        if "passive voice" in pattern_lower:
+            return lambda scorer, text, sections, context: scorer._check_passive_voice(
+                text, counts=context.resume.doc_results(_passive_counts)), True
+        return _constant(0.7), False  # Default moderate score
+    elif category == 'ATS Friendly':
+        # These are placeholder checks - in a real system you'd need more sophisticated analysis
+        if "graphics" in pattern_lower and "standard fonts" not in pattern_lower:
+            return lambda scorer, text, sections, context: scorer._check_graphics(context.resume_features), False
+        return _constant(0.8), False  # Assume good unless we can detect otherwise
+
+    logger.warning("Unknown scoring criterion category %r; it will always score 0.", category)
+    return _constant(0.0), False
+
+
+def _validate_criterion(criterion) -> Optional[str]:
+    """Return a description of what is wrong with a criterion entry, or None if it is valid."""
+    if not isinstance(criterion, dict):
+        return "expected an object, got %s" % type(criterion).__name__
+    missing = [field for field in REQUIRED_FIELDS if field not in criterion]
+    if missing:
+        return "missing field(s) %s" % ", ".join(missing)
+    weight = criterion['Weight']
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+        return "Weight must be a non-negative number, got %r" % (weight,)
+    if not isinstance(criterion['Category'], str) or not isinstance(criterion['Keyword/Pattern'], str):
+        return "Category and Keyword/Pattern must be strings"
+    return None
+
+
+def compile_criteria(raw_criteria, digest: str = '') -> CriteriaPlan:
+    """
+    Validate raw criteria rows and compile them into a CriteriaPlan.
+
+    Invalid rows are logged and skipped so one bad entry does not disable scoring.
+    """
+    if not isinstance(raw_criteria, list):
+        logger.error("Scoring criteria must be a JSON list, got %s", type(raw_criteria).__name__)
+        return EMPTY_PLAN._replace(digest=digest)
+
+    valid = []
+    for index, criterion in enumerate(raw_criteria):
+        problem = _validate_criterion(criterion)
+        if problem:
+            logger.error("Skipping invalid scoring criterion #%d: %s", index, problem)
+            continue
+        valid.append(criterion)
+
+    # Every Keywords criterion becomes one group of a shared PhraseMatcher so a
+    # resume is scanned once for all of them.
+    keyword_groups = {}
+    for index, criterion in enumerate(valid):
+        if criterion['Category'] == 'Keywords':
+            keyword_groups[index] = len(keyword_groups)
+    keyword_matcher = KeywordMatcher(valid[index]['Keyword/Pattern'].split(',') for index in keyword_groups)
+
+    compiled = []
+    for index, criterion in enumerate(valid):
+        category = criterion['Category']
+        pattern = criterion['Keyword/Pattern']
+        evaluator, uses_nlp = _compile_evaluator(category, pattern, keyword_matcher, keyword_groups.get(index))
+        compiled.append(CompiledCriterion(
+            category=category,
+            type=criterion['Type'],
+            pattern=pattern,
+            weight=criterion['Weight'],
+            notes=criterion['Notes'],
+            # Map category to the correct scores key
+            category_key=category.lower().replace(" ", "_") + "_scores",
+            evaluator=evaluator,
+            suggestion=SUGGESTIONS.get(category, {}).get(pattern, DEFAULT_SUGGESTION),
+            source=MappingProxyType(dict(criterion)),
+            trace_name="criterion:%s/%s" % (category, pattern),
+            uses_nlp=uses_nlp,
+        ))
+
+    total_weight = 0.0
+    for criterion in compiled:
+        total_weight += criterion.weight
+    return CriteriaPlan(criteria=tuple(compiled), total_weight=total_weight, digest=digest,
+                        keyword_matcher=keyword_matcher)
+
+
+class _CachedPlan(NamedTuple):
+    mtime_ns: int
+    size: int
+    plan: CriteriaPlan
+
+
+_plan_cache: Dict[Path, _CachedPlan] = {}
+_plan_lock = threading.Lock()
+
+
+def load_criteria_plan(path=CRITERIA_PATH) -> CriteriaPlan:
+    """
+    Load the compiled criteria plan for ``path``, compiling it only when needed.
+
+    Plans are cached per file and shared by every scorer. A cached plan is reused
+    while the file's mtime and size are unchanged; if they change, the file is
+    re-read and the plan is only recompiled when its SHA-256 digest differs.
+    """
+    path = Path(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        logger.error("Scoring criteria file not found at %s", path)
+        return EMPTY_PLAN
+
+    cached = _plan_cache.get(path)
+    if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+        return cached.plan
+
+    with _plan_lock:
+        cached = _plan_cache.get(path)
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached.plan
 
-class JobSpecificScorer:
-    def __init__(self):
-        self.criteria = self._load_scoring_criteria()
-        
-    def _load_scoring_criteria(self) -> List[Dict]:
-        """Load scoring criteria from JSON file."""
         try:
-            with open('data/resume_scoring_criteria.json', 'r') as f:
-                return json.load(f)
+            data = path.read_bytes()
         except FileNotFoundError:
-            logger.error("Scoring criteria file not found at data/resume_scoring_criteria.json")
-            return []
-        except json.JSONDecodeError as e:
-            logger.error("Failed to decode scoring criteria JSON: %s", e)
-            return []
-    
-    def score_software_engineering_resume(self, resume_text: str, resume_sections: Dict) -> Dict:
-        """Score a resume specifically for software engineering roles."""
-        scores = {
-            'section_scores': {},
-            'keyword_scores': {},
-            'formatting_scores': {},
-            'bullet_quality_scores': {},
-            'readability_scores': {},
-            'ats_friendly_scores': {},
-            'total_score': 0.0,
-            'detailed_feedback': []
+            logger.error("Scoring criteria file not found at %s", path)
+            return EMPTY_PLAN
+        digest = hashlib.sha256(data).hexdigest()
+
+        if cached and cached.plan.digest == digest:
+            plan = cached.plan
+        else:
+            try:
+                plan = compile_criteria(json.loads(data), digest)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.error("Failed to decode scoring criteria JSON: %s", e)
+                plan = EMPTY_PLAN._replace(digest=digest)
+
+        _plan_cache[path] = _CachedPlan(stat.st_mtime_ns, stat.st_size, plan)
+        return plan
+
+
+def weighted_totals(scores: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted average of each row of raw criterion scores.
+
+    NaN scores (criteria that were not evaluated) are left out; a row without
+    any weighted evaluated criterion totals 0.
+    """
+    evaluated = ~np.isnan(scores)
+    weights = evaluated * weights
+    weighted = (np.where(evaluated, scores, 0.0) * weights).sum(axis=1)
+    total_weights = weights.sum(axis=1)
+    return np.divide(weighted, total_weights, out=np.zeros(len(scores)), where=total_weights > 0)
+
+
+def plan_feedback(plan: CriteriaPlan, scores: np.ndarray) -> List[Dict]:
+    """The ``detailed_feedback`` entries for one resume's raw scores under ``plan``."""
+    # NaN compares False, so criteria that were not evaluated never fail.
+    return [
+        {'category': criterion.category, 'issue': criterion.pattern,
+         'suggestion': criterion.suggestion, 'weight': criterion.weight}
+        for criterion, score in zip(plan.criteria, scores) if score < FEEDBACK_THRESHOLD
+    ]
+
+
+def plan_results(plan: CriteriaPlan, scores: np.ndarray) -> Dict:
+    """One resume's raw scores under ``plan`` in the format of ``score_software_engineering_resume``."""
+    scores = np.asarray(scores, dtype=np.float64)
+    results = {
+        'section_scores': {},
+        'keyword_scores': {},
+        'formatting_scores': {},
+        'bullet_quality_scores': {},
+        'readability_scores': {},
+        'ats_friendly_scores': {},
+    }
+    for criterion, score in zip(plan.criteria, scores):
+        results.setdefault(criterion.category_key, {})[criterion.pattern] = {
+            'score': None if np.isnan(score) else float(score), 'weight': criterion.weight,
+            'notes': criterion.notes
         }
-        
-        total_weight = 0.0
-        weighted_score = 0.0
+    weights = np.array([criterion.weight for criterion in plan.criteria], dtype=np.float64)
+    results['total_score'] = float(weighted_totals(scores.reshape(1, -1), weights)[0])
+    results['detailed_feedback'] = plan_feedback(plan, scores)
+    return results
+
 
+class JobSpecificScorer:
+    def __init__(self, criteria_path=CRITERIA_PATH):
+        self.plan = load_criteria_plan(criteria_path)
+        self.criteria = self.plan.criteria
+    
+    def score_software_engineering_resume(self, resume_text: str, resume_sections: Dict,
+                                          context: Optional[AnalysisContext] = None,
+                                          include_nlp: bool = True,
+                                          nlp_scores: Optional[Mapping[Tuple[str, str], float]] = None) -> Dict:
+        """Score a resume specifically for software engineering roles.
+
+        ``context`` carries the already parsed resume so NLP-based criteria
+        reuse it instead of parsing the text again. With ``include_nlp=False``
+        those criteria are skipped instead: they are listed with a ``None``
+        score and no feedback, and ``total_score`` averages the other criteria.
+        ``nlp_scores`` supplies the scores of those criteria, keyed by
+        ``(category, pattern)``, in place of evaluating them, e.g. from a
+        near-duplicate resume's results.
+        The results are built by ``plan_results``, as ``score_matrix.ScoreMatrix.to_results`` builds them.
+        """
         if not self.criteria:
             logger.warning("No scoring criteria loaded. Returning default scores.")
-            return scores
-
-        for criterion in self.criteria:
-            category = criterion['Category']
-            criterion_type = criterion['Type']
-            pattern = criterion['Keyword/Pattern']
-            weight = criterion['Weight']
-            notes = criterion['Notes']
-            
-            score = self._evaluate_criterion(resume_text, resume_sections, criterion)
-            
-            # Map category to the correct scores key
-            category_key = category.lower().replace(" ", "_") + "_scores"
-            if category_key not in scores:
-                scores[category_key] = {}
-            
-            scores[category_key][pattern] = {
-                'score': score,
-                'weight': weight,
-                'notes': notes
-            }
-            
-            weighted_score += score * weight
-            total_weight += weight
-            
-            # Add feedback for failed criteria
-            if score < 0.5:
-                scores['detailed_feedback'].append({
-                    'category': category,
-                    'issue': pattern,
-                    'suggestion': self._get_suggestion(criterion),
-                    'weight': weight
-                })
-        
-        scores['total_score'] = weighted_score / total_weight if total_weight > 0 else 0.0
+        reuse = include_nlp and nlp_scores is not None
+        scores = self.score_criteria(resume_text, resume_sections, context, include_nlp=include_nlp and not reuse)
+        if reuse:
+            for column, criterion in enumerate(self.criteria):
+                if criterion.uses_nlp:
+                    score = nlp_scores.get((criterion.category, criterion.pattern))
+                    scores[column] = float('nan') if score is None else score
+        return plan_results(self.plan, scores)
+
+    def score_criteria(self, resume_text: str, resume_sections: Dict, context: Optional[AnalysisContext] = None,
+                       include_nlp: bool = True) -> np.ndarray:
+        """
+        Raw score of every criterion of the plan for one resume.
+
+        Criteria that read the spaCy parse score NaN (not evaluated) with
+        ``include_nlp=False``.
+        """
+        if context is None:
+            context = AnalysisContext(resume_text)
+        scores = np.full(len(self.criteria), np.nan)
+        for column, criterion in enumerate(self.criteria):
+            if include_nlp or not criterion.uses_nlp:
+                scores[column] = self._evaluate_criterion(resume_text, resume_sections, criterion, context)
         return scores
     
-    def _evaluate_criterion(self, resume_text: str, resume_sections: Dict, criterion: Dict) -> float:
-        """Evaluate a single scoring criterion."""
-        category = criterion['Category']
-        criterion_type = criterion['Type']
-        pattern = criterion['Keyword/Pattern']
-        
-        if category == 'Section':
-            return self._check_section_presence(resume_sections, pattern)
-        elif category == 'Bullet Quality':
-            return self._check_bullet_quality(resume_text, pattern)
-        elif category == 'Keywords':
-            return self._check_keyword_match(resume_text, pattern)
-        elif category == 'Formatting':
-            return self._check_formatting(resume_text, pattern)
-        elif category == 'Readability':
-            return self._check_readability(resume_text, pattern)
-        elif category == 'ATS Friendly':
-            return self._check_ats_friendly(resume_text, pattern)
-        
-        return 0.0
+    def _evaluate_criterion(self, resume_text: str, resume_sections: Dict, criterion: CompiledCriterion,
+                            context: Optional[AnalysisContext] = None) -> float:
+        """Evaluate a single compiled scoring criterion."""
+        if context is None:
+            context = AnalysisContext(resume_text)
+        with tracing.span(criterion.trace_name):
+            return criterion.evaluator(self, resume_text, resume_sections, context)
     
     def _check_section_presence(self, resume_sections: Dict, section_name: str) -> float:
         """Check if a required section is present."""
@@ -118,132 +376,78 @@ class JobSpecificScorer:
         
         return 0.0
     
-    def _check_bullet_quality(self, resume_text: str, pattern: str) -> float:
-        """Check bullet point quality."""
-        if "action verb" in pattern.lower():
-            return self._check_action_verbs(resume_text)
-        elif "number" in pattern.lower() or "metric" in pattern.lower():
-            return self._check_quantified_metrics(resume_text)
-        
-        return 0.0
-    
-    def _check_action_verbs(self, resume_text: str) -> float:
-        """Check if bullet points start with action verbs."""
-        action_verbs = [
-            'developed', 'implemented', 'designed', 'built', 'created', 'led', 'managed',
-            'optimized', 'improved', 'reduced', 'increased', 'deployed', 'migrated',
-            'collaborated', 'architected', 'engineered', 'programmed', 'automated'
-        ]
-        
-        # Find bullet points (lines starting with • or -)
-        bullet_pattern = r'^[\s]*[-•]\s*(.+)$'
-        bullets = re.findall(bullet_pattern, resume_text, re.MULTILINE | re.IGNORECASE)
+    def _check_action_verbs(self, counts: Iterable[Tuple[int, int]]) -> float:
+        """Check if bullet points start with action verbs (matched by lemma).
+
+        ``counts`` holds the ``nlp_patterns.action_verb_counts`` of each Doc of
+        the parsed resume, e.g. ``context.resume.doc_results(action_verb_counts)``.
+        """
+        bullet_count = action_verb_count = 0
+        for bullets, action_verbs in counts:
+            bullet_count += bullets
+            action_verb_count += action_verbs
         
-        if not bullets:
+        if not bullet_count:
             return 0.0
         
-        action_verb_count = 0
-        for bullet in bullets:
-            first_word = bullet.strip().split()[0].lower() if bullet.strip() else ""
-            if first_word in action_verbs:
-                action_verb_count += 1
-        
-        return min(action_verb_count / len(bullets), 1.0)
+        return min(action_verb_count / bullet_count, 1.0)
     
-    def _check_quantified_metrics(self, resume_text: str) -> float:
+    def _check_quantified_metrics(self, features: ResumeFeatures) -> float:
         """Check if bullet points contain quantified metrics."""
-        # Patterns for numbers, percentages, time periods, etc.
-        metric_patterns = [
-            r'\d+%',  # percentages
-            r'\d+[kK]',  # thousands (10k)
-            r'\d+\s*(hours?|days?|weeks?|months?|years?)',  # time
-            r'\d+\s*(million|billion|thousand)',  # large numbers
-            r'\$\d+',  # money
-            r'\d+\.\d+',  # decimals
-            r'\d+x',  # multipliers
-            r'\d+\s*(users?|customers?|clients?|requests?)'  # quantities
-        ]
-        
-        bullet_pattern = r'^[\s]*[-•]\s*(.+)$'
-        bullets = re.findall(bullet_pattern, resume_text, re.MULTILINE | re.IGNORECASE)
-        
-        if not bullets:
+        if not features.bullets:
             return 0.0
         
-        quantified_count = 0
-        for bullet in bullets:
-            for pattern in metric_patterns:
-                if re.search(pattern, bullet, re.IGNORECASE):
-                    quantified_count += 1
-                    break
-        
-        return min(quantified_count / len(bullets), 1.0)
+        quantified_count = sum(features.bullet_has_metric)
+        return min(quantified_count / len(features.bullets), 1.0)
     
-    def _check_keyword_match(self, resume_text: str, keywords: str) -> float:
-        """Check for presence of specific keywords."""
-        keyword_list = [k.strip().lower() for k in keywords.split(',')]
-        resume_lower = resume_text.lower()
-        
-        found_keywords = sum(1 for keyword in keyword_list if keyword in resume_lower)
-        return found_keywords / len(keyword_list) if keyword_list else 0.0
-    
-    def _check_formatting(self, resume_text: str, pattern: str) -> float:
-        """Check formatting criteria."""
-        if "bullet count" in pattern.lower():
-            return self._check_bullet_count(resume_text)
-        elif "sentence length" in pattern.lower():
-            return self._check_sentence_length(resume_text)
-        
-        return 0.5  # Default moderate score
+    def _check_keyword_match(self, keyword_hits: List[Set[str]], keyword_matcher: KeywordMatcher,
+                             keyword_group: int) -> float:
+        """Check for presence of a criterion's keywords, given one scan of the resume."""
+        group_size = keyword_matcher.group_size(keyword_group)
+        return len(keyword_hits[keyword_group]) / group_size if group_size else 0.0
     
-    def _check_bullet_count(self, resume_text: str) -> float:
+    def _check_bullet_count(self, features: ResumeFeatures) -> float:
         """Check if sections have appropriate number of bullets (2-5)."""
-        bullet_pattern = r'^[\s]*[-•]\s*(.+)$'
-        bullets = re.findall(bullet_pattern, resume_text, re.MULTILINE)
+        bullet_count = len(features.bullets)
         
         # This is a simplified check - ideally we'd check per section
-        if 2 <= len(bullets) <= 15:  # Reasonable total for entire resume
+        if 2 <= bullet_count <= 15:  # Reasonable total for entire resume
             return 1.0
-        elif len(bullets) > 0:
+        elif bullet_count > 0:
             return 0.7
         else:
             return 0.0
     
-    def _check_sentence_length(self, resume_text: str) -> float:
+    def _check_sentence_length(self, features: ResumeFeatures) -> float:
         """Check if sentences are reasonably short (<30 words)."""
-        sentences = re.split(r'[.!?]+', resume_text)
-        if not sentences:
+        word_counts = features.sentence_word_counts
+        if not word_counts:
             return 0.0
         
-        good_length_count = 0
-        for sentence in sentences:
-            word_count = len(sentence.split())
-            if 1 <= word_count <= 30:
-                good_length_count += 1
-        
-        return good_length_count / len(sentences)
-    
-    def _check_readability(self, resume_text: str, pattern: str) -> float:
-        """Check readability criteria."""
-        if "passive voice" in pattern.lower():
-            return self._check_passive_voice(resume_text)
-        
-        return 0.7  # Default moderate score
+        good_length_count = sum(1 for word_count in word_counts if 1 <= word_count <= 30)
+        return good_length_count / len(word_counts)
     
-    def _check_passive_voice(self, resume_text: str) -> float:
-        """Check for passive voice usage (lower is better)."""
-        doc = nlp(resume_text)
+    def _check_passive_voice(self, resume_text: str, doc=None,
+                             counts: Optional[Iterable[Tuple[int, int]]] = None) -> float:
+        """Check for passive voice usage (lower is better).
+
+        ``counts`` may hold the ``nlp_patterns.passive_counts`` of each Doc of
+        the parsed resume, e.g. of the chunks of a long one (see
+        ``ParsedText.doc_results``); their sentence counts are summed.
+        """
+        if counts is None:
+            if doc is not None:
+                docs = [doc]
+            else:
+                docs = parse_chunks(resume_text) if is_long(resume_text) else [parse(resume_text)]
+            # "be" + past participle ("was built"), found with NumPy over the Docs' attribute arrays
+            counts = (passive_counts(doc) for doc in docs)
         total_sentences = 0
         passive_sentences = 0
         
-        for sent in doc.sents:
-            total_sentences += 1
-            # Simple heuristic: look for "was/were + past participle"
-            tokens = [token for token in sent]
-            for i, token in enumerate(tokens[:-1]):
-                if token.lemma_ in ['be'] and tokens[i+1].tag_ in ['VBN']:
-                    passive_sentences += 1
-                    break
+        for sentences, passive in counts:
+            total_sentences += sentences
+            passive_sentences += passive
         
         if total_sentences == 0:
             return 1.0
@@ -251,42 +455,6 @@ class JobSpecificScorer:
         passive_ratio = passive_sentences / total_sentences
         return max(0.0, 1.0 - passive_ratio)  # Higher score for less passive voice
     
-    def _check_ats_friendly(self, resume_text: str, pattern: str) -> float:
-        """Check ATS-friendly formatting."""
-        # These are placeholder checks - in a real system you'd need more sophisticated analysis
-        if "standard fonts" in pattern.lower():
-            return 0.8  # Assume good unless we can detect otherwise
-        elif "graphics" in pattern.lower():
-            # Check for common graphic indicators
-            graphic_indicators = ['[image]', '[graphic]', '[chart]', '█', '▪', '▫']
-            has_graphics = any(indicator in resume_text for indicator in graphic_indicators)
-            return 0.3 if has_graphics else 1.0
-        
-        return 0.8
-    
-    def _get_suggestion(self, criterion: Dict) -> str:
-        """Get improvement suggestions based on failed criteria."""
-        category = criterion['Category']
-        pattern = criterion['Keyword/Pattern']
-        
-        suggestions = {
-            'Section': {
-                'Education': 'Add an Education section with your degree, institution, and graduation year.',
-                'Experience': 'Include a detailed Work Experience section with your professional roles.',
-                'Skills': 'Add a Skills section listing your technical competencies.',
-                'Projects': 'Include a Projects section showcasing your work outside of employment.'
-            },
-            'Bullet Quality': {
-                'Starts with action verb': 'Start each bullet point with a strong action verb like "Developed", "Implemented", or "Led".',
-                'Contains a number/quantified metric': 'Include specific numbers and metrics in your bullet points (e.g., "Improved performance by 40%").'
-            },
-            'Keywords': {
-                'Python, Java, C++, Go': 'Include relevant programming languages mentioned in the job description.',
-                'SQL, NoSQL, MongoDB, PostgreSQL': 'Mention database technologies you\'ve worked with.',
-                'AWS, GCP, Azure, Docker, Kubernetes': 'Include cloud and DevOps technologies from your experience.',
-                'REST, gRPC, GraphQL': 'Mention API technologies you\'ve used.',
-                'React, Node.js, Express, TypeScript': 'Include web development frameworks and technologies.'
-            }
-        }
-        
-        return suggestions.get(category, {}).get(pattern, 'Consider improving this area based on job requirements.')
+    def _check_graphics(self, features: ResumeFeatures) -> float:
+        """Check for common graphic indicators that trip up ATS parsing."""
+        return 0.3 if features.has_graphics else 1.0
@@ -0,0 +1,129 @@
+import re
+import threading
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from nlp_provider import get_nlp, tokenize
+
+# Joins inside a token the tokenizer keeps whole, such as "C++/Python",
+# "node.js/React" or "Python+Django". "/" always joins; "+" only between two
+# word characters, so "c++" stays one word.
+JOINED_TOKEN_PATTERN = re.compile(r'/|(?<=\w)\+(?=\w)')
+
+
+class KeywordMatcher:
+    """
+    Finds the keywords of many groups in a single pass over a tokenized text.
+
+    Keywords are organised in groups (one per scoring criterion) and compiled
+    into one spaCy ``PhraseMatcher`` on the ``LOWER`` attribute, which looks
+    tokens up in a hash table instead of comparing keywords one by one, so a
+    scan costs about the same for twenty keywords as for thousands.
+    Keywords match whole tokens only: "go" does not match inside "good" and
+    "java" does not match inside "javascript", while "c++" and "node.js" are
+    single tokens to the tokenizer and match as such. A token that joins
+    words with "/" or "+" (``JOINED_TOKEN_PATTERN``) also matches the
+    keywords among its parts, so "C++/Python" matches both "c++" and "python".
+
+    The PhraseMatcher is built on first use, with the vocab of the shared
+    pipeline, so compiling criteria does not load spaCy.
+    """
+
+    def __init__(self, keyword_groups: Iterable[Iterable[str]]):
+        """
+        Args:
+            keyword_groups: One iterable of keywords per group. Keywords are
+                matched case-insensitively; blank and duplicate keywords are ignored.
+        """
+        self.groups: Tuple[Tuple[str, ...], ...] = tuple(
+            tuple(dict.fromkeys(k.strip().lower() for k in group if k.strip()))
+            for group in keyword_groups
+        )
+
+        self._keywords: List[str] = []
+        self._keyword_groups: List[List[int]] = []
+        self._keyword_ids: Dict[str, int] = {}
+        for group_index, group in enumerate(self.groups):
+            for keyword in group:
+                if keyword not in self._keyword_ids:
+                    self._keyword_ids[keyword] = len(self._keywords)
+                    self._keywords.append(keyword)
+                    self._keyword_groups.append([])
+                self._keyword_groups[self._keyword_ids[keyword]].append(group_index)
+
+        self._matcher = None
+        self._match_ids: Dict[int, int] = {}
+        # Token ORTH hash -> ids of the keywords among its joined parts, filled as tokens are first seen.
+        self._joined_ids: Dict[int, Tuple[int, ...]] = {}
+        self._orth = None
+        self._lock = threading.Lock()
+
+    def _get_matcher(self):
+        if self._matcher is None:
+            with self._lock:
+                if self._matcher is None:
+                    from spacy.attrs import ORTH
+                    from spacy.matcher import PhraseMatcher
+
+                    nlp = get_nlp()
+                    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+                    for keyword_id, pattern in enumerate(nlp.tokenizer.pipe(self._keywords)):
+                        matcher.add(self._keywords[keyword_id], [pattern])
+                        self._match_ids[nlp.vocab.strings[self._keywords[keyword_id]]] = keyword_id
+                    self._orth = ORTH
+                    self._matcher = matcher
+        return self._matcher
+
+    def _split_ids(self, token_text: str) -> Tuple[int, ...]:
+        parts = JOINED_TOKEN_PATTERN.split(token_text.lower())
+        if len(parts) < 2:
+            return ()
+        return tuple(self._keyword_ids[part] for part in parts if part in self._keyword_ids)
+
+    def _find_ids(self, docs: Sequence) -> Set[int]:
+        if not self._keywords:
+            return set()
+        matcher = self._get_matcher()
+        found = {self._match_ids[match_id] for doc in docs for match_id, _, _ in matcher(doc)}
+        # Each distinct token is split once per process; later scans only look its hash up.
+        for doc in docs:
+            strings = doc.vocab.strings
+            for orth in np.unique(doc.to_array(self._orth)).tolist():
+                ids = self._joined_ids.get(orth)
+                if ids is None:
+                    ids = self._joined_ids[orth] = self._split_ids(strings[orth])
+                found.update(ids)
+        return found
+
+    def _tokenize(self, text: str) -> List:
+        # Without keywords there is nothing to match, and no reason to load spaCy.
+        return tokenize(text) if self._keywords else []
+
+    def find(self, text: str) -> Set[str]:
+        """Returns the set of keywords that occur in ``text`` as whole tokens."""
+        return {self._keywords[keyword_id] for keyword_id in self._find_ids(self._tokenize(text))}
+
+    def scan(self, text: str) -> List[Set[str]]:
+        """Tokenizes ``text`` and scans it like ``scan_docs``."""
+        return self.scan_docs(self._tokenize(text))
+
+    def scan_docs(self, docs: Sequence) -> List[Set[str]]:
+        """
+        Scans already tokenized (or parsed) Docs once and reports the keywords found for every group.
+
+        Args:
+            docs: Docs made with the shared pipeline, e.g. ``[AnalysisContext.resume_doc]``.
+
+        Returns:
+            A list with one set of matched keywords per group, in group order.
+        """
+        hits: List[Set[str]] = [set() for _ in self.groups]
+        for keyword_id in self._find_ids(docs):
+            for group_index in self._keyword_groups[keyword_id]:
+                hits[group_index].add(self._keywords[keyword_id])
+        return hits
+
+    def group_size(self, group_index: int) -> int:
+        """Number of distinct keywords in a group."""
+        return len(self.groups[group_index])
@@ -1,26 +1,79 @@
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
+import copy
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import tracing
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from utils import RESUME_SECTIONS
+from analysis_context import AnalysisContext, ParsedText, doc_consumer
+from dedupe import fingerprint, group_duplicates
 from job_specific_scorer import JobSpecificScorer
+from nlp_provider import is_long, parse, parse_chunks, parse_many
+from tfidf_model import get_tfidf_model
 
-nlp = spacy.load("en_core_web_sm")
+def keywords_from_doc(doc):
+    """
+    Collects keywords (noun/proper noun lemmas and noun chunks) from a parsed Doc.
 
-def extract_keywords(text):
-    """Extracts keywords (nouns, proper nouns, and noun chunks) from text."""
-    doc = nlp(text.lower())
+    Keywords are compared case-insensitively, so they are read from the
+    lowercase view of the tokens rather than from a second, lowercased parse.
+    """
     keywords = set()
     for token in doc:
         if token.pos_ in ['NOUN', 'PROPN']:
-            keywords.add(token.lemma_)
+            keywords.add(token.lemma_.lower())
     for chunk in doc.noun_chunks:
-        keywords.add(chunk.text)
+        keywords.add(chunk.text.lower())
+    return list(keywords)
+
+def keywords_from_docs(docs):
+    """Collects the keywords of a sequence of Docs, e.g. the chunks of one long text."""
+    keywords = set()
+    for doc in docs:
+        keywords.update(keywords_from_doc(doc))
+    return list(keywords)
+
+@doc_consumer
+def _doc_keywords(doc, text):
+    return keywords_from_doc(doc)
+
+def keywords_from_parsed(parsed):
+    """
+    Collects the keywords of a ``ParsedText``, e.g. ``context.resume``.
+
+    A long text contributes the keywords of its chunks from the single pass
+    that also feeds the other checks, instead of being parsed again.
+    """
+    keywords = set()
+    for doc_keywords in parsed.doc_results(_doc_keywords):
+        keywords.update(doc_keywords)
     return list(keywords)
 
+def extract_keywords(text):
+    """
+    Extracts keywords (nouns, proper nouns, and noun chunks) from text.
+
+    Long texts are parsed as a stream of chunks and their keywords merged.
+    """
+    if is_long(text):
+        return keywords_from_docs(parse_chunks(text))
+    return keywords_from_doc(parse(text))
+
+@tracing.traced("tfidf")
 def calculate_tfidf_similarity(resume_text, job_desc_text):
-    """Calculates cosine similarity using TF-IDF."""
+    """
+    Calculates cosine similarity using TF-IDF.
+
+    Uses the corpus-fitted model from ``tfidf_model`` when one is present;
+    otherwise fits a vectorizer on just the two documents.
+    """
     if not resume_text or not job_desc_text:
         return 0.0
+
+    model = get_tfidf_model()
+    if model is not None:
+        return model.similarity(resume_text, job_desc_text)
     
     corpus = [resume_text, job_desc_text]
     vectorizer = TfidfVectorizer(stop_words='english')
@@ -30,7 +83,180 @@ def calculate_tfidf_similarity(resume_text, job_desc_text):
     similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
     return similarity[0][0]
 
-def analyze_resume(resume_text, job_desc_text, resume_sections, job_type="general"):
+@tracing.traced("tfidf")
+def calculate_tfidf_similarity_batch(resume_texts, job_desc_text):
+    """
+    Calculates the TF-IDF cosine similarity of many resumes against one job description.
+
+    Produces the same values as calling ``calculate_tfidf_similarity`` once per
+    resume. With a corpus-fitted model the resumes are simply transformed
+    together. Without one, the values come from a single shared term-count
+    matrix: with a two-document corpus every term has one of only two IDF
+    weights, 1.0 when it occurs in both documents and ``ln(3/2) + 1`` when it
+    occurs in just one, so each pairwise similarity can be recovered from a
+    handful of sparse products.
+
+    Args:
+        resume_texts: A sequence of resume texts.
+        job_desc_text: The job description text.
+
+    Returns:
+        A NumPy array with one similarity per resume, in input order.
+    """
+    similarities = np.zeros(len(resume_texts))
+    if not job_desc_text or not resume_texts:
+        return similarities
+
+    model = get_tfidf_model()
+    if model is not None:
+        return model.similarity_batch(resume_texts, job_desc_text)
+
+    vectorizer = CountVectorizer(stop_words='english')
+    try:
+        counts = vectorizer.fit_transform(list(resume_texts) + [job_desc_text]).tocsr()
+    except ValueError:
+        # Every document consisted solely of stop words
+        return similarities
+    resume_counts = counts[:-1].astype(np.float64)
+    job_counts = counts[-1].toarray().ravel().astype(np.float64)
+
+    single_idf_sq = (np.log(1.5) + 1.0) ** 2
+    job_mask = (job_counts > 0).astype(np.float64)
+    resume_sq = resume_counts.multiply(resume_counts)
+    resume_present = resume_counts.copy()
+    resume_present.data[:] = 1.0
+
+    dot = resume_counts @ job_counts
+    resume_norm_sq = single_idf_sq * np.asarray(resume_sq.sum(axis=1)).ravel() - (single_idf_sq - 1.0) * (resume_sq @ job_mask)
+    job_norm_sq = single_idf_sq * (job_counts ** 2).sum() - (single_idf_sq - 1.0) * (resume_present @ (job_counts ** 2))
+
+    denom = np.sqrt(resume_norm_sq * job_norm_sq)
+    valid = (denom > 0) & np.array([bool(text) for text in resume_texts])
+    similarities[valid] = dot[valid] / denom[valid]
+    return similarities
+
+def _keyword_match(resume_keywords, job_desc_keywords):
+    """Returns the skill match score and the top missing keywords of two keyword lists."""
+    common_keywords = set(resume_keywords) & set(job_desc_keywords)
+    missing_keywords = set(job_desc_keywords) - set(resume_keywords)
+    skill_match_score = len(common_keywords) / len(job_desc_keywords) if job_desc_keywords else 0
+    return skill_match_score, sorted(list(missing_keywords))[:10]
+
+def _software_engineering_analysis(resume_sections, keyword_score, skill_match_score, missing_keywords,
+                                   job_specific_results):
+    """Assembles the software engineering analysis from the job-specific scoring results."""
+    return {
+        "total_score": job_specific_results['total_score'],
+        "job_specific_score": job_specific_results['total_score'],
+        "keyword_score": keyword_score,
+        "skill_match_score": skill_match_score,
+        "section_scores": job_specific_results.get('section_scores', {}),
+        "missing_keywords": missing_keywords,
+        "present_sections": [s for s in RESUME_SECTIONS.keys() if resume_sections.get(s)],
+        "missing_sections": [s for s in ['experience', 'education', 'skills'] if s not in [k for k in resume_sections.keys() if resume_sections[k]]],
+        "detailed_feedback": job_specific_results.get('detailed_feedback', []),
+        "job_type": "software_engineering",
+        "formatting_scores": job_specific_results.get('formatting_scores', {}),
+        "keyword_scores": job_specific_results.get('keyword_scores', {})
+    }
+
+def _general_analysis(resume_text, resume_sections, keyword_score, skill_match_score, missing_keywords,
+                      job_type="general"):
+    """Assembles the general analysis."""
+    # 1. Keyword/Semantic Match Score (40%) and 2. Skill Match Score (30%) are precomputed
+
+    # 3. Structure Score (20%)
+    present_sections = [s for s in RESUME_SECTIONS.keys() if resume_sections.get(s)]
+    # Give points for having key sections
+    key_sections_present = sum(1 for s in ['experience', 'education', 'skills'] if s in present_sections)
+    structure_score = key_sections_present / 3.0
+
+    # 4. Clarity Score (10%) - Simple placeholder
+    # A more advanced check could analyze sentence length, action verbs, etc.
+    clarity_score = 1.0 if '•' in resume_text or '*' in resume_text else 0.5 # Bonus for using bullet points
+
+    # Calculate final weighted score
+    total_score = (
+        keyword_score * 0.40 +
+        skill_match_score * 0.30 +
+        structure_score * 0.20 +
+        clarity_score * 0.10
+    )
+
+    return {
+        "total_score": total_score,
+        "keyword_score": keyword_score,
+        "skill_match_score": skill_match_score,
+        "structure_score": structure_score,
+        "missing_keywords": missing_keywords, # Show top 10 missing
+        "present_sections": present_sections,
+        "missing_sections": [s for s in ['experience', 'education', 'skills'] if s not in present_sections],
+        "job_type": job_type
+    }
+
+class SharedAnalysis(NamedTuple):
+    """
+    The parts of an analysis that come from TF-IDF and spaCy.
+
+    A near-duplicate resume can reuse them (see ``reuse_analysis``); its
+    sections, structure, clarity, text-based criteria and totals depend on
+    its own text and sections and are always computed from those.
+    """
+    keyword_score: float
+    skill_match_score: float
+    missing_keywords: List[str]
+    # Scores of the job-specific criteria that read the spaCy parse, keyed by
+    # (category, pattern); None until a software engineering analysis fills them in.
+    nlp_scores: Optional[Dict[Tuple[str, str], float]] = None
+
+
+def _build_analysis(context, resume_sections, job_type, shared, scorer=None):
+    """
+    Assembles the analysis result dictionary from the precomputed match scores.
+
+    Returns:
+        The analysis and ``shared`` with the ``nlp_scores`` it was built with.
+    """
+    if job_type == "software_engineering":
+        # Use job-specific scoring for software engineering
+        scorer = scorer or JobSpecificScorer()
+        with tracing.span("job_specific"):
+            job_specific_results = scorer.score_software_engineering_resume(
+                context.resume_text, resume_sections, context, nlp_scores=shared.nlp_scores)
+        nlp_scores = {(criterion.category, criterion.pattern):
+                      job_specific_results[criterion.category_key][criterion.pattern]['score']
+                      for criterion in scorer.criteria if criterion.uses_nlp}
+        analysis = _software_engineering_analysis(resume_sections, shared.keyword_score, shared.skill_match_score,
+                                                  shared.missing_keywords, job_specific_results)
+        return analysis, shared._replace(nlp_scores=nlp_scores)
+    else:
+        # Original general analysis
+        analysis = _general_analysis(context.resume_text, resume_sections, shared.keyword_score,
+                                     shared.skill_match_score, shared.missing_keywords, job_type)
+        return analysis, shared
+
+
+def _shared_analysis(keyword_score, resume_keywords, job_desc_keywords):
+    return SharedAnalysis(keyword_score, *_keyword_match(resume_keywords, job_desc_keywords))
+
+
+def reuse_analysis(shared, resume_text, resume_sections, job_type="general", scorer=None):
+    """
+    Analyzes a near-duplicate resume, reusing the TF-IDF and spaCy results of its representative.
+
+    Everything else is computed from the resume's own text and sections
+    without parsing it, so a resume that only adds a section gets credit for it.
+
+    Args:
+        shared: The representative's SharedAnalysis, from ``analyze_resume_shared``
+        resume_text: The near-duplicate's extracted text
+        resume_sections: The near-duplicate's detected sections
+        job_type: The type of job being applied for (default: "general")
+        scorer: The JobSpecificScorer to use (default: one for the default criteria file)
+    """
+    return _build_analysis(AnalysisContext(resume_text), resume_sections, job_type, shared, scorer)[0]
+
+def analyze_resume(resume_text, job_desc_text, resume_sections, job_type="general", context=None):
     """
     Performs a full analysis of the resume against the job description.
     
@@ -39,75 +265,92 @@ def analyze_resume(resume_text, job_desc_text, resume_sections, job_type="genera
         job_desc_text: The job description text
         resume_sections: Dictionary of detected resume sections
         job_type: The type of job being applied for (default: "general")
+        context: Optional AnalysisContext for these two texts, e.g. one that
+            already holds a parsed job description shared across many resumes
     
     Returns:
-        A dictionary containing scores and feedback.
+        A dictionary containing scores and feedback. When tracing is active
+        (see ``tracing``) it also holds a ``trace`` entry with the time spent
+        in each stage and criterion.
     """
-    if job_type == "software_engineering":
-        # Use job-specific scoring for software engineering
-        scorer = JobSpecificScorer()
-        job_specific_results = scorer.score_software_engineering_resume(resume_text, resume_sections)
-        
-        # Still calculate traditional metrics for comparison
+    return analyze_resume_shared(resume_text, job_desc_text, resume_sections, job_type, context)[0]
+
+def analyze_resume_shared(resume_text, job_desc_text, resume_sections, job_type="general", context=None):
+    """
+    ``analyze_resume``, also returning the SharedAnalysis its near-duplicates can reuse.
+
+    Returns:
+        An ``(analysis, shared)`` tuple; see ``reuse_analysis``.
+    """
+    with tracing.request("analyze_resume") as trace:
+        if context is None:
+            context = AnalysisContext(resume_text, job_desc_text)
         keyword_score = calculate_tfidf_similarity(resume_text, job_desc_text)
-        resume_keywords = extract_keywords(resume_text)
-        job_desc_keywords = extract_keywords(job_desc_text)
-        common_keywords = set(resume_keywords) & set(job_desc_keywords)
-        missing_keywords = set(job_desc_keywords) - set(resume_keywords)
-        
-        return {
-            "total_score": job_specific_results['total_score'],
-            "job_specific_score": job_specific_results['total_score'],
-            "keyword_score": keyword_score,
-            "skill_match_score": len(common_keywords) / len(job_desc_keywords) if job_desc_keywords else 0,
-            "section_scores": job_specific_results.get('section_scores', {}),
-            "missing_keywords": sorted(list(missing_keywords))[:10],
-            "present_sections": [s for s in RESUME_SECTIONS.keys() if resume_sections.get(s)],
-            "missing_sections": [s for s in ['experience', 'education', 'skills'] if s not in [k for k in resume_sections.keys() if resume_sections[k]]],
-            "detailed_feedback": job_specific_results.get('detailed_feedback', []),
-            "job_type": job_type,
-            "formatting_scores": job_specific_results.get('formatting_scores', {}),
-            "keyword_scores": job_specific_results.get('keyword_scores', {})
-        }
+        with tracing.span("keywords"):
+            resume_keywords = keywords_from_parsed(context.resume)
+            job_desc_keywords = keywords_from_parsed(context.job_desc)
+        analysis, shared = _build_analysis(context, resume_sections, job_type,
+                                           _shared_analysis(keyword_score, resume_keywords, job_desc_keywords))
+        if trace is not None:
+            analysis["trace"] = trace.as_dict()
+        return analysis, shared
+
+def rank_resumes(job_desc_text, resumes, job_type="general", batch_size=32, dedupe_threshold=None):
+    """
+    Analyzes many resumes against a single job description and ranks them.
+
+    The job description is parsed once, each resume is parsed once by
+    streaming the batch through ``nlp.pipe`` (a long one is streamed in
+    chunks on its own instead), and all TF-IDF similarities
+    come from one sparse matrix computation. Each analysis is identical to what ``analyze_resume``
+    returns for the same inputs.
+
+    Args:
+        job_desc_text: The job description text
+        resumes: A sequence of ``(resume_text, resume_sections)`` pairs
+        job_type: The type of job being applied for (default: "general")
+        batch_size: Number of resumes per ``nlp.pipe`` batch
+        dedupe_threshold: If set, resumes whose texts are at least this similar
+            (see ``dedupe.group_duplicates``) are parsed once per group. The
+            rest get a copy of the first one's analysis if their text is
+            identical, or else ``reuse_analysis`` of it.
+
+    Returns:
+        A list of ``(index, analysis)`` tuples sorted by ``total_score``,
+        best match first, where ``index`` is the resume's position in ``resumes``.
+    """
+    resumes = list(resumes)
+    resume_texts = [resume_text for resume_text, _ in resumes]
+
+    if dedupe_threshold is None:
+        groups = [[index] for index in range(len(resumes))]
     else:
-        # Original general analysis
-        # 1. Keyword/Semantic Match Score (40%)
-        keyword_score = calculate_tfidf_similarity(resume_text, job_desc_text)
+        fingerprints = [fingerprint(text) for text in resume_texts]
+        groups = group_duplicates(fingerprints, dedupe_threshold)
+    representative_texts = [resume_texts[group[0]] for group in groups]
+
+    job_desc = ParsedText(job_desc_text)
+    job_desc_keywords = keywords_from_parsed(job_desc)
+    keyword_scores = calculate_tfidf_similarity_batch(representative_texts, job_desc_text)
+    scorer = JobSpecificScorer() if job_type == "software_engineering" else None
 
-        # 2. Skill Match Score (30%)
-        resume_keywords = extract_keywords(resume_text)
-        job_desc_keywords = extract_keywords(job_desc_text)
-        
-        common_keywords = set(resume_keywords) & set(job_desc_keywords)
-        missing_keywords = set(job_desc_keywords) - set(resume_keywords)
-        
-        skill_match_score = len(common_keywords) / len(job_desc_keywords) if job_desc_keywords else 0
-
-        # 3. Structure Score (20%)
-        present_sections = [s for s in RESUME_SECTIONS.keys() if resume_sections.get(s)]
-        # Give points for having key sections
-        key_sections_present = sum(1 for s in ['experience', 'education', 'skills'] if s in present_sections)
-        structure_score = key_sections_present / 3.0
-
-        # 4. Clarity Score (10%) - Simple placeholder
-        # A more advanced check could analyze sentence length, action verbs, etc.
-        clarity_score = 1.0 if '•' in resume_text or '*' in resume_text else 0.5 # Bonus for using bullet points
-
-        # Calculate final weighted score
-        total_score = (
-            keyword_score * 0.40 +
-            skill_match_score * 0.30 +
-            structure_score * 0.20 +
-            clarity_score * 0.10
+    ranked = []
+    resume_docs = parse_many((text for text in representative_texts if not is_long(text)), batch_size=batch_size)
+    for group, keyword_score in zip(groups, keyword_scores):
+        index = group[0]
+        resume_text, resume_sections = resumes[index]
+        resume_doc = None if is_long(resume_text) else next(resume_docs)
+        context = AnalysisContext(resume_text, job_desc_text, resume_doc=resume_doc, job_desc=job_desc)
+        analysis, shared = _build_analysis(
+            context, resume_sections, job_type,
+            _shared_analysis(keyword_score, keywords_from_parsed(context.resume), job_desc_keywords), scorer
         )
+        ranked.append((index, analysis))
+        for duplicate in group[1:]:
+            if fingerprints[duplicate].exact == fingerprints[index].exact:
+                ranked.append((duplicate, copy.deepcopy(analysis)))
+            else:
+                ranked.append((duplicate, reuse_analysis(shared, *resumes[duplicate], job_type, scorer)))
 
-        return {
-            "total_score": total_score,
-            "keyword_score": keyword_score,
-            "skill_match_score": skill_match_score,
-            "structure_score": structure_score,
-            "missing_keywords": sorted(list(missing_keywords))[:10], # Show top 10 missing
-            "present_sections": present_sections,
-            "missing_sections": [s for s in ['experience', 'education', 'skills'] if s not in present_sections],
-            "job_type": job_type
-        }
+    ranked.sort(key=lambda item: item[1]['total_score'], reverse=True)
+    return ranked
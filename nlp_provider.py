@@ -0,0 +1,124 @@
+import itertools
+import threading
+
+import tracing
+from parser import iter_text_chunks
+
+MODEL_NAME = "en_core_web_sm"
+
+# Pipeline components no analysis stage reads. They are excluded when the
+# model is loaded so they never cost memory or parse time. Everything else
+# is kept: stages share one parse per document (see AnalysisContext), and
+# keyword noun chunks and passive-voice sentence bounds need the parser.
+EXCLUDED_COMPONENTS = ("ner",)
+
+# Texts longer than this are parsed as a stream of chunks of at most
+# CHUNK_CHARS characters instead of as one Doc, which keeps them well below
+# spaCy's max_length and bounds peak memory by the chunk size.
+STREAMING_MIN_CHARS = 100_000
+CHUNK_CHARS = 20_000
+
+_nlp = None
+_lock = threading.Lock()
+
+
+def get_nlp():
+    """
+    Returns the process-wide spaCy pipeline, loading it on first use.
+
+    spaCy itself is only imported here, so importing the analysis modules
+    stays cheap for callers that never run an NLP stage.
+    """
+    global _nlp
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                import spacy
+
+                _nlp = spacy.load(MODEL_NAME, exclude=list(EXCLUDED_COMPONENTS))
+    return _nlp
+
+
+def _disabled(nlp, disable):
+    """Filters the components to disable down to those in the loaded pipeline."""
+    return [name for name in disable if name in nlp.pipe_names]
+
+
+@tracing.traced("spacy.parse")
+def parse(text, disable=()):
+    """
+    Parses a single text with the shared pipeline.
+
+    Args:
+        text: The text to parse.
+        disable: Components to skip for this call, e.g. ``("parser",)``.
+
+    Returns:
+        The parsed spaCy ``Doc``.
+    """
+    nlp = get_nlp()
+    return nlp(text, disable=_disabled(nlp, disable))
+
+
+def parse_many(texts, disable=(), batch_size=32):
+    """
+    Streams many texts through ``nlp.pipe`` with the shared pipeline.
+
+    Args:
+        texts: An iterable of texts.
+        disable: Components to skip for this call, e.g. ``("parser",)``.
+        batch_size: Number of texts per ``nlp.pipe`` batch.
+
+    Returns:
+        An iterator of parsed ``Doc`` objects, in input order.
+    """
+    nlp = get_nlp()
+    return nlp.pipe(texts, disable=_disabled(nlp, disable), batch_size=batch_size)
+
+
+def tokenize(text):
+    """
+    Tokenizes a text with the shared pipeline's tokenizer alone.
+
+    This is much cheaper than ``parse`` and enough for matching token text,
+    as ``keyword_matcher`` does. Long texts are tokenized in chunks, like
+    ``parse_chunks``.
+
+    Returns:
+        A list of ``Doc`` objects without annotations, in text order.
+    """
+    nlp = get_nlp()
+    if is_long(text):
+        return list(nlp.tokenizer.pipe(iter_text_chunks(text, CHUNK_CHARS)))
+    return [nlp.make_doc(text)]
+
+
+def is_long(text):
+    """Whether a text is long enough to be parsed in chunks."""
+    return len(text) > STREAMING_MIN_CHARS
+
+
+def parse_chunks(text, disable=(), max_chars=None, batch_size=4, with_text=False):
+    """
+    Streams one long text through ``nlp.pipe`` in chunks.
+
+    The text is split at section headers and paragraph breaks (see
+    ``parser.iter_text_chunks``), so per-chunk results merge into those of a
+    full parse, while only about ``batch_size`` chunk Docs exist at a time.
+
+    Args:
+        text: The text to parse.
+        disable: Components to skip for this call, e.g. ``("parser",)``.
+        max_chars: The maximum chunk length (default: ``CHUNK_CHARS``).
+        batch_size: Number of chunks per ``nlp.pipe`` batch.
+        with_text: Whether to yield each chunk's text along with its Doc.
+
+    Returns:
+        An iterator of parsed ``Doc`` objects, one per chunk, in text order,
+        or of ``(chunk_text, doc)`` tuples if ``with_text`` is set.
+    """
+    chunks = iter_text_chunks(text, max_chars or CHUNK_CHARS)
+    if with_text:
+        chunks, chunk_texts = itertools.tee(chunks)
+        return zip(chunk_texts, parse_many(chunks, disable=disable, batch_size=batch_size))
+    return parse_many(chunks, disable=disable, batch_size=batch_size)
@@ -1,8 +1,42 @@
+import heapq
+import io
+import itertools
+import multiprocessing
 import re
+import time
+from typing import NamedTuple, Optional
+from pdfminer.converter import TextConverter
 from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+import tracing
 from utils import RESUME_SECTIONS, clean_text
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
+# Layout-analysis profiles for pdfminer. "fast" skips the text-box reading
+# order pass (boxes_flow=None) and vertical text detection, which dominate
+# layout time on dense pages, at the cost of a less careful reading order
+# on multi-column layouts.
+LAYOUT_PROFILES = {
+    "default": LAParams(),
+    "fast": LAParams(boxes_flow=None, detect_vertical=False),
+}
+
+
+class PdfExtractionResult(NamedTuple):
+    """Text extracted from a PDF under page, character, time or memory limits."""
+    text: str
+    pages: int
+    truncated: bool
+    diagnostic: Optional[str] = None
+
+
+@tracing.traced("pdf.extract")
 def extract_text_from_pdf(pdf_file):
     """
     Extracts text from a PDF file-like object.
@@ -16,10 +50,263 @@ def extract_text_from_pdf(pdf_file):
     return extract_text(pdf_file)
 
 
+def iter_pdf_pages(pdf_file, layout="default", max_pages=None):
+    """
+    Extracts text from a PDF one page at a time.
+
+    Concatenating the pages gives the same text as ``extract_text_from_pdf``
+    with the same layout profile, but only one page of output is held at a time.
+
+    Args:
+        pdf_file: A file-like object representing the PDF.
+        layout: A key of ``LAYOUT_PROFILES``.
+        max_pages: Stop after this many pages (default: no limit).
+
+    Yields:
+        The text of each page, including pdfminer's trailing form feed.
+    """
+    output = io.StringIO()
+    resource_manager = PDFResourceManager(caching=True)
+    device = TextConverter(resource_manager, output, codec="utf-8", laparams=LAYOUT_PROFILES[layout])
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    try:
+        for page in PDFPage.get_pages(pdf_file, maxpages=max_pages or 0, caching=True):
+            interpreter.process_page(page)
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+    finally:
+        device.close()
+
+
+@tracing.traced("pdf.extract")
+def extract_text_bounded(pdf_file, max_pages=None, max_chars=None, layout="default", on_page=None):
+    """
+    Extracts text from a PDF, stopping at a page or character limit.
+
+    Args:
+        pdf_file: A file-like object representing the PDF.
+        max_pages: Maximum number of pages to extract (default: no limit).
+        max_chars: Maximum number of characters to return (default: no limit).
+        layout: A key of ``LAYOUT_PROFILES``; "fast" trades reading order for speed.
+        on_page: Optional callable invoked with the text of each page as it is extracted.
+
+    Returns:
+        A PdfExtractionResult; ``truncated`` is set when a limit cut the text short.
+    """
+    parts = []
+    length = 0
+    pages = 0
+    truncated = False
+    for page_text in iter_pdf_pages(pdf_file, layout=layout, max_pages=max_pages):
+        pages += 1
+        if max_chars is not None and length + len(page_text) > max_chars:
+            page_text = page_text[:max_chars - length]
+            truncated = True
+        parts.append(page_text)
+        length += len(page_text)
+        if on_page is not None:
+            on_page(page_text)
+        if truncated:
+            break
+
+    if not truncated and max_pages and pages == max_pages:
+        # Only report truncation if the document really has more pages.
+        truncated = _has_more_pages(pdf_file, max_pages)
+
+    diagnostic = None
+    if truncated:
+        diagnostic = "stopped after %d page(s) and %d character(s)" % (pages, length)
+    return PdfExtractionResult("".join(parts), pages, truncated, diagnostic)
+
+
+def _has_more_pages(pdf_file, page_count):
+    """Checks the page tree, without laying pages out, for pages beyond ``page_count``."""
+    for index, _ in enumerate(PDFPage.get_pages(pdf_file, maxpages=page_count + 1)):
+        if index == page_count:
+            return True
+    return False
+
+
+def _isolated_worker(connection, pdf_bytes, max_pages, max_chars, layout, max_memory_mb):
+    """Subprocess entry point: streams page texts back over ``connection``."""
+    if resource is not None and max_memory_mb:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        result = extract_text_bounded(
+            io.BytesIO(pdf_bytes), max_pages=max_pages, max_chars=max_chars, layout=layout,
+            on_page=lambda page_text: connection.send(("page", page_text)),
+        )
+        connection.send(("done", result.truncated, result.diagnostic))
+    except MemoryError:
+        connection.send(("error", "memory limit of %s MB exceeded" % max_memory_mb))
+    except Exception as e:
+        connection.send(("error", "%s: %s" % (type(e).__name__, e)))
+    finally:
+        connection.close()
+
+
+@tracing.traced("pdf.extract")
+def extract_text_isolated(pdf_file, timeout=30.0, max_memory_mb=512, max_pages=None, max_chars=None,
+                          layout="default"):
+    """
+    Extracts text from a PDF in a subprocess with a time and memory limit.
+
+    Pathological or malformed files cannot stall or bloat the caller: pages are
+    streamed back as they are extracted, so when the worker times out, runs out
+    of memory or crashes, the text of the pages completed so far is returned
+    together with a diagnostic.
+
+    Args:
+        pdf_file: The PDF as bytes or a file-like object.
+        timeout: Wall-clock limit in seconds for the whole extraction.
+        max_memory_mb: Address-space limit for the worker (ignored where unsupported).
+        max_pages: Maximum number of pages to extract (default: no limit).
+        max_chars: Maximum number of characters to return (default: no limit).
+        layout: A key of ``LAYOUT_PROFILES``.
+
+    Returns:
+        A PdfExtractionResult. ``diagnostic`` is None only for a complete extraction.
+    """
+    pdf_bytes = pdf_file if isinstance(pdf_file, bytes) else pdf_file.read()
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    worker = context.Process(
+        target=_isolated_worker,
+        args=(sender, pdf_bytes, max_pages, max_chars, layout, max_memory_mb),
+        daemon=True,
+    )
+    worker.start()
+    sender.close()
+
+    parts = []
+    truncated = False
+    diagnostic = None
+    failure = None
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not receiver.poll(remaining):
+                failure = "timed out after %.1fs" % timeout
+                break
+            try:
+                message = receiver.recv()
+            except EOFError:
+                worker.join(1)
+                failure = "worker exited unexpectedly (exit code %s)" % worker.exitcode
+                break
+            if message[0] == "page":
+                parts.append(message[1])
+            elif message[0] == "done":
+                truncated, diagnostic = message[1], message[2]
+                failure = None
+                break
+            else:
+                failure = message[1]
+                break
+    finally:
+        receiver.close()
+        if worker.is_alive():
+            worker.terminate()
+        worker.join(1)
+
+    if failure is not None:
+        truncated = True
+        diagnostic = "%s; returning the %d page(s) extracted before that" % (failure, len(parts))
+    return PdfExtractionResult("".join(parts), len(parts), truncated, diagnostic)
+
+
+# Lowercased section header -> canonical section name, built once. When a
+# synonym is listed under several canonical sections the first one wins,
+# matching the order in which headers used to be tried.
+_SECTION_HEADERS = {}
+for _canonical, _synonyms in RESUME_SECTIONS.items():
+    for _synonym in _synonyms:
+        _SECTION_HEADERS.setdefault(_synonym.lower(), _canonical)
+
+# Case-insensitive full-line header match, used for non-ASCII lines where a
+# plain lowercase lookup could disagree with regex case folding. Each
+# canonical section gets its own named group, tried in RESUME_SECTIONS order.
+_SECTION_GROUPS = {"s%d" % i: canonical for i, canonical in enumerate(RESUME_SECTIONS)}
+_SECTION_HEADER_PATTERN = re.compile(
+    "|".join(
+        "(?P<%s>%s)" % (group, "|".join(re.escape(s) for s in RESUME_SECTIONS[canonical]))
+        for group, canonical in _SECTION_GROUPS.items()
+    ),
+    re.IGNORECASE,
+)
+
+# Any synonym as a whole word. The lookahead makes the scan report a match at
+# every position, so a synonym nested in a longer one is still seen. The
+# leading character class (case-insensitive, like the rest of the pattern)
+# lets the regex engine skip positions that cannot start any synonym cheaply.
+_IMPLICIT_SECTION_PATTERN = re.compile(
+    r"\b(?=["
+    + "".join(sorted({re.escape(s[0].lower()) for synonyms in RESUME_SECTIONS.values() for s in synonyms if s}))
+    + r"])(?=(?:"
+    + "|".join(
+        "(?P<%s>%s)" % (group, "|".join(re.escape(s) for s in RESUME_SECTIONS[canonical]))
+        for group, canonical in _SECTION_GROUPS.items()
+    )
+    + r")\b)",
+    re.IGNORECASE,
+)
+
+# Canonical sections with a synonym that starts with a synonym of another
+# section. The combined scan reports only one section per position, so these
+# are checked individually to keep the result exact.
+_MASKABLE_SECTIONS = {
+    canonical
+    for canonical, synonyms in RESUME_SECTIONS.items()
+    for synonym in synonyms
+    for other, other_synonyms in RESUME_SECTIONS.items()
+    if other != canonical and any(
+        synonym.lower().startswith(o.lower()) or o.lower().startswith(synonym.lower())
+        for o in other_synonyms
+    )
+}
+
+
+def _match_section_header(line_stripped):
+    """Returns the canonical section a stripped line is a header for, or None."""
+    if line_stripped.isascii():
+        return _SECTION_HEADERS.get(line_stripped.lower())
+    match = _SECTION_HEADER_PATTERN.fullmatch(line_stripped)
+    return _SECTION_GROUPS[match.lastgroup] if match else None
+
+
+def _find_implicit_sections(text, wanted):
+    """Returns the subset of ``wanted`` sections whose synonyms appear anywhere in the text."""
+    found = set()
+    remaining = set(wanted) - _MASKABLE_SECTIONS
+    if remaining:
+        for match in _IMPLICIT_SECTION_PATTERN.finditer(text):
+            canonical = _SECTION_GROUPS[match.lastgroup]
+            if canonical in remaining:
+                found.add(canonical)
+                remaining.discard(canonical)
+                if not remaining:
+                    break
+
+    for canonical in _MASKABLE_SECTIONS & set(wanted):
+        for synonym in RESUME_SECTIONS[canonical]:
+            if re.search(r"\b" + re.escape(synonym) + r"\b", text, re.IGNORECASE):
+                found.add(canonical)
+                break
+    return found
+
+
+@tracing.traced("sections")
 def extract_sections(text):
     """
     Extracts sections from resume text based on predefined section headers.
 
+    Header lines are recognised with a single lookup per line, and sections
+    that have no header but are mentioned in the text are detected with one
+    combined scan, so the cost grows linearly with the size of the text.
+
     Args:
         text: The resume text.
 
@@ -31,23 +318,13 @@ def extract_sections(text):
     current_section = None
     section_content = []
 
-    # Build regex patterns from the RESUME_SECTIONS mapping.
-    section_patterns = {
-        canonical: r"^\s*(?:" + "|".join(re.escape(s) for s in synonyms) + r")\s*$"
-        for canonical, synonyms in RESUME_SECTIONS.items()
-    }
-
     for line in text_lines:
         line_stripped = line.strip()
         if not line_stripped:
             continue
 
         # Check if this line is a section header
-        section_found = None
-        for section_name, pattern in section_patterns.items():
-            if re.match(pattern, line_stripped, re.IGNORECASE):
-                section_found = section_name
-                break
+        section_found = _match_section_header(line_stripped)
 
         if section_found:
             # Save previous section if it exists
@@ -66,12 +343,72 @@ def extract_sections(text):
         sections[current_section] = "\n".join(section_content).strip()
 
     # Also check for implicit sections using synonyms
-    for canonical, synonyms in RESUME_SECTIONS.items():
-        if canonical not in sections:
-            for synonym in synonyms:
-                if re.search(r"\b" + re.escape(synonym) + r"\b", text, re.IGNORECASE):
-                    sections[canonical] = True  # Mark section as present
-                    break
+    missing = [canonical for canonical in RESUME_SECTIONS if canonical not in sections]
+    if missing:
+        implicit = _find_implicit_sections(text, missing)
+        for canonical in missing:
+            if canonical in implicit:
+                sections[canonical] = True  # Mark section as present
 
     return sections
 
+
+# A run of blank lines, together with the whitespace that follows it, ends a paragraph.
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+
+
+def _chunk_boundaries(text):
+    """Yields, in order, the offsets where a paragraph or a section header line starts."""
+    paragraph_starts = (match.end() for match in _PARAGRAPH_BREAK.finditer(text))
+    header_starts = []
+    offset = 0
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if offset and stripped and _match_section_header(stripped):
+            header_starts.append(offset + len(line) - len(line.lstrip()))
+        offset += len(line) + 1
+    last = 0
+    for boundary in heapq.merge(paragraph_starts, header_starts):
+        if boundary > last:
+            yield boundary
+            last = boundary
+
+
+def _fallback_cut(text, start, limit):
+    """Where to cut a paragraph longer than a chunk: after a line, a sentence, a word, or at the limit."""
+    for separator in ("\n", ". ", " "):
+        cut = text.rfind(separator, start, limit)
+        if cut > start:
+            return cut + len(separator)
+    return limit
+
+
+def iter_text_chunks(text, max_chars):
+    """
+    Splits text into consecutive chunks of at most ``max_chars`` characters.
+
+    Chunks end at section headers and paragraph breaks whenever possible, so
+    no sentence or noun phrase spans two chunks; only a single paragraph
+    longer than ``max_chars`` is cut inside, at a line, sentence or word end.
+    The whitespace at a boundary stays with the preceding chunk, and the
+    chunks concatenate back to exactly ``text``.
+
+    Args:
+        text: The text to split.
+        max_chars: The maximum chunk length.
+
+    Yields:
+        The chunks, in order.
+    """
+    chunk_start = unit_start = 0
+    for unit_end in itertools.chain(_chunk_boundaries(text), [len(text)]):
+        if unit_end - chunk_start > max_chars and unit_start > chunk_start:
+            yield text[chunk_start:unit_start]
+            chunk_start = unit_start
+        while unit_end - chunk_start > max_chars:
+            cut = _fallback_cut(text, chunk_start, chunk_start + max_chars)
+            yield text[chunk_start:cut]
+            chunk_start = cut
+        unit_start = unit_end
+    if chunk_start < len(text):
+        yield text[chunk_start:]
@@ -0,0 +1,55 @@
+import re
+from typing import NamedTuple, Tuple
+
+# Bullet points: lines starting with • or -
+BULLET_PATTERN = re.compile(r'^[\s]*[-•]\s*(.+)$', re.MULTILINE)
+
+# Numbers, percentages, time periods, etc., combined into a single alternation
+# so each bullet is scanned once instead of once per pattern.
+METRIC_PATTERN = re.compile(
+    '|'.join([
+        r'\d+%',  # percentages
+        r'\d+[kK]',  # thousands (10k)
+        r'\d+\s*(?:hours?|days?|weeks?|months?|years?)',  # time
+        r'\d+\s*(?:million|billion|thousand)',  # large numbers
+        r'\$\d+',  # money
+        r'\d+\.\d+',  # decimals
+        r'\d+x',  # multipliers
+        r'\d+\s*(?:users?|customers?|clients?|requests?)',  # quantities
+    ]),
+    re.IGNORECASE,
+)
+
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+
+# Common markers left behind by images, charts and icon fonts
+GRAPHIC_INDICATORS = ('[image]', '[graphic]', '[chart]', '█', '▪', '▫')
+
+
+class ResumeFeatures(NamedTuple):
+    """Text features shared by the bullet, formatting and ATS checks."""
+    bullets: Tuple[str, ...]
+    bullet_has_metric: Tuple[bool, ...]
+    sentence_word_counts: Tuple[int, ...]
+    has_graphics: bool
+
+
+def extract_resume_features(resume_text: str) -> ResumeFeatures:
+    """
+    Runs every regex-based precomputation over the resume exactly once.
+
+    Args:
+        resume_text: The extracted resume text.
+
+    Returns:
+        A ResumeFeatures tuple. ``bullet_has_metric`` flags the bullets that
+        contain a quantified metric.
+    """
+    bullets = tuple(BULLET_PATTERN.findall(resume_text))
+
+    return ResumeFeatures(
+        bullets=bullets,
+        bullet_has_metric=tuple(METRIC_PATTERN.search(bullet) is not None for bullet in bullets),
+        sentence_word_counts=tuple(len(sentence.split()) for sentence in SENTENCE_SPLIT_PATTERN.split(resume_text)),
+        has_graphics=any(indicator in resume_text for indicator in GRAPHIC_INDICATORS),
+    )
@@ -0,0 +1,352 @@
+"""
+Persistent inverted index of stored resumes for shortlisting candidates for a posting.
+
+Each resume is indexed by the keywords ``extract_keywords`` finds in it (noun
+and proper noun lemmas and noun chunks). A term's postings list holds the
+resumes that mention it, sorted, with the weight of the term in each resume's
+L2-normalized binary TF-IDF vector (IDF smoothed as in scikit-learn's
+``TfidfVectorizer``), so a job description's score for a resume is the cosine
+similarity of their keyword vectors.
+
+``search`` returns the top-k resumes with term-at-a-time MaxScore pruning:
+query terms are visited in decreasing order of their largest possible
+contribution, and as soon as the k-th best score so far exceeds what the
+remaining terms could add up to, no resume outside the current candidates can
+reach the top k. From then on the remaining (usually long, common-term) lists
+are only probed for the candidates by binary search, so a query reads a
+number of postings that grows far slower than the pool. ``rank`` runs only
+that shortlist through the full analysis.
+
+Terms are stored as 64-bit hashes. The index is saved as an uncompressed
+.npz archive (``columnar.write_npz``) and memory-mapped on load, so opening a
+large index costs almost nothing; resumes added or removed afterwards are
+merged into new arrays on the next query or save.
+
+Usage:
+    python resume_index.py build resumes/ --index pool.npz
+    python resume_index.py query posting.txt --index pool.npz -k 100
+    python resume_index.py query posting.txt --index pool.npz -k 10 --rank --job-type software_engineering
+"""
+import argparse
+import hashlib
+import json
+import os
+from typing import Callable, List, NamedTuple
+
+import numpy as np
+
+from columnar import StringColumn, encode_strings, read_npz, write_npz
+from matcher import extract_keywords, keywords_from_doc, rank_resumes
+from nlp_provider import is_long, parse_many
+
+INDEX_VERSION = 1
+
+
+class ResumeMatch(NamedTuple):
+    resume_id: str
+    score: float
+
+
+def term_hash(term):
+    """The 64-bit hash under which a keyword is indexed."""
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _term_hashes(keywords):
+    return np.unique(np.fromiter((term_hash(keyword) for keyword in set(keywords)), dtype=np.uint64))
+
+
+def _empty_arrays():
+    ids_data, ids_offsets = encode_strings([])
+    return {
+        "ids.data": ids_data, "ids.offsets": ids_offsets,
+        "terms": np.zeros(0, dtype=np.uint64),
+        "offsets": np.zeros(1, dtype=np.int64),
+        "postings": np.zeros(0, dtype=np.int32),
+        "weights": np.zeros(0, dtype=np.float32),
+        "max_weights": np.zeros(0, dtype=np.float32),
+        "idf": np.zeros(0, dtype=np.float32),
+    }
+
+
+class ResumeIndex:
+    """
+    Incrementally updatable inverted index of resumes.
+
+    The merged postings are immutable NumPy arrays (memory-mapped when the
+    index was loaded from a file). Additions and removals are kept aside and
+    merged, with all IDF weights recomputed, on the first query or save after
+    a change.
+    """
+
+    def __init__(self):
+        self._arrays = _empty_arrays()
+        self._ids = StringColumn(self._arrays["ids.data"], self._arrays["ids.offsets"])
+        self._doc_numbers = None
+        # Resume id -> term hashes of resumes added since the last merge
+        self._pending = {}
+        # Ids of merged resumes that were removed or replaced since the last merge
+        self._removed = set()
+
+    def __len__(self):
+        return len(self._ids) - len(self._removed) + len(self._pending)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._pending or (resume_id in self._merged_ids() and resume_id not in self._removed)
+
+    def _merged_ids(self):
+        if self._doc_numbers is None:
+            self._doc_numbers = {resume_id: doc for doc, resume_id in enumerate(self._ids)}
+        return self._doc_numbers
+
+    def add(self, resume_id, text, keywords=None):
+        """
+        Adds or replaces a resume.
+
+        Args:
+            resume_id: A string identifying the resume, e.g. its path.
+            text: The extracted resume text.
+            keywords: Precomputed keywords; extracted from ``text`` when omitted.
+        """
+        if keywords is None:
+            keywords = extract_keywords(text)
+        self._insert(resume_id, keywords)
+
+    def add_many(self, resumes, batch_size=32):
+        """
+        Adds many resumes, parsing them in batches.
+
+        Args:
+            resumes: An iterable of ``(resume_id, text)`` tuples.
+            batch_size: Number of texts spaCy processes per batch.
+        """
+        resumes = list(resumes)
+        docs = parse_many([text for _, text in resumes if not is_long(text)], batch_size=batch_size)
+        for resume_id, text in resumes:
+            self._insert(resume_id, extract_keywords(text) if is_long(text) else keywords_from_doc(next(docs)))
+
+    def remove(self, resume_id):
+        """Removes a resume. Raises KeyError if it is not in the index."""
+        if resume_id not in self:
+            raise KeyError(resume_id)
+        self._pending.pop(resume_id, None)
+        if resume_id in self._merged_ids():
+            self._removed.add(resume_id)
+
+    def _insert(self, resume_id, keywords):
+        if resume_id in self._merged_ids():
+            self._removed.add(resume_id)
+        self._pending[resume_id] = _term_hashes(keywords)
+
+    def _merge(self):
+        """Rebuilds the postings arrays with pending additions and removals applied."""
+        if not self._pending and not self._removed:
+            return
+        arrays = self._arrays
+        old_terms = np.repeat(arrays["terms"], np.diff(arrays["offsets"]))
+        old_docs = arrays["postings"]
+        ids = [resume_id for resume_id in self._ids if resume_id not in self._removed]
+        if self._removed:
+            kept = np.ones(len(self._ids), dtype=bool)
+            kept[[self._merged_ids()[resume_id] for resume_id in self._removed]] = False
+            renumber = np.cumsum(kept, dtype=np.int64) - 1
+            keep_postings = kept[old_docs]
+            old_terms, old_docs = old_terms[keep_postings], renumber[old_docs[keep_postings]]
+
+        new_terms = [hashes for hashes in self._pending.values()]
+        new_docs = [np.full(len(hashes), len(ids) + i, dtype=np.int64) for i, hashes in enumerate(new_terms)]
+        ids.extend(self._pending)
+        terms = np.concatenate([old_terms] + new_terms).astype(np.uint64)
+        docs = np.concatenate([old_docs.astype(np.int64)] + new_docs)
+
+        order = np.lexsort((docs, terms))
+        terms, docs = terms[order], docs[order]
+        unique_terms, starts, df = np.unique(terms, return_index=True, return_counts=True)
+        idf = np.log((1 + len(ids)) / (1 + df)) + 1.0
+        posting_idf = np.repeat(idf, df)
+        norms = np.sqrt(np.bincount(docs, weights=posting_idf ** 2, minlength=len(ids)))
+        weights = (posting_idf / norms[docs]).astype(np.float32)
+        offsets = np.zeros(len(unique_terms) + 1, dtype=np.int64)
+        np.cumsum(df, out=offsets[1:])
+
+        ids_data, ids_offsets = encode_strings(ids)
+        self._arrays = {
+            "ids.data": ids_data, "ids.offsets": ids_offsets,
+            "terms": unique_terms,
+            "offsets": offsets,
+            "postings": docs.astype(np.int32),
+            "weights": weights,
+            "max_weights": np.maximum.reduceat(weights, starts) if len(weights) else weights,
+            "idf": idf.astype(np.float32),
+        }
+        self._ids = StringColumn(ids_data, ids_offsets)
+        self._doc_numbers = None
+        self._pending = {}
+        self._removed = set()
+
+    def search(self, job_desc_text=None, k=100, keywords=None) -> List[ResumeMatch]:
+        """
+        Finds the resumes whose keywords best match a job description.
+
+        Args:
+            job_desc_text: The job description text.
+            k: Number of resumes to return.
+            keywords: Precomputed job description keywords; extracted when omitted.
+
+        Returns:
+            Up to ``k`` ResumeMatch tuples, best match first, scored by the
+            cosine similarity of the keyword TF-IDF vectors. Resumes sharing
+            no keyword with the job description are not returned.
+        """
+        if keywords is None:
+            keywords = extract_keywords(job_desc_text)
+        self._merge()
+        arrays = self._arrays
+        query = _term_hashes(keywords)
+        columns = np.searchsorted(arrays["terms"], query)
+        known = columns < len(arrays["terms"])
+        known[known] = arrays["terms"][columns[known]] == query[known]
+        columns = columns[known]
+        if k <= 0 or not len(columns):
+            return []
+
+        idf = arrays["idf"][columns].astype(np.float64)
+        bounds = idf * arrays["max_weights"][columns]
+        order = np.argsort(-bounds, kind="stable")
+        columns, idf = columns[order], idf[order]
+        # remaining[j]: the most that terms j, j+1, ... can add to any score
+        remaining = np.append(np.cumsum(bounds[order][::-1])[::-1], 0.0)
+
+        candidates = np.zeros(0, dtype=np.int32)
+        scores = np.zeros(0)
+        threshold = 0.0
+        for j, column in enumerate(columns):
+            start, end = arrays["offsets"][column], arrays["offsets"][column + 1]
+            docs = arrays["postings"][start:end]
+            if len(candidates) >= k and remaining[j] <= threshold:
+                # No resume outside the candidates can reach the top k any more.
+                positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                hits = docs[positions] == candidates
+                scores[hits] += idf[j] * arrays["weights"][start + positions[hits]]
+            else:
+                # Both lists are sorted, so merge them without sorting again.
+                contributions = idf[j] * arrays["weights"][start:end]
+                positions = np.searchsorted(candidates, docs)
+                known = np.zeros(len(docs), dtype=bool)
+                inside = positions < len(candidates)
+                known[inside] = candidates[positions[inside]] == docs[inside]
+                scores[positions[known]] += contributions[known]
+                # A new resume can score at most its contribution here plus the later terms' bounds.
+                new = np.flatnonzero(~known & (contributions + remaining[j + 1] >= threshold))
+                is_new = np.zeros(len(candidates) + len(new), dtype=bool)
+                is_new[positions[new] + np.arange(len(new))] = True
+                merged_docs, merged_scores = np.empty(len(is_new), dtype=np.int32), np.empty(len(is_new))
+                merged_docs[is_new], merged_scores[is_new] = docs[new], contributions[new]
+                merged_docs[~is_new], merged_scores[~is_new] = candidates, scores
+                candidates, scores = merged_docs, merged_scores
+            if len(candidates) >= k:
+                threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+                viable = scores + remaining[j + 1] >= threshold
+                candidates, scores = candidates[viable], scores[viable]
+
+        top = np.lexsort((candidates, -scores))[:k]
+        query_norm = np.sqrt(np.sum(idf ** 2))
+        return [ResumeMatch(self._ids[int(candidates[i])], float(scores[i] / query_norm)) for i in top]
+
+    def rank(self, job_desc_text, load_text: Callable[[str], str], k=10, shortlist=100, job_type="general"):
+        """
+        Ranks the best resumes for a job description with the full analysis.
+
+        The index shortlists ``shortlist`` resumes and only those are loaded,
+        sectioned and analyzed (``matcher.rank_resumes``, which runs the
+        ``JobSpecificScorer`` for software engineering postings).
+
+        Args:
+            job_desc_text: The job description text.
+            load_text: Returns the extracted text of a resume, given its id.
+            k: Number of ranked resumes to return.
+            shortlist: Number of resumes to analyze (at least ``k``).
+            job_type: The type of job being applied for (default: "general").
+
+        Returns:
+            Up to ``k`` ``(resume_id, analysis)`` tuples sorted by ``total_score``.
+        """
+        from parser import extract_sections
+
+        matches = self.search(job_desc_text, k=max(shortlist, k))
+        resumes = []
+        for match in matches:
+            text = load_text(match.resume_id)
+            resumes.append((text, extract_sections(text)))
+        ranked = rank_resumes(job_desc_text, resumes, job_type)
+        return [(matches[index].resume_id, analysis) for index, analysis in ranked[:k]]
+
+    def save(self, path):
+        """Writes the index to an .npz file, replacing it atomically."""
+        self._merge()
+        arrays = dict(self._arrays)
+        arrays["metadata"] = np.frombuffer(json.dumps({"version": INDEX_VERSION}).encode("utf-8"), dtype=np.uint8)
+        tmp_path = "%s.tmp" % path
+        write_npz(tmp_path, arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps an index written by ``save``."""
+        arrays = read_npz(path)
+        version = json.loads(arrays.pop("metadata").tobytes()).get("version")
+        if version != INDEX_VERSION:
+            raise ValueError("Unsupported resume index version: %r" % version)
+        index = cls()
+        index._arrays = arrays
+        index._ids = StringColumn(arrays["ids.data"], arrays["ids.offsets"])
+        return index
+
+
+def _read_resume(path):
+    from parser import extract_text_from_pdf
+
+    if path.lower().endswith(".pdf"):
+        with open(path, "rb") as f:
+            return extract_text_from_pdf(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query an index of stored resumes.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Add every .pdf and .txt resume in a directory to the index")
+    build.add_argument("directory")
+    build.add_argument("--index", required=True)
+    query = subcommands.add_parser("query", help="Shortlist the indexed resumes for one job description")
+    query.add_argument("job_desc", help="Path of a text file with the job description")
+    query.add_argument("--index", required=True)
+    query.add_argument("-k", type=int, default=10)
+    query.add_argument("--rank", action="store_true", help="Re-rank a shortlist with the full analysis")
+    query.add_argument("--shortlist", type=int, default=100)
+    query.add_argument("--job-type", default="general", choices=["general", "software_engineering"])
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = ResumeIndex.load(args.index) if os.path.exists(args.index) else ResumeIndex()
+        paths = [os.path.join(args.directory, name) for name in sorted(os.listdir(args.directory))
+                 if name.lower().endswith((".pdf", ".txt"))]
+        index.add_many((path, _read_resume(path)) for path in paths)
+        index.save(args.index)
+        print("Indexed %d resumes (%d total)" % (len(paths), len(index)))
+    else:
+        index = ResumeIndex.load(args.index)
+        with open(args.job_desc, "r", encoding="utf-8") as f:
+            job_desc_text = f.read()
+        if args.rank:
+            for resume_id, analysis in index.rank(job_desc_text, _read_resume, k=args.k,
+                                                  shortlist=args.shortlist, job_type=args.job_type):
+                print("%.3f  %s" % (analysis["total_score"], resume_id))
+        else:
+            for match in index.search(job_desc_text, k=args.k):
+                print("%.3f  %s" % (match.score, match.resume_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Batch scoring over a resumes x criteria matrix.
+
+``ScoreMatrix.score`` evaluates every compiled criterion once per resume and
+keeps the raw scores as a NumPy matrix next to the plan's weight vector.
+Totals, category subtotals, the ``score < 0.5`` feedback masks and rankings are
+then single array operations over the whole batch, and ``reweighted`` recomputes
+them for new criteria weights without evaluating anything again. A NaN score
+marks a criterion that was not evaluated: it is left out of every total and
+produces no feedback. Rows are evaluated with ``JobSpecificScorer.score_criteria``
+and turned into results with ``job_specific_scorer.plan_results``, exactly as
+``JobSpecificScorer.score_software_engineering_resume`` does for one resume.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from analysis_context import AnalysisContext
+from job_specific_scorer import (FEEDBACK_THRESHOLD, CriteriaPlan, JobSpecificScorer, load_criteria_plan,
+                                 plan_feedback, plan_results, weighted_totals)
+
+
+def _criterion_key(criterion) -> Tuple[str, str]:
+    return (criterion.category, criterion.pattern)
+
+
+class ScoreMatrix:
+    """Raw per-criterion scores for a batch of resumes, weighted by a criteria plan."""
+
+    def __init__(self, plan: CriteriaPlan, scores: np.ndarray):
+        """
+        Args:
+            plan: The criteria plan the columns of ``scores`` correspond to.
+            scores: Array of shape (resumes, criteria) with raw scores between 0 and 1,
+                or NaN for criteria that were not evaluated.
+        """
+        self.plan = plan
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.ndim != 2:
+            # A flat row; without criteria (e.g. the criteria file is missing) it is one empty row.
+            scores = scores.reshape(-1, len(plan.criteria)) if plan.criteria else np.zeros((1, 0))
+        self.scores = scores
+        self.weights = np.array([criterion.weight for criterion in plan.criteria], dtype=np.float64)
+        self.category_keys = sorted({criterion.category_key for criterion in plan.criteria})
+        # Criteria x categories indicator matrix used for subtotals.
+        self._categories = np.zeros((len(plan.criteria), len(self.category_keys)))
+        for column, criterion in enumerate(plan.criteria):
+            self._categories[column, self.category_keys.index(criterion.category_key)] = 1.0
+
+    @classmethod
+    def score(cls, resumes: Sequence[Tuple[str, Dict]], scorer: Optional[JobSpecificScorer] = None,
+              contexts: Optional[Sequence[AnalysisContext]] = None, include_nlp: bool = True) -> "ScoreMatrix":
+        """
+        Evaluates every criterion of the scorer's plan for a batch of resumes.
+
+        Args:
+            resumes: A sequence of ``(resume_text, resume_sections)`` pairs.
+            scorer: The JobSpecificScorer to use (default: one for the default criteria file).
+            contexts: Optional AnalysisContext per resume, e.g. holding documents
+                already parsed with ``nlp.pipe``.
+            include_nlp: If False, criteria that read the spaCy parse are not
+                evaluated and score NaN.
+        """
+        scorer = scorer or JobSpecificScorer()
+        scores = np.full((len(resumes), len(scorer.plan.criteria)), np.nan)
+        for row, (resume_text, resume_sections) in enumerate(resumes):
+            context = contexts[row] if contexts is not None else AnalysisContext(resume_text)
+            scores[row] = scorer.score_criteria(resume_text, resume_sections, context, include_nlp=include_nlp)
+        return cls(scorer.plan, scores)
+
+    def __len__(self):
+        return self.scores.shape[0]
+
+    def _evaluated(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The scores with NaN replaced by 0 and the (resumes, criteria) weights of evaluated criteria."""
+        evaluated = ~np.isnan(self.scores)
+        return np.where(evaluated, self.scores, 0.0), evaluated * self.weights
+
+    def totals(self) -> np.ndarray:
+        """Weighted average score of the evaluated criteria per resume, 0 if none have weight."""
+        return weighted_totals(self.scores, self.weights)
+
+    def category_subtotals(self) -> Dict[str, np.ndarray]:
+        """Weighted average score per resume within each category, keyed like the score dicts."""
+        scores, weights = self._evaluated()
+        weighted = (scores * weights) @ self._categories
+        category_weights = weights @ self._categories
+        subtotals = np.divide(weighted, category_weights, out=np.zeros_like(weighted), where=category_weights > 0)
+        return {key: subtotals[:, i] for i, key in enumerate(self.category_keys)}
+
+    def failing(self) -> np.ndarray:
+        """Boolean (resumes, criteria) mask of the criteria that produce feedback."""
+        # NaN compares False, so criteria that were not evaluated never fail.
+        return self.scores < FEEDBACK_THRESHOLD
+
+    def ranking(self) -> np.ndarray:
+        """Resume indices ordered by total score, best first; ties keep input order."""
+        return np.argsort(-self.totals(), kind="stable")
+
+    def feedback(self, row: int) -> List[Dict]:
+        """The ``detailed_feedback`` entries for one resume."""
+        return plan_feedback(self.plan, self.scores[row])
+
+    def to_results(self, row: int) -> Dict:
+        """One resume's scores in the format of ``score_software_engineering_resume``."""
+        return plan_results(self.plan, self.scores[row])
+
+    def reweighted(self, plan: Optional[CriteriaPlan] = None) -> "ScoreMatrix":
+        """
+        Applies the weights of another plan to the already computed scores.
+
+        Columns are matched by (category, pattern), so criteria can be reordered
+        or dropped. Only the weights, notes and suggestions may change; a plan
+        with a criterion that was never scored raises ValueError.
+
+        Args:
+            plan: The new criteria plan (default: the current criteria file).
+        """
+        plan = plan or load_criteria_plan()
+        columns = {_criterion_key(criterion): i for i, criterion in enumerate(self.plan.criteria)}
+        missing = [key for key in map(_criterion_key, plan.criteria) if key not in columns]
+        if missing:
+            raise ValueError("Criteria not in the scored plan, re-score needed: %s"
+                             % ", ".join("%s/%s" % key for key in missing))
+        order = [columns[_criterion_key(criterion)] for criterion in plan.criteria]
+        return ScoreMatrix(plan, self.scores[:, order])
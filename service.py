@@ -0,0 +1,456 @@
+"""
+Headless HTTP scoring service.
+
+Endpoints:
+    POST /analyze   JSON {"resume_text", "job_desc_text", "job_type"?, "resume_sections"?}
+                    -> the ``analyze_resume`` result
+    POST /extract   a PDF body (application/pdf) or JSON {"pdf_base64"}
+                    -> {"text", "sections", "pages", "truncated", "diagnostic"}
+    GET  /healthz   -> {"status": "ok", ...}
+    GET  /metrics   -> Prometheus text format
+
+The event loop only parses HTTP. Analysis requests wait in a bounded queue;
+a batcher collects up to ``max_batch_size`` of them, waiting at most
+``max_wait_ms`` after the first, and hands each batch to a worker pool that
+parses every text of the batch in one ``nlp.pipe`` call. Workers load the
+spaCy model, criteria and TF-IDF model once when they start. When the queue
+is full, requests are rejected immediately with 429 instead of piling up.
+Workers answer repeated /analyze and /extract requests, such as client
+retries, from their ``analysis_cache``; set ``RESUME_REVIEWER_CACHE_DB`` to
+share its SQLite tier across workers and restarts.
+
+Usage:
+    python service.py --port 8080 --workers 4 --max-batch-size 16 --max-wait-ms 10
+"""
+import argparse
+import asyncio
+import base64
+import io
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import tracing
+from analysis_cache import cached_extraction, current_analysis_key, get_default_cache, put_analysis
+from analysis_context import AnalysisContext, ParsedText
+from job_specific_scorer import load_criteria_plan
+from matcher import analyze_resume
+from nlp_provider import get_nlp, is_long, parse_many
+from parser import extract_sections, extract_text_bounded
+from tfidf_model import get_tfidf_model
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ("general", "software_engineering")
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _warm_worker():
+    """Loads everything a request needs so the first request is not slow."""
+    get_nlp()
+    load_criteria_plan()
+    get_tfidf_model()
+
+
+def _failure(error):
+    logger.exception("Analysis failed")
+    return "error", "%s: %s" % (type(error).__name__, error)
+
+
+def _analyze_batch(requests):
+    """
+    Analyzes a batch of requests in a worker, parsing all texts in one ``nlp.pipe`` call.
+
+    Requests answered before (a client retrying, or the same resume sent again)
+    come from the worker's ``analysis_cache`` and are not parsed at all.
+
+    Returns:
+        One ``("ok", analysis)`` or ``("error", message)`` pair per request.
+    """
+    cache = get_default_cache()
+    results = [None] * len(requests)
+    pending = []
+    for position, request in enumerate(requests):
+        try:
+            resume_sections = request.get("resume_sections")
+            if resume_sections is None:
+                resume_sections = extract_sections(request["resume_text"])
+            key = current_analysis_key(request["resume_text"], request["job_desc_text"], resume_sections,
+                                       request["job_type"])
+            analysis = cache.get(key)
+        except Exception as e:
+            results[position] = _failure(e)
+            continue
+        if analysis is not None:
+            results[position] = ("ok", analysis)
+        else:
+            pending.append((position, request, resume_sections, key))
+
+    # Long texts are left out of the batch; their contexts stream them in chunks.
+    texts = list(dict.fromkeys(
+        text for _, request, _, _ in pending for text in (request["resume_text"], request["job_desc_text"])
+        if not is_long(text)))
+    docs = dict(zip(texts, parse_many(texts)))
+    # Requests with the same job description share its parse, or its one pass over the chunks.
+    job_descs = {}
+
+    for position, request, resume_sections, key in pending:
+        try:
+            resume_text = request["resume_text"]
+            job_desc_text = request["job_desc_text"]
+            job_desc = job_descs.setdefault(job_desc_text, ParsedText(job_desc_text, docs.get(job_desc_text)))
+            context = AnalysisContext(resume_text, job_desc_text, resume_doc=docs.get(resume_text), job_desc=job_desc)
+            analysis = analyze_resume(resume_text, job_desc_text, resume_sections, request["job_type"],
+                                      context=context)
+            put_analysis(cache, key, analysis)
+            results[position] = ("ok", analysis)
+        except Exception as e:
+            results[position] = _failure(e)
+    return results
+
+
+def _extract_bounded(pdf_bytes, **limits):
+    return extract_text_bounded(io.BytesIO(pdf_bytes), **limits)
+
+
+def _extract(pdf_bytes, max_pages, max_chars):
+    """Extracts text and sections from a PDF in a worker, through the worker's ``analysis_cache``."""
+    result = cached_extraction(pdf_bytes, _extract_bounded, max_pages=max_pages, max_chars=max_chars)
+    return {"text": result.text, "sections": extract_sections(result.text), "pages": result.pages,
+            "truncated": result.truncated, "diagnostic": result.diagnostic}
+
+
+class ScoringService:
+    """Asyncio HTTP server in front of a warm worker pool with request micro-batching."""
+
+    def __init__(self, workers=None, max_batch_size=16, max_wait_ms=10.0, queue_size=256,
+                 max_body_bytes=10 * 1024 * 1024, max_pages=50, max_chars=None):
+        """
+        Args:
+            workers: Worker processes (default: CPU count); 0 runs work on one
+                thread in this process, which is convenient for tests and small setups.
+            max_batch_size: Most analysis requests handed to ``nlp.pipe`` at once.
+            max_wait_ms: How long a batch may wait for more requests after its first one.
+            queue_size: Requests that may wait for a worker before new ones get 429.
+            max_body_bytes: Largest accepted request body; larger ones get 413.
+            max_pages: Page limit for /extract.
+            max_chars: Character limit for /extract.
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue_size = queue_size
+        self.max_body_bytes = max_body_bytes
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+        self._queue = None
+        self._slots = None
+        self._pending_extracts = 0
+        self._pool = None
+        self._server = None
+        self._batcher = None
+        self._batch_tasks = set()
+        self.started = time.time()
+        self.stats = {"requests": {}, "rejected": 0, "batches": 0, "batched_requests": 0}
+        self.latency = {}
+        self.batch_sizes = tracing.Histogram(buckets=tuple(range(1, max_batch_size + 1)))
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Starts the pool, warms the workers and begins listening. Returns the bound port."""
+        loop = asyncio.get_running_loop()
+        if self.workers == 0:
+            self._pool = ThreadPoolExecutor(max_workers=1)
+            slots = 1
+        else:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                             mp_context=multiprocessing.get_context("spawn"))
+            slots = self.workers
+        # Start the workers (and load the model) before accepting connections.
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm_worker) for _ in range(slots)))
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._slots = asyncio.Semaphore(slots)
+        self._batcher = asyncio.create_task(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+        for task in list(self._batch_tasks):
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Micro-batching -------------------------------------------------
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free worker before taking requests off the queue, so
+            # excess requests back up in the bounded queue and get 429s.
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._run_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            self.stats["batches"] += 1
+            self.stats["batched_requests"] += len(batch)
+            self.batch_sizes.observe(len(batch))
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(self._pool, _analyze_batch, [request for request, _ in batch])
+            except Exception as e:
+                results = [("error", "%s: %s" % (type(e).__name__, e))] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+    # --- Endpoints -------------------------------------------------------
+
+    async def _analyze(self, body):
+        request = _json_body(body)
+        resume_text = request.get("resume_text")
+        job_desc_text = request.get("job_desc_text")
+        if not isinstance(resume_text, str) or not isinstance(job_desc_text, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "resume_text and job_desc_text must be strings")
+        job_type = request.get("job_type", "general")
+        if job_type not in JOB_TYPES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "job_type must be one of %s" % ", ".join(JOB_TYPES))
+        resume_sections = request.get("resume_sections")
+        if resume_sections is not None and not isinstance(resume_sections, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "resume_sections must be an object")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(({"resume_text": resume_text, "job_desc_text": job_desc_text,
+                                     "job_type": job_type, "resume_sections": resume_sections}, future))
+        except asyncio.QueueFull:
+            self.stats["rejected"] += 1
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, "analysis queue is full, retry later")
+        status, result = await future
+        if status != "ok":
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, result)
+        if "trace" in result:
+            tracing.REGISTRY.observe_snapshot(result["trace"])
+        return result
+
+    async def _extract(self, body, content_type):
+        if content_type.startswith("application/json"):
+            try:
+                pdf_bytes = base64.b64decode(_json_body(body)["pdf_base64"], validate=True)
+            except (KeyError, TypeError, ValueError):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "expected a base64 string in pdf_base64")
+        else:
+            pdf_bytes = body
+        if not pdf_bytes:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "empty PDF")
+        if self._pending_extracts >= self.queue_size:
+            self.stats["rejected"] += 1
+            raise HTTPError(HTTPStatus.TOO_MANY_REQUESTS, "extraction queue is full, retry later")
+
+        self._pending_extracts += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, _extract, pdf_bytes, self.max_pages, self.max_chars)
+        except Exception as e:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, "could not extract text: %s" % e)
+        finally:
+            self._pending_extracts -= 1
+
+    def _health(self):
+        return {"status": "ok", "workers": self.workers, "queued": self._queue.qsize(),
+                "uptime_s": round(time.time() - self.started, 1)}
+
+    def _metrics(self):
+        lines = [
+            "# HELP resume_reviewer_http_requests_total HTTP requests by path and status.",
+            "# TYPE resume_reviewer_http_requests_total counter",
+        ]
+        lines += ['resume_reviewer_http_requests_total{path="%s",status="%d"} %d' % (path, status, count)
+                  for (path, status), count in sorted(self.stats["requests"].items())]
+        lines += [
+            "# HELP resume_reviewer_rejected_total Requests rejected with 429 because the queue was full.",
+            "# TYPE resume_reviewer_rejected_total counter",
+            "resume_reviewer_rejected_total %d" % self.stats["rejected"],
+            "# HELP resume_reviewer_queue_depth Analysis requests waiting for a worker.",
+            "# TYPE resume_reviewer_queue_depth gauge",
+            "resume_reviewer_queue_depth %d" % self._queue.qsize(),
+            "# HELP resume_reviewer_batch_size Requests per nlp.pipe batch.",
+            "# TYPE resume_reviewer_batch_size histogram",
+        ]
+        lines += tracing.histogram_lines("resume_reviewer_batch_size", self.batch_sizes)
+        lines += [
+            "# HELP resume_reviewer_http_request_seconds HTTP request latency by path.",
+            "# TYPE resume_reviewer_http_request_seconds histogram",
+        ]
+        lines += tracing.labelled_histogram_lines("resume_reviewer_http_request_seconds", "path", self.latency)
+        return "\n".join(lines) + "\n" + tracing.export_prometheus()
+
+    async def _dispatch(self, method, path, headers, body):
+        if path == "/analyze" and method == "POST":
+            return HTTPStatus.OK, "application/json", await self._analyze(body)
+        if path == "/extract" and method == "POST":
+            return HTTPStatus.OK, "application/json", await self._extract(body, headers.get("content-type", ""))
+        if path == "/healthz" and method == "GET":
+            return HTTPStatus.OK, "application/json", self._health()
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, "text/plain; version=0.0.4", self._metrics()
+        if path in ("/analyze", "/extract", "/healthz", "/metrics"):
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "method not allowed")
+        raise HTTPError(HTTPStatus.NOT_FOUND, "not found")
+
+    # --- HTTP/1.1 ------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                started = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _write_response(writer, HTTPStatus.BAD_REQUEST, "application/json",
+                                          {"error": "malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                path = urlsplit(target).path
+
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > self.max_body_bytes:
+                    status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST
+                    await _write_response(writer, status, "application/json",
+                                          {"error": status.phrase}, keep_alive=False)
+                    self._count(path, status, started)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                headers_extra = {}
+                try:
+                    status, content_type, payload = await self._dispatch(method, path, headers, body)
+                except HTTPError as e:
+                    status, content_type, payload = e.status, "application/json", {"error": e.message}
+                    if e.status == HTTPStatus.TOO_MANY_REQUESTS:
+                        headers_extra["Retry-After"] = "1"
+                except Exception as e:
+                    logger.exception("Unhandled error for %s %s", method, path)
+                    status, content_type, payload = HTTPStatus.INTERNAL_SERVER_ERROR, "application/json", \
+                        {"error": "%s: %s" % (type(e).__name__, e)}
+                await _write_response(writer, status, content_type, payload, keep_alive, headers_extra)
+                self._count(path, status, started)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _count(self, path, status, started):
+        key = (path, int(status))
+        self.stats["requests"][key] = self.stats["requests"].get(key, 0) + 1
+        histogram = self.latency.get(path)
+        if histogram is None:
+            histogram = self.latency[path] = tracing.Histogram()
+        histogram.observe(time.perf_counter() - started)
+
+
+def _json_body(body):
+    try:
+        data = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "request body must be JSON")
+    if not isinstance(data, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+    return data
+
+
+async def _write_response(writer, status, content_type, payload, keep_alive=True, extra_headers=None):
+    body = payload.encode("utf-8") if isinstance(payload, str) else json.dumps(payload).encode("utf-8")
+    head = ["HTTP/1.1 %d %s" % (status, HTTPStatus(status).phrase),
+            "Content-Type: %s" % content_type,
+            "Content-Length: %d" % len(body),
+            "Connection: %s" % ("keep-alive" if keep_alive else "close")]
+    head += ["%s: %s" % item for item in (extra_headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the resume scoring HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: in-process)")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--max-pages", type=int, default=50)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    async def run():
+        service = ScoringService(workers=args.workers, max_batch_size=args.max_batch_size,
+                                 max_wait_ms=args.max_wait_ms, queue_size=args.queue_size, max_pages=args.max_pages)
+        port = await service.start(args.host, args.port)
+        logger.info("Listening on http://%s:%d with %d worker(s)", args.host, port, service.workers)
+        serving = asyncio.ensure_future(service.serve_forever())
+        # Shut the worker pool down cleanly on Ctrl-C or a termination signal.
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            asyncio.get_running_loop().add_signal_handler(signum, serving.cancel)
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await service.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -12,3 +12,19 @@ def test_extract_sections_uses_canonical_names():
     assert "work experience" not in sections
     assert "technical skills" not in sections
 
+
+
+def test_extract_sections_headers_are_case_insensitive_full_lines():
+    text = "  EDUCATION  \nState University\nskills used daily\nPROFESSIONAL EXPERIENCE\nEngineer\n"
+    sections = extract_sections(text)
+    assert sections["education"] == "State University\nskills used daily"
+    assert sections["experience"] == "Engineer"
+
+
+def test_extract_sections_marks_implicit_sections():
+    text = "Experience\nBuilt things\nCertificates and a portfolio available on request."
+    sections = extract_sections(text)
+    assert sections["certifications"] is True
+    assert sections["projects"] is True
+    assert "summary" not in sections
+    assert list(sections) == ["experience", "projects", "certifications"]
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import analysis_cache
+from analysis_cache import AnalysisCache, cached_analyze_resume, cached_extract_text_from_pdf
+
+
+def test_memory_tier_is_lru_and_size_bounded():
+    cache = AnalysisCache(max_entries=2)
+    cache.put("a", {"score": 1})
+    cache.put("b", {"score": 2})
+    assert cache.get("a") == {"score": 1}
+    cache.put("c", {"score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1}
+    assert cache.stats == {"memory_hits": 2, "disk_hits": 0, "misses": 1, "evictions": 1}
+
+    small = AnalysisCache(max_bytes=20)
+    small.put("x", "a" * 10)
+    small.put("y", "b" * 10)
+    assert len(small) == 1 and small.get("y") == "b" * 10
+
+
+def test_hits_return_independent_copies():
+    cache = AnalysisCache()
+    cache.put("k", {"missing_keywords": ["aws"]})
+    cache.get("k")["missing_keywords"].append("gcp")
+    assert cache.get("k") == {"missing_keywords": ["aws"]}
+
+
+def test_sqlite_tier_survives_restarts_and_evicts_by_size(tmp_path):
+    db_path = tmp_path / "cache.sqlite"
+    cache = AnalysisCache(db_path=db_path, max_db_bytes=30)
+    cache.put("old", "a" * 12)
+    cache.put("new", "b" * 12)
+    cache.close()
+
+    reopened = AnalysisCache(db_path=db_path, max_db_bytes=30)
+    assert reopened.get("new") == "b" * 12
+    assert reopened.stats["disk_hits"] == 1
+    assert reopened.get("new") == "b" * 12
+    assert reopened.stats["memory_hits"] == 1
+
+    reopened.put("newest", "c" * 12)
+    assert reopened.get("old") is None
+    assert reopened.stats["evictions"] == 1
+    reopened.close()
+
+
+def test_cached_analyze_resume_keys_on_all_inputs(monkeypatch):
+    calls = []
+
+    def fake_analyze(resume_text, job_desc_text, resume_sections, job_type="general", context=None):
+        calls.append((resume_text, job_desc_text, job_type))
+        return {"total_score": 0.5, "job_type": job_type}
+
+    monkeypatch.setattr(analysis_cache, "analyze_resume", fake_analyze)
+    cache = AnalysisCache()
+    sections = {"skills": "Python"}
+
+    first = cached_analyze_resume("resume", "job", sections, "general", cache=cache)
+    again = cached_analyze_resume("resume", "job", sections, "general", cache=cache)
+    cached_analyze_resume("resume", "job", sections, "software_engineering", cache=cache)
+    cached_analyze_resume("resume", "other job", sections, "general", cache=cache)
+
+    assert first == again == {"total_score": 0.5, "job_type": "general"}
+    assert len(calls) == 3
+    assert cache.stats["memory_hits"] == 1
+
+
+def test_cached_extract_text_keys_on_pdf_bytes(monkeypatch):
+    calls = []
+
+    def fake_extract(pdf_file):
+        calls.append(pdf_file.read())
+        return "text"
+
+    monkeypatch.setattr(analysis_cache, "extract_text_from_pdf", fake_extract)
+    cache = AnalysisCache()
+    assert cached_extract_text_from_pdf(b"%PDF-1", cache=cache) == "text"
+    assert cached_extract_text_from_pdf(b"%PDF-1", cache=cache) == "text"
+    assert calls == [b"%PDF-1"]
@@ -0,0 +1,105 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import tracing
+from analysis_session import AnalysisJob, AnalysisSession
+from matcher import analyze_resume
+from parser import extract_sections
+
+RESUME = "Skills\nPython, Java, SQL\n\nExperience\n• Reduced latency by 40% using Redis\n• Built REST APIs"
+JOB_DESCS = ["Python developer with REST API experience", "Java engineer familiar with SQL databases"]
+SECTIONS = extract_sections(RESUME)
+
+
+def test_session_matches_analyze_resume():
+    session = AnalysisSession()
+    for job_desc in JOB_DESCS:
+        for job_type in ("general", "software_engineering"):
+            assert session.analyze(RESUME, job_desc, SECTIONS, job_type) == \
+                analyze_resume(RESUME, job_desc, SECTIONS, job_type)
+
+
+def test_changing_inputs_recomputes_only_downstream_stages():
+    session = AnalysisSession()
+    session.analyze(RESUME, JOB_DESCS[0], SECTIONS, "software_engineering")
+    assert "job_specific" in session.last_computed and "resume_keywords" in session.last_computed
+
+    session.analyze(RESUME, JOB_DESCS[1], SECTIONS, "software_engineering")
+    assert set(session.last_computed) == {"job_desc_keywords", "keyword_score", "keyword_match", "software_engineering"}
+
+    session.analyze(RESUME, JOB_DESCS[1], SECTIONS, "general")
+    assert session.last_computed == ["general"]
+    session.analyze(RESUME, JOB_DESCS[1], SECTIONS, "software_engineering")
+    assert session.last_computed == []
+
+    edited = RESUME + "\n• Mentored two engineers"
+    session.analyze(edited, JOB_DESCS[1], extract_sections(edited), "software_engineering")
+    assert "resume_keywords" in session.last_computed and "job_desc_keywords" not in session.last_computed
+
+
+def test_results_are_fresh_copies(monkeypatch):
+    session = AnalysisSession()
+    first = session.analyze(RESUME, JOB_DESCS[0], SECTIONS, "software_engineering")
+    first["detailed_feedback"].clear()
+    assert session.analyze(RESUME, JOB_DESCS[0], SECTIONS, "software_engineering") == \
+        analyze_resume(RESUME, JOB_DESCS[0], SECTIONS, "software_engineering")
+
+    monkeypatch.setattr(tracing, "_enabled", True)
+    traced = session.analyze(RESUME, JOB_DESCS[1], SECTIONS, "software_engineering")
+    assert "tfidf" in traced["trace"]["stages"] and "job_specific" not in traced["trace"]["stages"]
+
+
+def test_progressive_analysis_fills_in_pending_stages():
+    session = AnalysisSession()
+    updates = []
+    analysis = session.analyze_progressively(RESUME, JOB_DESCS[0], SECTIONS, "software_engineering",
+                                             on_update=updates.append)
+
+    assert analysis == analyze_resume(RESUME, JOB_DESCS[0], SECTIONS, "software_engineering")
+    assert [update["pending"] for update in updates] == [
+        ["keyword_score", "keyword_match", "job_specific"], ["keyword_match", "job_specific"], ["job_specific"], []]
+    first = updates[0]
+    assert first["total_score"] is None and first["keyword_score"] is None and first["missing_keywords"] is None
+    assert first["section_scores"] == analysis["section_scores"]
+    regex_scores = [result["score"] for group in ("formatting_scores", "keyword_scores")
+                    for result in first[group].values()]
+    assert regex_scores and None not in regex_scores
+    assert all(feedback in analysis["detailed_feedback"] for feedback in first["detailed_feedback"])
+    assert updates[1]["keyword_score"] == analysis["keyword_score"]
+    assert {key: value for key, value in updates[-1].items() if key != "pending"} == analysis
+
+    general = []
+    session.analyze_progressively(RESUME, JOB_DESCS[0], SECTIONS, "general", on_update=general.append)
+    # Every stage is already current, so even the first update is complete.
+    assert general[0]["pending"] == [] and general[0]["total_score"] is not None
+
+
+def test_progressive_analysis_stops_when_cancelled():
+    cancel = threading.Event()
+    session = AnalysisSession()
+    updates = []
+
+    def on_update(analysis):
+        updates.append(analysis)
+        cancel.set()
+
+    assert session.analyze_progressively(RESUME, JOB_DESCS[0], SECTIONS, on_update=on_update, cancel=cancel) is None
+    assert len(updates) == 1 and "resume_keywords" not in session.last_computed
+
+
+def test_job_publishes_updates_from_a_background_thread():
+    job = AnalysisJob(AnalysisSession(), RESUME, JOB_DESCS[1], SECTIONS, "software_engineering", timed=True)
+    seen, analyses = 0, []
+    while True:
+        updates, analysis = job.wait(seen)
+        if updates == seen:
+            break
+        seen = updates
+        analyses.append(analysis)
+
+    assert job.error is None and not job.cancelled
+    assert "pending" in analyses[0] and "pending" not in analyses[-1]
+    assert analyses[-1]["trace"]["stages"]["keywords"]["count"] >= 1
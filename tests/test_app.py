@@ -0,0 +1,72 @@
+import hashlib
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import app
+from analysis_session import AnalysisJob
+from test_pdf_extraction import make_pdf
+
+JOB_DESC = "Python developer with API experience"
+
+
+def counting(monkeypatch, name):
+    calls = []
+    original = getattr(app, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+    monkeypatch.setattr(app, name, wrapper)
+    return calls
+
+
+def test_reruns_reuse_extraction_and_switching_job_type_only_rescores(monkeypatch):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    st.session_state.clear()
+    extractions = counting(monkeypatch, "cached_extract_text_from_pdf")
+    displayed = []
+    monkeypatch.setattr(app, "display_results", displayed.append)
+
+    pdf_bytes = make_pdf(["Skills", "Python, Java"])
+    resume_hash = hashlib.sha256(pdf_bytes).hexdigest()
+    for _ in range(2):
+        resume_text, resume_sections = app.extract_resume(resume_hash, pdf_bytes)
+    assert len(extractions) == 1 and "Python" in resume_text
+
+    digests = app._model_digests()
+    session = app.resume_session(resume_hash, digests)
+    results, computed = [], []
+    for job_type in ("general", "software_engineering", "general", "software_engineering"):
+        job = app.start_analysis(resume_hash, JOB_DESC, job_type, resume_text, resume_sections)
+        results.append(app.stream_results(job, st.empty()))
+        # A rerun with the same inputs keeps polling the same job.
+        assert app.start_analysis(resume_hash, JOB_DESC, job_type, resume_text, resume_sections) is job
+        computed.append(session.last_computed)
+    assert results[0] == results[2] and results[1] == results[3]
+    assert results[1]["job_type"] == "software_engineering"
+    # The second job type only ran the scoring the first did not need, and
+    # switching back and forth afterwards computed nothing.
+    assert computed[1] == ["job_specific_fast", "job_specific", "software_engineering"]
+    assert computed[2] == computed[3] == []
+    assert app.load_scorer(digests[0]) is app.load_scorer(digests[0])
+    # Each run drew at least its final result; partial ones only if they came in before it.
+    assert len(displayed) >= 4 and displayed[-1] == results[-1]
+
+
+def test_changing_inputs_cancels_the_running_job(monkeypatch):
+    st.session_state.clear()
+    cancelled = []
+    monkeypatch.setattr(AnalysisJob, "cancel", lambda job: cancelled.append(job))
+    sections = {"skills": "Python"}
+
+    first = app.start_analysis("hash", JOB_DESC, "general", "Skills\nPython", sections)
+    second = app.start_analysis("hash", JOB_DESC + " and SQL", "general", "Skills\nPython", sections)
+
+    assert second is not first and cancelled == [first]
+    assert app.stream_results(second, st.empty())["job_type"] == "general"
@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from generator import LINES_PER_PAGE, generate_job_description, generate_resume
+from parser import extract_sections
+from run import compare
+
+
+def test_generator_is_seeded_and_sized():
+    assert generate_resume(3, seed=1) == generate_resume(3, seed=1)
+    assert generate_resume(3, seed=1) != generate_resume(3, seed=2)
+    assert generate_job_description(4) == generate_job_description(4)
+
+    for pages in (1, 10, 50):
+        assert len(generate_resume(pages).splitlines()) >= pages * LINES_PER_PAGE
+
+    sections = extract_sections(generate_resume(5))
+    assert {"experience", "projects", "skills", "education"} <= set(sections)
+
+
+def test_compare_flags_only_meaningful_regressions():
+    baseline = {"results": {"a@1": {"p50_ms": 10.0}, "b@1": {"p50_ms": 0.001}, "c@1": {"p50_ms": 10.0}}}
+    results = {"a@1": {"p50_ms": 13.0}, "b@1": {"p50_ms": 0.003}, "c@1": {"p50_ms": 11.0}, "new@1": {"p50_ms": 1.0}}
+    regressions = compare(results, baseline, threshold=0.2)
+    assert [key for key, *_ in regressions] == ["a@1"]
@@ -0,0 +1,219 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import analysis_cache
+import bulk_score
+from analysis_cache import AnalysisCache
+from bulk_score import collect_inputs, load_checkpoint, run_bulk
+from matcher import SharedAnalysis, reuse_analysis
+from test_pdf_extraction import make_pdf
+
+FAKE_SHARED = SharedAnalysis(keyword_score=0.5, skill_match_score=0.5, missing_keywords=[])
+
+
+def _fresh_cache(monkeypatch):
+    """Gives the test its own empty process-wide analysis cache."""
+    cache = AnalysisCache()
+    monkeypatch.setattr(analysis_cache, "_default_cache", cache)
+    return cache
+
+
+def _fake_analysis(monkeypatch, calls, full=False):
+    """Replaces parsing and TF-IDF; with ``full``, the rest of the analysis runs for real."""
+    _fresh_cache(monkeypatch)
+    def analyze(resume_text, job_desc_text, resume_sections, job_type="general", context=None):
+        calls.append(resume_text)
+        if full:
+            return reuse_analysis(FAKE_SHARED, resume_text, resume_sections, job_type), FAKE_SHARED
+        return {"total_score": 0.5, "job_type": job_type}, FAKE_SHARED
+
+    monkeypatch.setattr(bulk_score, "parse", lambda text: None)
+    monkeypatch.setattr(bulk_score, "analyze_resume_shared", analyze)
+
+
+def _write_resumes(directory, count):
+    directory.mkdir()
+    for i in range(count):
+        (directory / ("resume_%d.pdf" % i)).write_bytes(make_pdf(["Resume number %d" % i]))
+    (directory / "notes.txt").write_text("not a resume")
+
+
+def _read(output):
+    return [json.loads(line) for line in output.read_text().splitlines()]
+
+
+def test_inline_run_streams_one_record_per_pdf(tmp_path, monkeypatch):
+    calls = []
+    _fake_analysis(monkeypatch, calls)
+    _write_resumes(tmp_path / "resumes", 3)
+    (tmp_path / "resumes" / "broken.pdf").write_bytes(b"not a pdf")
+    output = tmp_path / "scores.jsonl"
+
+    summary = run_bulk([str(tmp_path / "resumes")], "Python engineer", str(output), workers=0, progress=False)
+
+    records = {Path(r["path"]).name: r for r in _read(output)}
+    assert summary == {"scored": 3, "errors": 1, "skipped": 0}
+    assert sorted(records) == ["broken.pdf", "resume_0.pdf", "resume_1.pdf", "resume_2.pdf"]
+    assert records["resume_1.pdf"]["status"] == "ok"
+    assert records["resume_1.pdf"]["pages"] == 1
+    assert records["resume_1.pdf"]["analysis"] == {"total_score": 0.5, "job_type": "general"}
+    assert records["broken.pdf"]["status"] == "error"
+    assert len(calls) == 3
+
+
+def test_rerun_resumes_after_truncated_checkpoint(tmp_path, monkeypatch):
+    calls = []
+    _fake_analysis(monkeypatch, calls)
+    _write_resumes(tmp_path / "resumes", 3)
+    output = tmp_path / "scores.jsonl"
+    pattern = str(tmp_path / "resumes" / "*.pdf")
+
+    run_bulk([pattern], "Python engineer", str(output), workers=0, progress=False)
+    lines = output.read_text().splitlines(keepends=True)
+    # Simulate a crash halfway through writing the third record.
+    output.write_text(lines[0] + lines[1] + lines[2][:10])
+    assert len(load_checkpoint(str(output))) == 2
+    assert output.read_text() == lines[0] + lines[1]
+
+    calls.clear()
+    summary = run_bulk([pattern], "Python engineer", str(output), workers=0, progress=False)
+
+    assert summary == {"scored": 1, "errors": 0, "skipped": 2}
+    # The file whose record was lost had been analyzed already, so its analysis comes from the cache.
+    assert calls == []
+    assert sorted(r["path"] for r in _read(output)) == collect_inputs([pattern])
+
+
+def test_retried_run_is_served_from_the_analysis_cache(tmp_path, monkeypatch):
+    calls = []
+    _fake_analysis(monkeypatch, calls)
+    cache = analysis_cache.get_default_cache()
+    _write_resumes(tmp_path / "resumes", 2)
+    inputs = [str(tmp_path / "resumes")]
+    first = tmp_path / "first.jsonl"
+    run_bulk(inputs, "Python engineer", str(first), workers=0, progress=False)
+
+    extractions = []
+    original = bulk_score.extract_text_bounded
+    monkeypatch.setattr(bulk_score, "extract_text_bounded",
+                        lambda *args, **kwargs: extractions.append(args) or original(*args, **kwargs))
+    calls.clear()
+    second = tmp_path / "second.jsonl"
+    summary = run_bulk(inputs, "Python engineer", str(second), workers=0, progress=False)
+
+    assert summary == {"scored": 2, "errors": 0, "skipped": 0}
+    assert calls == [] and extractions == []
+    assert cache.stats["memory_hits"] == 4
+    assert _read(second) == _read(first)
+
+
+def test_dedupe_run_analyzes_one_resume_per_group(tmp_path, monkeypatch):
+    calls = []
+    _fake_analysis(monkeypatch, calls, full=True)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    words = ["skill%d" % i for i in range(60)]
+    original = make_pdf(["Experience", " ".join(words)])
+    (resumes / "a.pdf").write_bytes(original)
+    (resumes / "b.pdf").write_bytes(original)
+    # A near-duplicate that only adds a Skills section.
+    (resumes / "c.pdf").write_bytes(make_pdf(["Experience", " ".join(words), "Skills", "Python"]))
+    (resumes / "d.pdf").write_bytes(make_pdf(["A different candidate entirely"]))
+    output = tmp_path / "scores.jsonl"
+
+    summary = run_bulk([str(resumes)], "Python engineer", str(output), workers=0, progress=False, dedupe=True)
+
+    records = {Path(r["path"]).name: r for r in _read(output)}
+    assert len(calls) == 2
+    assert summary["scored"] == 4 and summary["errors"] == 0
+    assert summary["duplicate_groups"] == 1 and summary["duplicates"] == 2
+    assert summary["seconds_saved"] >= 0
+    assert "duplicate_of" not in records["a.pdf"] and "duplicate_of" not in records["d.pdf"]
+    assert records["b.pdf"]["duplicate_of"] == records["a.pdf"]["path"]
+    assert records["b.pdf"]["similarity"] == 1.0
+    assert records["c.pdf"]["duplicate_of"] == records["a.pdf"]["path"]
+    assert 0.9 <= records["c.pdf"]["similarity"] < 1.0
+    assert records["b.pdf"]["analysis"] == records["a.pdf"]["analysis"]
+    # The near-duplicate keeps the shared TF-IDF and keyword results but is credited for its own sections.
+    assert records["a.pdf"]["analysis"]["missing_sections"] == ["education", "skills"]
+    assert records["c.pdf"]["analysis"]["missing_sections"] == ["education"]
+    assert records["c.pdf"]["analysis"]["keyword_score"] == records["a.pdf"]["analysis"]["keyword_score"]
+    assert records["c.pdf"]["analysis"]["total_score"] > records["a.pdf"]["analysis"]["total_score"]
+
+
+def test_dedupe_run_writes_byte_copies_with_their_original(tmp_path, monkeypatch):
+    calls = []
+    _fake_analysis(monkeypatch, calls, full=True)
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    words = " ".join("skill%d" % i for i in range(60))
+    near_duplicate = make_pdf(["Experience", words, "Skills", "Python"])
+    (resumes / "a.pdf").write_bytes(make_pdf(["Experience", words]))
+    (resumes / "b.pdf").write_bytes(near_duplicate)
+    (resumes / "c.pdf").write_bytes(make_pdf(["A different candidate entirely"]))
+    (resumes / "d.pdf").write_bytes(near_duplicate)
+    output = tmp_path / "scores.jsonl"
+
+    summary = run_bulk([str(resumes)], "Python engineer", str(output), workers=0, progress=False, dedupe=True)
+
+    names = [Path(r["path"]).name for r in _read(output)]
+    records = {Path(r["path"]).name: r for r in _read(output)}
+    assert len(calls) == 2 and summary["duplicates"] == 2
+    # The byte copy of the near-duplicate is written right after it, with its analysis.
+    assert names.index("d.pdf") == names.index("b.pdf") + 1
+    assert records["d.pdf"]["analysis"] == records["b.pdf"]["analysis"]
+    assert records["d.pdf"]["duplicate_of"] == records["a.pdf"]["path"]
+
+
+def test_doc_store_rescoring_skips_extraction_and_parsing(tmp_path, monkeypatch):
+    _fresh_cache(monkeypatch)
+    _write_resumes(tmp_path / "resumes", 3)
+    (tmp_path / "resumes" / "broken.pdf").write_bytes(b"not a pdf")
+    inputs = [str(tmp_path / "resumes")]
+    store = str(tmp_path / "docs.db")
+    first = tmp_path / "first.jsonl"
+    run_bulk(inputs, "Python engineer", str(first), workers=0, progress=False, doc_store=store)
+
+    extractions = []
+
+    def fail(*args, **kwargs):
+        extractions.append(args)
+        raise ValueError("stored resumes must not be extracted or parsed again")
+    monkeypatch.setattr(bulk_score, "extract_text_bounded", fail)
+    monkeypatch.setattr("doc_store.parse_many", lambda texts, **kwargs: [fail() for _ in texts])
+    second = tmp_path / "second.jsonl"
+    summary = run_bulk(inputs, "Python engineer", str(second), workers=0, progress=False, doc_store=store)
+    dedupe_summary = run_bulk(inputs, "Python engineer", str(tmp_path / "third.jsonl"), workers=0,
+                              progress=False, doc_store=store, dedupe=True)
+
+    # Only the PDF that failed to extract is tried again, once per run.
+    assert len(extractions) == 2
+    assert summary == {"scored": 3, "errors": 1, "skipped": 0} and dedupe_summary["scored"] == 3
+    records = {r["path"]: r for r in _read(first)}
+    rescored = [r for r in _read(second) if r["status"] == "ok"]
+    assert len(rescored) == 3 and all(record == records[record["path"]] for record in rescored)
+
+
+def test_doc_store_rescores_long_resumes_stored_without_a_doc(tmp_path, monkeypatch):
+    _fresh_cache(monkeypatch)
+    # Every resume counts as long, so it is stored without a Doc and analyzed in chunks.
+    monkeypatch.setattr("nlp_provider.STREAMING_MIN_CHARS", 10)
+    _write_resumes(tmp_path / "resumes", 2)
+    inputs = [str(tmp_path / "resumes")]
+    store = str(tmp_path / "docs.db")
+    first = tmp_path / "first.jsonl"
+    run_bulk(inputs, "Python engineer", str(first), workers=0, progress=False, doc_store=store)
+
+    def fail(*args, **kwargs):
+        raise ValueError("stored resumes must not be extracted again")
+    monkeypatch.setattr(bulk_score, "extract_text_bounded", fail)
+    second = tmp_path / "second.jsonl"
+    summary = run_bulk(inputs, "Python engineer", str(second), workers=0, progress=False, doc_store=store)
+
+    assert summary == {"scored": 2, "errors": 0, "skipped": 0}
+    records = {r["path"]: r for r in _read(first)}
+    assert all(record == records[record["path"]] for record in _read(second))
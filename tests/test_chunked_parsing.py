@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import bulk_score
+import nlp_provider
+from job_specific_scorer import JobSpecificScorer
+from matcher import analyze_resume, extract_keywords, keywords_from_doc, rank_resumes
+from parser import extract_sections, iter_text_chunks
+
+SECTION = (
+    "Experience\n"
+    "• Reduced checkout latency by 40% using Redis caching.\n"
+    "• The billing service was rewritten in Go. Migrations were automated.\n\n"
+    "Projects\n"
+    "Built a Kubernetes operator for PostgreSQL backups. It was adopted by three teams.\n\n"
+)
+RESUME = "Skills\nPython, Java, SQL\n\n" + SECTION * 40
+JOB_DESC = "Careers at Example\n\n" + "We hire Python engineers who were trained in distributed systems.\n\n" * 60
+
+
+def test_chunks_cover_the_text_and_end_at_paragraphs_and_headers():
+    chunks = list(iter_text_chunks(RESUME, 500))
+    assert "".join(chunks) == RESUME
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    assert all(chunk.startswith(("Experience", "Projects", "Skills")) for chunk in chunks)
+
+    # A paragraph longer than a chunk is cut at line and word ends.
+    long_line = "word " * 100 + "\n" + "word " * 100
+    chunks = list(iter_text_chunks(long_line, 120))
+    assert "".join(chunks) == long_line
+    assert all(len(chunk) <= 120 and chunk.endswith((" ", "\n")) for chunk in chunks)
+
+
+def test_streamed_results_match_a_full_parse(monkeypatch):
+    full_keywords = set(keywords_from_doc(nlp_provider.parse(JOB_DESC)))
+    full_passive = JobSpecificScorer()._check_passive_voice(RESUME, nlp_provider.parse(RESUME))
+    sections = extract_sections(RESUME)
+    full = analyze_resume(RESUME, JOB_DESC, sections, "software_engineering")
+
+    chunk_counts = []
+    parse_many = nlp_provider.parse_many
+
+    def counting_parse_many(texts, *args, **kwargs):
+        texts = list(texts)
+        chunk_counts.append(len(texts))
+        return parse_many(texts, *args, **kwargs)
+    monkeypatch.setattr(nlp_provider, "parse_many", counting_parse_many)
+    monkeypatch.setattr(nlp_provider, "STREAMING_MIN_CHARS", 1000)
+    monkeypatch.setattr(nlp_provider, "CHUNK_CHARS", 600)
+
+    assert set(extract_keywords(JOB_DESC)) == full_keywords
+    assert JobSpecificScorer()._check_passive_voice(RESUME) == full_passive
+    assert analyze_resume(RESUME, JOB_DESC, sections, "software_engineering") == full
+    assert chunk_counts and min(chunk_counts) > 1
+
+
+def test_each_long_text_is_streamed_once_for_all_checks(monkeypatch):
+    sections = extract_sections(RESUME)
+    full = analyze_resume(RESUME, JOB_DESC, sections, "software_engineering")
+
+    streamed = []
+    parse_many = nlp_provider.parse_many
+
+    def recording_parse_many(texts, *args, **kwargs):
+        texts = list(texts)
+        streamed.append("".join(texts))
+        return parse_many(texts, *args, **kwargs)
+    monkeypatch.setattr(nlp_provider, "parse_many", recording_parse_many)
+    monkeypatch.setattr(nlp_provider, "STREAMING_MIN_CHARS", 1000)
+    monkeypatch.setattr(nlp_provider, "CHUNK_CHARS", 600)
+
+    assert analyze_resume(RESUME, JOB_DESC, sections, "software_engineering") == full
+    assert sorted(streamed) == sorted([RESUME, JOB_DESC])
+
+    # A batch shares the job description's pass, and long resumes stay out of the nlp.pipe batch.
+    streamed.clear()
+    ranked = rank_resumes(JOB_DESC, [(RESUME, sections), (RESUME + "\n", sections)], "software_engineering")
+    assert ranked[0][1] == full
+    assert sorted(streamed) == sorted([JOB_DESC, RESUME, RESUME + "\n"])
+
+    bulk_score._init_worker(JOB_DESC, "general", {})
+    assert not bulk_score._worker_state["job_desc"].parsed
@@ -0,0 +1,102 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import columnar
+from matcher import analyze_resume
+from parser import extract_sections
+
+RESUMES = [
+    "Skills\nPython, Java, SQL\n\nExperience\n• Reduced latency by 40% using Redis\n• Built REST APIs",
+    "Education\nBSc Computer Science\n\nProjects\nA compiler written in Rust",
+    "Experience\nManaged a team of five engineers",
+]
+JOB_DESC = "Python developer with REST API and SQL experience"
+
+
+@pytest.fixture(scope="module")
+def analyses():
+    results = []
+    for index, resume in enumerate(RESUMES):
+        job_type = "software_engineering" if index % 2 == 0 else "general"
+        results.append(analyze_resume(resume, JOB_DESC, extract_sections(resume), job_type))
+    return results
+
+
+def is_file_view(array):
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def assert_round_trip(original, restored):
+    assert restored.keys() == original.keys()
+    for key, value in original.items():
+        if isinstance(value, float):
+            assert restored[key] == pytest.approx(value)
+        elif key.endswith("_scores"):
+            assert restored[key].keys() == value.keys()
+            for pattern, result in value.items():
+                assert restored[key][pattern] == dict(result, score=pytest.approx(result["score"], abs=1e-6))
+        else:
+            assert restored[key] == value
+
+
+def test_npz_round_trip_is_memory_mapped(tmp_path, analyses):
+    path = tmp_path / "results.npz"
+    ids = ["resumes/%d.pdf" % i for i in range(len(analyses))]
+    assert columnar.write_results(path, analyses, ids, fmt="npz") == "npz"
+
+    table = columnar.read_results(path)
+    assert len(table) == 3 and list(table.ids) == ids
+    for row, analysis in enumerate(analyses):
+        assert_round_trip(analysis, table.analysis(row))
+
+    total = table.scores["total_score"]
+    assert is_file_view(total) and not total.flags.writeable
+    assert total.ctypes.data % 64 == 0
+    assert np.allclose(total, [analysis["total_score"] for analysis in analyses])
+    # Criteria repeat no notes per row: each is stored once in the metadata.
+    assert len({criterion["column"] for criterion in table.criteria}) == len(table.criteria)
+    assert table.job_types == ["software_engineering", "general"]
+    assert table.job_type_codes.dtype == np.int32
+    keywords = table.lists["missing_keywords"]
+    assert keywords.counts().sum() == sum(len(analysis["missing_keywords"]) for analysis in analyses)
+
+
+def test_export_jsonl_and_format_errors(tmp_path, analyses):
+    jsonl = tmp_path / "results.jsonl"
+    with open(jsonl, "w") as f:
+        f.write(json.dumps({"path": "a.pdf", "status": "ok", "analysis": analyses[0]}) + "\n")
+        f.write(json.dumps({"path": "b.pdf", "status": "error", "error": "boom"}) + "\n")
+    output = tmp_path / "results.npz"
+    assert columnar.export_jsonl(jsonl, output, fmt="npz") == (1, "npz")
+    assert list(columnar.read_results(output).ids) == ["a.pdf"]
+
+    with pytest.raises(ValueError):
+        columnar.read_results(jsonl)
+    with pytest.raises(ValueError):
+        columnar.write_results(output, analyses, ["only one id"], fmt="npz")
+
+
+@pytest.mark.skipif(columnar.pa is None, reason="pyarrow is not installed")
+def test_arrow_round_trip(tmp_path, analyses):
+    path = tmp_path / "results.arrow"
+    ids = [str(i) for i in range(len(analyses))]
+    assert columnar.write_results(path, analyses, ids, fmt="arrow") == "arrow"
+    table = columnar.read_results(path)
+    assert list(table.ids) == ids
+    for row, analysis in enumerate(analyses):
+        assert_round_trip(analysis, table.analysis(row))
+
+
+def test_list_counts_count_rows_not_occurrences():
+    column = columnar.ListColumn(np.array([0, 3, 3, 5]), np.array([0, 0, 1, 1, 2], dtype=np.int32), ["a", "b", "c"])
+    assert column.row(0) == ["a", "a", "b"] and column.row(1) == []
+    assert column.counts().tolist() == [1, 2, 1]
+    assert columnar.ListColumn(np.array([0, 0]), np.array([], dtype=np.int32), []).counts().tolist() == []
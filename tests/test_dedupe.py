@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import pytest
+from dedupe import DuplicateIndex, fingerprint, group_duplicates, similarity
+from matcher import rank_resumes
+from parser import extract_sections
+
+JOB_DESC = "Software Engineer with Python, AWS, Docker and REST API experience."
+
+
+def _read(path):
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _edited(text, replacements):
+    for old, new in replacements:
+        assert old in text
+        text = text.replace(old, new, 1)
+    return text
+
+
+def test_similarity_separates_edits_from_different_resumes():
+    good = _read("data/good_resume.txt")
+    bad = _read("data/bad_resume.txt")
+    reformatted = fingerprint(good.replace("\n", "\n\n").upper())
+    edited = fingerprint(_edited(good, [("Python", "Go")]))
+
+    assert similarity(fingerprint(good), fingerprint(str(good))) == 1.0
+    assert similarity(fingerprint(good), reformatted) == 1.0
+    assert fingerprint(good).exact != reformatted.exact
+    assert similarity(fingerprint(good), edited) > 0.9
+    assert similarity(fingerprint(good), fingerprint(bad)) < 0.2
+
+
+def test_group_duplicates_is_transitive_and_ordered():
+    good = _read("data/good_resume.txt")
+    bad = _read("data/bad_resume.txt")
+    texts = [bad, good, _edited(good, [("Python", "Go")]), bad, _edited(good, [("Python", "Go"), ("AWS", "GCP")])]
+
+    groups = group_duplicates([fingerprint(text) for text in texts], threshold=0.85)
+
+    assert groups == [[0, 3], [1, 2, 4]]
+
+
+def test_index_assigns_duplicates_to_the_first_representative():
+    good = _read("data/good_resume.txt")
+    index = DuplicateIndex(threshold=0.85)
+
+    assert index.add("a", fingerprint(good)) is None
+    assert index.add("b", fingerprint(_read("data/bad_resume.txt"))) is None
+    assert index.add("c", fingerprint(good)) == ("a", 1.0)
+    representative, score = index.add("d", fingerprint(_edited(good, [("Python", "Go")])))
+    assert representative == "a" and 0.85 <= score < 1.0
+    assert len(index) == 2
+
+
+def test_rank_resumes_reuses_analysis_within_a_group():
+    good = _read("data/good_resume.txt")
+    bad = _read("data/bad_resume.txt")
+    resumes = [(text, extract_sections(text)) for text in (good, bad, good)]
+
+    ranked = dict(rank_resumes(JOB_DESC, resumes, dedupe_threshold=0.9))
+    expected = dict(rank_resumes(JOB_DESC, resumes))
+
+    assert ranked.keys() == {0, 1, 2}
+    assert ranked[2] == ranked[0] and ranked[2] is not ranked[0]
+    for index in ranked:
+        assert ranked[index]["total_score"] == pytest.approx(expected[index]["total_score"])
+
+
+@pytest.mark.parametrize("job_type", ["general", "software_engineering"])
+def test_rank_resumes_recomputes_sections_of_near_duplicates(job_type):
+    good = _read("data/good_resume.txt")
+    without_education = good[:good.index("\nEDUCATION")] + "\n"
+    resumes = [(text, extract_sections(text)) for text in (without_education, good)]
+
+    ranked = dict(rank_resumes(JOB_DESC, resumes, job_type=job_type, dedupe_threshold=0.9))
+    expected = dict(rank_resumes(JOB_DESC, resumes, job_type=job_type))
+
+    # The near-duplicate is credited for the section it adds; TF-IDF and spaCy results are shared.
+    assert "education" in ranked[0]["missing_sections"] and ranked[1]["missing_sections"] == []
+    assert ranked[1]["keyword_score"] == ranked[0]["keyword_score"]
+    assert ranked[1]["total_score"] > ranked[0]["total_score"]
+    assert ranked[1]["present_sections"] == expected[1]["present_sections"]
+    if job_type == "software_engineering":
+        assert ranked[1]["section_scores"] == expected[1]["section_scores"]
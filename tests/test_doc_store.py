@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import spacy
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import doc_store
+from analysis_context import AnalysisContext
+from doc_store import DocStore, content_key
+from matcher import analyze_resume
+from parser import PdfExtractionResult, extract_sections
+
+JOB_DESC = "Software Engineer with Python, AWS, Docker and REST API experience."
+
+
+def _extraction(path):
+    with open(path, "r") as f:
+        return PdfExtractionResult(f.read(), 1, False)
+
+
+def test_stored_docs_reproduce_the_analysis_of_a_fresh_parse(tmp_path):
+    good = _extraction("data/good_resume.txt")
+    bad = _extraction("data/bad_resume.txt")
+    keys = [content_key(e.text) for e in (good, bad)]
+    store = DocStore(tmp_path / "docs.db")
+    added = store.add_many(zip(keys, (good, bad), (None, {"skills": "Java"})))
+    assert added[0].sections == extract_sections(good.text) and added[1].sections == {"skills": "Java"}
+    store.close()
+
+    store = DocStore(tmp_path / "docs.db")
+    loaded = store.get_many(keys + ["unknown"])
+    assert set(loaded) == set(keys) and len(store) == 2 and keys[0] in store
+    document = loaded[keys[0]]
+    assert document[:4] == tuple(good) and document.doc.text == good.text
+
+    for job_type in ("general", "software_engineering"):
+        context = AnalysisContext(document.text, JOB_DESC, resume_doc=document.doc)
+        stored = analyze_resume(document.text, JOB_DESC, document.sections, job_type, context=context)
+        fresh = analyze_resume(good.text, JOB_DESC, extract_sections(good.text), job_type)
+        assert stored == fresh
+
+
+def test_docs_are_kept_per_model_and_long_texts_are_not_parsed(tmp_path, monkeypatch):
+    text = _extraction("data/good_resume.txt")
+    key = content_key(text.text, layout="default")
+    assert key != content_key(text.text, layout="fast")
+    DocStore(tmp_path / "docs.db").add_many([(key, text, None)])
+
+    other_model = DocStore(tmp_path / "docs.db", nlp=spacy.blank("en"))
+    document = other_model.get(key)
+    assert document.text == text.text and document.doc is None
+    other_model.add_many([(key, document, document.sections)])
+    assert other_model.get(key).doc is not None
+    assert DocStore(tmp_path / "docs.db").get(key).doc.has_annotation("POS")
+
+    monkeypatch.setattr(doc_store, "is_long", lambda text: True)
+    long_key = content_key("long")
+    store = DocStore(tmp_path / "docs.db")
+    assert store.add_many([(long_key, text, None)])[0].doc is None
+    assert store.get(long_key).doc is None and store.stats["parsed"] == 0
@@ -1,3 +1,4 @@
+import subprocess
 import sys
 from pathlib import Path
 
@@ -7,6 +8,7 @@ import spacy
 from parser import extract_sections
 from matcher import analyze_resume
 from job_specific_scorer import JobSpecificScorer
+import nlp_provider
 
 
 def test_module_imports_and_spacy_model_loads():
@@ -24,3 +26,23 @@ def test_extract_sections_basic():
     sections = extract_sections(text)
     assert "experience" in sections
     assert "Software Engineer" in sections["experience"]
+
+
+def test_importing_analysis_modules_does_not_load_spacy():
+    """Importing the analysis modules must not import spaCy or load the model."""
+    code = (
+        "import sys, matcher, job_specific_scorer, nlp_provider; "
+        "assert nlp_provider._nlp is None; "
+        "assert 'spacy' not in sys.modules"
+    )
+    root = Path(__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_shared_pipeline_is_loaded_once_without_ner():
+    """All stages share one lazily loaded pipeline with unused components excluded."""
+    nlp = nlp_provider.get_nlp()
+    assert nlp_provider.get_nlp() is nlp
+    assert "ner" not in nlp.pipe_names
+    doc = nlp_provider.parse("Developed REST APIs in Python.", disable=("parser",))
+    assert [token.lemma_ for token in doc][0].lower() == "develop"
@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import job_index
+import nlp_provider
+from job_index import JobIndex
+from matcher import extract_keywords
+
+POSTINGS = {
+    "backend": ("Backend engineer building Python services on AWS with PostgreSQL.",
+                ["python", "aws", "postgresql", "service"]),
+    "frontend": ("Frontend developer writing React and TypeScript user interfaces.",
+                 ["react", "typescript", "interface"]),
+    "data": ("Data engineer maintaining Python pipelines with Spark and Airflow.",
+             ["python", "spark", "airflow", "pipeline"]),
+}
+RESUME = "Built Python services and Spark pipelines deployed on AWS."
+RESUME_KEYWORDS = ["python", "spark", "aws", "service", "pipeline"]
+
+
+def build_index(names=POSTINGS):
+    index = JobIndex()
+    for name in names:
+        text, keywords = POSTINGS[name]
+        index.add(name, text, keywords=keywords, metadata={"title": name})
+    return index
+
+
+def test_semantic_score_matches_tfidf_fitted_on_postings():
+    index = build_index()
+    matches = {m.posting_id: m for m in index.query(RESUME, k=3, resume_keywords=RESUME_KEYWORDS)}
+
+    vectorizer = TfidfVectorizer(stop_words="english")
+    postings = vectorizer.fit_transform([text for text, _ in POSTINGS.values()])
+    expected = cosine_similarity(vectorizer.transform([RESUME]), postings)[0]
+    for name, similarity in zip(POSTINGS, expected):
+        assert matches[name].semantic_score == pytest.approx(similarity)
+
+    assert matches["backend"].skill_score == pytest.approx(3 / 4)
+    assert matches["frontend"].skill_score == 0.0
+    assert matches["backend"].metadata == {"title": "backend"}
+
+
+def test_query_returns_top_k_best_first():
+    matches = build_index().query(RESUME, k=2, resume_keywords=RESUME_KEYWORDS)
+    assert [m.posting_id for m in matches] == ["backend", "data"]
+    assert matches[0].score >= matches[1].score
+    assert build_index([]).query(RESUME, resume_keywords=RESUME_KEYWORDS) == []
+
+
+def test_incremental_updates_match_a_fresh_index():
+    index = build_index()
+    index.remove("frontend")
+    fresh = build_index(["backend", "data"])
+    assert index.query(RESUME, resume_keywords=RESUME_KEYWORDS) == \
+        fresh.query(RESUME, resume_keywords=RESUME_KEYWORDS)
+
+    index.add("frontend", *POSTINGS["frontend"], metadata={"title": "frontend"})
+    assert len(index) == 3 and "frontend" in index
+    with pytest.raises(KeyError):
+        index.remove("missing")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = build_index()
+    path = tmp_path / "jobs.json"
+    index.save(path)
+    loaded = JobIndex.load(path)
+    assert loaded.query(RESUME, resume_keywords=RESUME_KEYWORDS) == \
+        index.query(RESUME, resume_keywords=RESUME_KEYWORDS)
+    assert loaded.missing_keywords("data", RESUME_KEYWORDS) == ["airflow"]
+
+
+def test_long_texts_are_streamed_instead_of_batched(monkeypatch):
+    monkeypatch.setattr(nlp_provider, "STREAMING_MIN_CHARS", 100)
+    monkeypatch.setattr(nlp_provider, "CHUNK_CHARS", 80)
+    long_text = "\n\n".join(text for text, _ in POSTINGS.values())
+    short_text = "Python developer"
+    batched = []
+    parse_many = job_index.parse_many
+    monkeypatch.setattr(job_index, "parse_many", lambda texts, **kwargs: parse_many(batched.extend(texts) or texts))
+
+    index = JobIndex()
+    index.add_many([("long", long_text), ("short", short_text)])
+    index.add("long again", long_text)
+
+    assert batched == [short_text]
+    assert index.missing_keywords("long", []) == index.missing_keywords("long again", []) == \
+        sorted(set(extract_keywords(long_text)))
+    assert {"python", "react", "airflow"} <= set(index.missing_keywords("long", []))
+    best = index.query(long_text, k=1)[0]
+    assert best.posting_id in ("long", "long again") and best.skill_score == 1.0
+
+
+def test_add_many_reads_postings_one_batch_at_a_time(monkeypatch):
+    read = []
+
+    def postings():
+        for name, (text, _) in POSTINGS.items():
+            read.append(name)
+            yield name, text, {"title": name}
+
+    batches = []
+    parse_many = job_index.parse_many
+
+    def parse_batch(texts, **kwargs):
+        batches.append((len(read), len(texts)))
+        return parse_many(texts, **kwargs)
+    monkeypatch.setattr(job_index, "parse_many", parse_batch)
+
+    index = JobIndex()
+    index.add_many(postings(), batch_size=2)
+    assert batches == [(2, 2), (3, 1)]
+    assert len(index) == 3 and index.query(RESUME, k=1)[0].metadata == {"title": "backend"}
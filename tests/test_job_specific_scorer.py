@@ -0,0 +1,145 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import analysis_context
+import job_specific_scorer
+from job_specific_scorer import CRITERIA_PATH, JobSpecificScorer, load_criteria_plan
+from nlp_patterns import action_verb_counts
+from nlp_provider import get_nlp, parse
+from resume_features import extract_resume_features
+
+CRITERIA = [
+    {"Category": "Section", "Type": "Structure", "Keyword/Pattern": "Skills", "Weight": 0.5, "Notes": "n1"},
+    {"Category": "Keywords", "Type": "Skill Match", "Keyword/Pattern": "Python, Java", "Weight": 0.5, "Notes": "n2"},
+]
+
+
+def _write_criteria(path, criteria):
+    path.write_text(json.dumps(criteria))
+    return path
+
+
+def test_plan_is_package_relative_and_shared(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first = JobSpecificScorer()
+    second = JobSpecificScorer()
+    assert first.plan is second.plan
+    assert first.plan is load_criteria_plan(CRITERIA_PATH)
+    assert len(first.criteria) == len(json.loads(CRITERIA_PATH.read_text()))
+
+
+def test_plan_recompiles_only_when_content_changes(tmp_path):
+    path = _write_criteria(tmp_path / "criteria.json", CRITERIA)
+    plan = load_criteria_plan(path)
+
+    # Touching the file without changing it keeps the compiled plan.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_criteria_plan(path) is plan
+
+    _write_criteria(path, CRITERIA[:1])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    updated = load_criteria_plan(path)
+    assert updated is not plan
+    assert [c.pattern for c in updated.criteria] == ["Skills"]
+    assert updated.digest != plan.digest
+
+
+def test_invalid_criteria_are_skipped(tmp_path):
+    bad = [
+        {"Category": "Section", "Type": "Structure", "Keyword/Pattern": "Skills", "Weight": "heavy", "Notes": ""},
+        {"Category": "Section", "Keyword/Pattern": "Education", "Weight": 0.1, "Notes": ""},
+    ]
+    path = _write_criteria(tmp_path / "criteria.json", CRITERIA + bad)
+    plan = load_criteria_plan(path)
+    assert [c.pattern for c in plan.criteria] == ["Skills", "Python, Java"]
+    assert plan.total_weight == 1.0
+
+
+def test_missing_or_malformed_file_yields_empty_scores(tmp_path):
+    assert JobSpecificScorer(tmp_path / "missing.json").criteria == ()
+
+    path = tmp_path / "criteria.json"
+    path.write_text("{not json")
+    scorer = JobSpecificScorer(path)
+    assert scorer.score_software_engineering_resume("text", {})["total_score"] == 0.0
+
+
+def test_compiled_plan_scores_without_nlp(tmp_path):
+    scorer = JobSpecificScorer(_write_criteria(tmp_path / "criteria.json", CRITERIA))
+    results = scorer.score_software_engineering_resume("I write Python daily.", {"skills": "Python"})
+
+    assert results["section_scores"]["Skills"]["score"] == 1.0
+    assert results["keywords_scores"]["Python, Java"] == {"score": 0.5, "weight": 0.5, "notes": "n2"}
+    assert results["total_score"] == 0.75
+    assert results["detailed_feedback"] == []
+    assert job_specific_scorer.SUGGESTIONS["Keywords"]["Python, Java, C++, Go"]
+
+
+def test_nlp_criteria_can_be_left_for_later(tmp_path, monkeypatch):
+    passive = {"Category": "Readability", "Type": "Style", "Keyword/Pattern": "Passive voice detection",
+               "Weight": 1.0, "Notes": "n3"}
+    scorer = JobSpecificScorer(_write_criteria(tmp_path / "criteria.json", CRITERIA + [passive]))
+    assert [c.uses_nlp for c in scorer.criteria] == [False, False, True]
+    monkeypatch.setattr(analysis_context, "parse", lambda *args, **kwargs: 1 / 0)
+
+    results = scorer.score_software_engineering_resume("I write Python daily.", {"skills": "Python"},
+                                                       include_nlp=False)
+
+    assert results["readability_scores"]["Passive voice detection"] == {"score": None, "weight": 1.0, "notes": "n3"}
+    assert results["total_score"] == 0.75
+    assert results["detailed_feedback"] == []
+
+
+def test_resume_features_are_extracted_once_for_all_bullet_checks():
+    text = (
+        "EXPERIENCE\n"
+        "- Developed an API serving 10k requests. Cut latency by 40%\n"
+        "  • led the team\n"
+        "- Helped with things\n"
+        "▪ Skills\n"
+    )
+    features = extract_resume_features(text)
+
+    assert features.bullets == ("Developed an API serving 10k requests. Cut latency by 40%", "led the team", "Helped with things")
+    assert features.bullet_has_metric == (True, False, False)
+    assert features.has_graphics
+
+    scorer = JobSpecificScorer()
+    assert scorer._check_action_verbs([action_verb_counts(parse(text))]) == 2 / 3
+    assert scorer._check_quantified_metrics(features) == 1 / 3
+    assert scorer._check_bullet_count(features) == 1.0
+    assert scorer._check_graphics(features) == 0.3
+
+
+def test_nlp_checks_match_lemmas_and_respect_sentence_bounds():
+    scorer = JobSpecificScorer()
+    bullets = "• Develop APIs\n- Leading migrations\n•Built tooling\n- Helped users\n"
+    assert scorer._check_action_verbs([action_verb_counts(parse(bullets))]) == 3 / 4
+
+    assert scorer._check_passive_voice("", parse("The API was deployed. It is\nAutomated daily.")) == 1 - 1 / 3
+    assert scorer._check_passive_voice("", parse("")) == 1.0
+
+    # Lemmas that are also nouns or titles only count when tagged as a verb.
+    doc = get_nlp().make_doc("- Lead Engineer at Acme\n- Engineer II\n- Design patterns\n- Design APIs\n- Led a team\n")
+    tags = {"Lead": ("PROPN", "NNP"), "Engineer": ("NOUN", "NN"), "Led": ("VERB", "VBD")}
+    for token in doc:
+        token.lemma_ = token.lower_
+        token.pos_, token.tag_ = tags.get(token.text, ("NOUN", "NN"))
+    design_noun, design_verb = [token for token in doc if token.text == "Design"]
+    design_verb.pos_, design_verb.tag_ = "VERB", "VB"
+    assert action_verb_counts(doc) == (5, 2)
+    design_noun.pos_, design_noun.tag_ = "AUX", "VB"
+    assert action_verb_counts(doc) == (5, 3)
+
+    # "be" ending one sentence and a participle starting the next is not passive.
+    doc = parse("It was deployed daily", disable=("parser",))
+    assert scorer._check_passive_voice("", doc) == 0.0
+    doc = parse("It was deployed daily", disable=("parser",))
+    doc[2].is_sent_start = True
+    assert scorer._check_passive_voice("", doc) == 1.0
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from keyword_matcher import KeywordMatcher
+
+
+def test_matches_whole_words_only():
+    matcher = KeywordMatcher([["Python", "Java", "C++", "Go"], ["SQL", "PostgreSQL"]])
+    hits = matcher.scan("Good with JavaScript, C++ and PostgreSQL; went to Django meetups.")
+    assert hits == [{"c++"}, {"postgresql"}]
+
+
+def test_groups_share_keywords_and_ignore_blanks():
+    matcher = KeywordMatcher([["REST", "gRPC", ""], ["rest", "Node.js"]])
+    assert matcher.group_size(0) == 2
+    hits = matcher.scan("Built REST services on node.js.")
+    assert hits == [{"rest"}, {"rest", "node.js"}]
+
+
+def test_overlapping_keywords_are_all_reported():
+    matcher = KeywordMatcher([["machine learning", "learning", "earn"]])
+    assert matcher.find("Applied machine learning at scale") == {"machine learning", "learning"}
+
+
+def test_large_keyword_sets():
+    taxonomy = ["skill%d" % i for i in range(5000)] + ["kubernetes"]
+    matcher = KeywordMatcher([taxonomy])
+    assert matcher.find("Ran Kubernetes and skill42, not skill4200x.") == {"kubernetes", "skill42"}
+
+
+def test_keywords_inside_slash_and_plus_joined_tokens():
+    matcher = KeywordMatcher([["Python", "C++", "Go"], ["Django", "React", "Node.js"], ["AWS", "GCP"]])
+    hits = matcher.scan("Stack: Python/Django, C++/Python, node.js/React, Python+Django and AWS/GCP on Google Cloud.")
+    assert hits == [{"python", "c++"}, {"django", "react", "node.js"}, {"aws", "gcp"}]
+    assert matcher.find("Python/Django") == {"python", "django"}
+    # Only joined parts are split: "c++" is one word, and "go" still does not match inside "google".
+    assert matcher.find("C++ in Google/Golang") == {"c++"}
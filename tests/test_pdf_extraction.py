@@ -0,0 +1,88 @@
+import io
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from parser import (
+    extract_text_bounded,
+    extract_text_from_pdf,
+    extract_text_isolated,
+    iter_pdf_pages,
+)
+
+
+def make_pdf(page_texts):
+    """Builds a minimal PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for text in page_texts:
+        stream = "BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text
+        objects.append("<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            "/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join("%d 0 R" % i for i in page_ids), len(page_ids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(("%d 0 obj\n%s\nendobj\n" % (number, body)).encode("latin-1"))
+    xref = out.tell()
+    out.write(("xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)).encode("latin-1"))
+    for offset in offsets:
+        out.write(("%010d 00000 n \n" % offset).encode("latin-1"))
+    out.write(("trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)).encode("latin-1"))
+    return out.getvalue()
+
+
+PDF = make_pdf(["Page one text", "Page two text", "Page three text"])
+
+
+def test_page_stream_matches_full_extraction():
+    pages = list(iter_pdf_pages(io.BytesIO(PDF)))
+    assert len(pages) == 3
+    assert "".join(pages) == extract_text_from_pdf(io.BytesIO(PDF))
+    assert "Page two text" in pages[1]
+
+
+def test_bounded_extraction_stops_at_limits():
+    full = extract_text_bounded(io.BytesIO(PDF))
+    assert (full.pages, full.truncated, full.diagnostic) == (3, False, None)
+
+    exact = extract_text_bounded(io.BytesIO(PDF), max_pages=3)
+    assert not exact.truncated
+
+    by_pages = extract_text_bounded(io.BytesIO(PDF), max_pages=2)
+    assert by_pages.pages == 2 and by_pages.truncated
+    assert "Page two text" in by_pages.text and "three" not in by_pages.text
+
+    by_chars = extract_text_bounded(io.BytesIO(PDF), max_chars=5)
+    assert by_chars.text == "Page " and by_chars.pages == 1 and by_chars.truncated
+    assert by_chars.diagnostic
+
+
+def test_fast_layout_profile_extracts_same_words():
+    fast = extract_text_bounded(io.BytesIO(PDF), layout="fast")
+    assert fast.text.split() == extract_text_from_pdf(io.BytesIO(PDF)).split()
+
+
+def test_isolated_extraction_returns_text_and_diagnostics():
+    result = extract_text_isolated(PDF, timeout=60, max_pages=2)
+    assert result.pages == 2 and result.truncated
+    assert "Page two text" in result.text
+
+    broken = extract_text_isolated(b"%PDF-1.4 not really a pdf", timeout=60)
+    assert broken.text == "" and broken.truncated
+    assert broken.diagnostic
+
+
+def test_isolated_extraction_times_out_with_partial_text():
+    result = extract_text_isolated(make_pdf(["Only page"]), timeout=0.0)
+    assert result.truncated
+    assert result.diagnostic.startswith("timed out")
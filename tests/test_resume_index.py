@@ -0,0 +1,114 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from resume_index import ResumeIndex
+
+VOCABULARY = ["term%d" % i for i in range(300)]
+
+
+def random_pool(count, seed=0):
+    rng = random.Random(seed)
+    # Zipf-like term frequencies, so some postings lists are long and most are short.
+    weights = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+    return {"resume_%d" % i: sorted(set(rng.choices(VOCABULARY, weights, k=rng.randint(5, 40))))
+            for i in range(count)}
+
+
+def brute_force(pool, query, k):
+    vectorizer = TfidfVectorizer(analyzer=lambda keywords: keywords, binary=True)
+    ids = list(pool)
+    matrix = vectorizer.fit_transform([pool[resume_id] for resume_id in ids])
+    scores = (matrix @ vectorizer.transform([query]).T).toarray().ravel()
+    return {resume_id: score for resume_id, score in zip(ids, scores) if score > 0}, \
+        sorted(scores[scores > 0], reverse=True)[:k]
+
+
+def is_file_view(array):
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def build_index(pool):
+    index = ResumeIndex()
+    for resume_id, keywords in pool.items():
+        index.add(resume_id, None, keywords=keywords)
+    return index
+
+
+@pytest.mark.parametrize("k", [1, 10, 50])
+def test_search_returns_exact_top_k_cosine_scores(k):
+    pool = random_pool(2000)
+    index = build_index(pool)
+    for seed in range(5):
+        query = random.Random(seed).sample(VOCABULARY, 12)
+        expected_scores, expected_top = brute_force(pool, query, k)
+
+        matches = index.search(keywords=query, k=k)
+
+        assert [m.score for m in matches] == pytest.approx(expected_top, rel=1e-5)
+        for match in matches:
+            assert match.score == pytest.approx(expected_scores[match.resume_id], rel=1e-5)
+
+
+def test_save_load_maps_the_file_and_applies_later_updates(tmp_path):
+    pool = random_pool(300, seed=1)
+    path = str(tmp_path / "pool.npz")
+    build_index(pool).save(path)
+
+    index = ResumeIndex.load(path)
+    assert len(index) == 300
+    assert is_file_view(index._arrays["postings"])
+
+    query = ["term0", "term3", "term42", "term7"]
+    index.remove("resume_0")
+    index.add("resume_1", None, keywords=["term42", "term7"])
+    index.add("new", None, keywords=["term3", "term42"])
+    del pool["resume_0"]
+    pool["resume_1"] = ["term42", "term7"]
+    pool["new"] = ["term3", "term42"]
+    assert len(index) == len(pool) and "resume_0" not in index and "new" in index
+
+    expected_scores, expected_top = brute_force(pool, query, 20)
+    matches = index.search(keywords=query, k=20)
+    assert [m.score for m in matches] == pytest.approx(expected_top, rel=1e-5)
+    assert all(m.score == pytest.approx(expected_scores[m.resume_id], rel=1e-5) for m in matches)
+
+    index.save(path)
+    reloaded = ResumeIndex.load(path)
+    assert reloaded.search(keywords=query, k=20) == matches
+
+
+def test_search_ignores_unknown_terms_and_empty_index():
+    assert ResumeIndex().search(keywords=["python"]) == []
+    index = build_index({"a": ["python", "aws"], "b": ["java"]})
+    assert index.search(keywords=["rust"]) == []
+    assert [m.resume_id for m in index.search(keywords=["python", "rust"])] == ["a"]
+
+
+def test_rank_analyzes_only_the_shortlist():
+    texts = {}
+    for path in ("data/good_resume.txt", "data/bad_resume.txt"):
+        with open(path, "r") as f:
+            texts[path] = f.read()
+    index = ResumeIndex()
+    index.add_many(texts.items())
+    loaded = []
+
+    def load_text(resume_id):
+        loaded.append(resume_id)
+        return texts[resume_id]
+
+    job_desc = "Software engineer with Python, Docker and AWS experience building REST APIs."
+    ranked = index.rank(job_desc, load_text, k=1, shortlist=1)
+
+    assert len(ranked) == 1 and len(loaded) == 1
+    assert ranked[0][0] == index.search(job_desc, k=1)[0].resume_id
+    assert "total_score" in ranked[0][1]
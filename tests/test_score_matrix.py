@@ -0,0 +1,95 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from job_specific_scorer import JobSpecificScorer, load_criteria_plan
+from score_matrix import ScoreMatrix
+
+CRITERIA = [
+    {"Category": "Section", "Type": "Structure", "Keyword/Pattern": "Skills", "Weight": 0.2, "Notes": "s"},
+    {"Category": "Keywords", "Type": "Skill Match", "Keyword/Pattern": "Python, Java", "Weight": 0.3, "Notes": "k"},
+    {"Category": "Bullet Quality", "Type": "Impact", "Keyword/Pattern": "Contains a number/quantified metric",
+     "Weight": 0.3, "Notes": "b"},
+    {"Category": "ATS Friendly", "Type": "Parsing", "Keyword/Pattern": "No graphics", "Weight": 0.2, "Notes": "a"},
+]
+
+RESUMES = [
+    ("Skills\nPython, Java\n- Reduced latency by 40%\n- Built APIs", {"skills": "Python, Java"}),
+    ("Experience\n- Managed a team\nSee [chart]", {"experience": "- Managed a team"}),
+    ("Skills\nJava\n- Cut costs by $2M", {"skills": "Java"}),
+]
+
+
+def _plan(tmp_path, criteria, name="criteria.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(criteria))
+    return path
+
+
+def test_matrix_matches_per_resume_scoring(tmp_path):
+    scorer = JobSpecificScorer(_plan(tmp_path, CRITERIA))
+    matrix = ScoreMatrix.score(RESUMES, scorer)
+    assert matrix.scores.shape == (3, 4)
+
+    for row, (text, sections) in enumerate(RESUMES):
+        expected = scorer.score_software_engineering_resume(text, sections)
+        results = matrix.to_results(row)
+        assert results['total_score'] == pytest.approx(expected['total_score'])
+        assert results['detailed_feedback'] == expected['detailed_feedback']
+        assert results['section_scores'] == expected['section_scores']
+
+    assert list(matrix.ranking()) == list(np.argsort(-matrix.totals(), kind="stable"))
+    assert matrix.ranking()[0] == 0
+
+
+def test_category_subtotals_and_feedback_masks(tmp_path):
+    matrix = ScoreMatrix.score(RESUMES, JobSpecificScorer(_plan(tmp_path, CRITERIA)))
+    subtotals = matrix.category_subtotals()
+    np.testing.assert_allclose(subtotals['section_scores'], [1.0, 0.0, 1.0])
+    np.testing.assert_allclose(subtotals['keywords_scores'], [1.0, 0.0, 0.5])
+    np.testing.assert_allclose(matrix.failing()[1], [True, True, True, True])
+    assert not matrix.failing()[0].any()
+
+
+def test_reweighting_reuses_scores(tmp_path):
+    scorer = JobSpecificScorer(_plan(tmp_path, CRITERIA))
+    matrix = ScoreMatrix.score(RESUMES, scorer)
+
+    # Recruiters drop the ATS criterion and make keywords dominate, in a new order.
+    reweighted_criteria = [dict(CRITERIA[1], Weight=0.8), dict(CRITERIA[0], Weight=0.2)]
+    new_plan = load_criteria_plan(_plan(tmp_path, reweighted_criteria, "reweighted.json"))
+    reweighted = matrix.reweighted(new_plan)
+
+    expected = ScoreMatrix.score(RESUMES, JobSpecificScorer(_plan(tmp_path, reweighted_criteria, "fresh.json")))
+    np.testing.assert_allclose(reweighted.totals(), expected.totals())
+    np.testing.assert_allclose(reweighted.totals(), [1.0, 0.0, 0.6])
+
+    unknown = load_criteria_plan(_plan(tmp_path, CRITERIA + [
+        {"Category": "Section", "Type": "Structure", "Keyword/Pattern": "Projects", "Weight": 0.1, "Notes": ""}
+    ], "unknown.json"))
+    with pytest.raises(ValueError):
+        matrix.reweighted(unknown)
+
+
+def test_empty_plan_and_skipped_criteria(tmp_path):
+    scorer = JobSpecificScorer(tmp_path / "missing.json")
+    matrix = ScoreMatrix.score(RESUMES, scorer)
+    assert matrix.scores.shape == (3, 0)
+    np.testing.assert_allclose(matrix.totals(), [0.0, 0.0, 0.0])
+    assert ScoreMatrix(scorer.plan, []).to_results(0) == scorer.score_software_engineering_resume("text", {}) == {
+        'section_scores': {}, 'keyword_scores': {}, 'formatting_scores': {}, 'bullet_quality_scores': {},
+        'readability_scores': {}, 'ats_friendly_scores': {}, 'total_score': 0.0, 'detailed_feedback': []}
+
+    # NaN marks a criterion that was not evaluated: it has no score, weight or feedback.
+    matrix = ScoreMatrix.score(RESUMES, JobSpecificScorer(_plan(tmp_path, CRITERIA)))
+    matrix.scores[1, 0] = np.nan
+    results = matrix.to_results(1)
+    assert results['section_scores']['Skills']['score'] is None
+    assert [entry['issue'] for entry in results['detailed_feedback']] == [c['Keyword/Pattern'] for c in CRITERIA[1:]]
+    np.testing.assert_allclose(matrix.totals()[1], 0.3 * 0.2 / 0.8)
+    np.testing.assert_allclose(matrix.category_subtotals()['keywords_scores'], [1.0, 0.0, 0.5])
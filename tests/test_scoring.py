@@ -4,8 +4,10 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 import pytest
+import analysis_context
+import job_specific_scorer
 from parser import extract_sections
-from matcher import analyze_resume
+from matcher import analyze_resume, calculate_tfidf_similarity, calculate_tfidf_similarity_batch, rank_resumes
 
 JOB_DESC = """
 We are looking for a Software Engineer to join our team.
@@ -39,7 +41,7 @@ def _analyze_resume(path: str):
 
 def test_good_resume_scoring_and_sections():
     analysis = _analyze_resume("data/good_resume.txt")
-    assert analysis["total_score"] == pytest.approx(0.7738809523809524, rel=1e-3)
+    assert analysis["total_score"] == pytest.approx(0.7363809523809525, rel=1e-3)
     assert analysis["present_sections"] == ["experience", "education", "skills", "projects"]
     assert analysis["missing_sections"] == []
 
@@ -49,3 +51,51 @@ def test_bad_resume_scoring_and_sections():
     assert analysis["total_score"] == pytest.approx(0.4773333333333332, rel=1e-3)
     assert analysis["present_sections"] == ["experience", "education", "skills", "projects"]
     assert analysis["missing_sections"] == []
+
+
+def test_batch_tfidf_matches_pairwise_similarity():
+    resumes = [open(p).read() for p in ("data/good_resume.txt", "data/bad_resume.txt")] + ["", "the and of"]
+    batch = calculate_tfidf_similarity_batch(resumes, JOB_DESC)
+    for resume, similarity in zip(resumes, batch):
+        assert similarity == pytest.approx(calculate_tfidf_similarity(resume, JOB_DESC), abs=1e-12)
+
+
+@pytest.mark.parametrize("job_type", ["general", "software_engineering"])
+def test_rank_resumes_matches_analyze_resume(job_type):
+    resumes = []
+    for path in ("data/bad_resume.txt", "data/good_resume.txt"):
+        with open(path, "r") as f:
+            resume = f.read()
+        resumes.append((resume, extract_sections(resume)))
+
+    ranked = rank_resumes(JOB_DESC, resumes, job_type)
+
+    assert [index for index, _ in ranked] == [1, 0]
+    for index, analysis in ranked:
+        resume, sections = resumes[index]
+        expected = analyze_resume(resume, JOB_DESC, sections, job_type)
+        assert analysis.keys() == expected.keys()
+        assert analysis["total_score"] == pytest.approx(expected["total_score"])
+        assert analysis["keyword_score"] == pytest.approx(expected["keyword_score"])
+        assert analysis["missing_keywords"] == expected["missing_keywords"]
+
+
+def test_analyze_resume_parses_each_document_once(monkeypatch):
+    parsed = []
+
+    def counting_parse(text, disable=()):
+        parsed.append(text)
+        return analysis_context_parse(text, disable)
+
+    def unexpected_parse(text, disable=()):
+        raise AssertionError("resume was parsed a second time")
+
+    analysis_context_parse = analysis_context.parse
+    monkeypatch.setattr(analysis_context, "parse", counting_parse)
+    monkeypatch.setattr(job_specific_scorer, "parse", unexpected_parse)
+
+    with open("data/good_resume.txt", "r") as f:
+        resume = f.read()
+    analyze_resume(resume, JOB_DESC, extract_sections(resume), "software_engineering")
+
+    assert sorted(parsed) == sorted([resume, JOB_DESC])
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import analysis_cache
+import service
+from analysis_cache import AnalysisCache
+from service import ScoringService
+from test_pdf_extraction import make_pdf
+
+
+async def request(port, method, path, body=b"", content_type="application/json"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if isinstance(body, dict):
+        body = json.dumps(body).encode("utf-8")
+    writer.write(("%s %s HTTP/1.1\r\nHost: test\r\nContent-Type: %s\r\nContent-Length: %d\r\n"
+                  "Connection: close\r\n\r\n" % (method, path, content_type, len(body))).encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    payload = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    if headers["content-type"] == "application/json":
+        payload = json.loads(payload)
+    return status, headers, payload
+
+
+def run_service(test, monkeypatch, batches, release=None, **options):
+    """
+    Runs ``test(port)`` against an in-process service whose analysis records its batches.
+
+    With ``batches`` None, the service's own batch analysis runs instead.
+    """
+    monkeypatch.setattr(service, "_warm_worker", lambda: None)
+
+    def analyze_batch(requests):
+        batches.append(len(requests))
+        if release is not None:
+            release.wait(5)
+        return [("ok", {"total_score": 0.5, "resume": r["resume_text"], "sections": r["resume_sections"]})
+                for r in requests]
+    if batches is not None:
+        monkeypatch.setattr(service, "_analyze_batch", analyze_batch)
+
+    async def main():
+        svc = ScoringService(workers=0, **options)
+        port = await svc.start(port=0)
+        try:
+            return await test(port)
+        finally:
+            await svc.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_are_micro_batched(monkeypatch):
+    batches = []
+
+    async def test(port):
+        return await asyncio.gather(*(
+            request(port, "POST", "/analyze", {"resume_text": "resume %d" % i, "job_desc_text": "job"})
+            for i in range(6)))
+
+    responses = run_service(test, monkeypatch, batches, max_batch_size=4, max_wait_ms=200)
+    assert [status for status, _, _ in responses] == [200] * 6
+    assert sorted(payload["resume"] for _, _, payload in responses) == ["resume %d" % i for i in range(6)]
+    assert sum(batches) == 6 and max(batches) == 4 and len(batches) == 2
+
+
+def test_full_queue_returns_429(monkeypatch):
+    batches = []
+    release = threading.Event()
+
+    async def test(port):
+        body = {"resume_text": "r", "job_desc_text": "j"}
+        # One batch occupies the only worker and one request waits in the queue.
+        first = asyncio.ensure_future(request(port, "POST", "/analyze", body))
+        await asyncio.sleep(0.1)
+        queued = asyncio.ensure_future(request(port, "POST", "/analyze", body))
+        await asyncio.sleep(0.1)
+        rejected = await request(port, "POST", "/analyze", body)
+        release.set()
+        return rejected, await first, await queued
+
+    rejected, first, queued = run_service(test, monkeypatch, batches, release, queue_size=1, max_wait_ms=1)
+    assert rejected[0] == 429 and rejected[1]["retry-after"] == "1"
+    assert first[0] == 200 and queued[0] == 200
+
+
+def test_validation_extract_health_and_metrics(monkeypatch):
+    async def test(port):
+        return {
+            "bad_json": await request(port, "POST", "/analyze", b"{not json"),
+            "bad_type": await request(port, "POST", "/analyze",
+                                      {"resume_text": "r", "job_desc_text": "j", "job_type": "chef"}),
+            "sections": await request(port, "POST", "/analyze",
+                                      {"resume_text": "r", "job_desc_text": "j", "resume_sections": {"skills": "Go"}}),
+            "extract": await request(port, "POST", "/extract", make_pdf(["Skills", "Python"]), "application/pdf"),
+            "missing": await request(port, "GET", "/nope"),
+            "health": await request(port, "GET", "/healthz"),
+            "metrics": await request(port, "GET", "/metrics"),
+        }
+
+    responses = run_service(test, monkeypatch, [])
+    assert responses["bad_json"][0] == 400
+    assert responses["bad_type"][0] == 400
+    assert responses["sections"][2]["sections"] == {"skills": "Go"}
+    status, _, extracted = responses["extract"]
+    assert status == 200 and extracted["pages"] == 2 and "Python" in extracted["text"]
+    assert responses["missing"][0] == 404
+    assert responses["health"][2]["status"] == "ok"
+    metrics = responses["metrics"][2].decode("utf-8")
+    assert 'resume_reviewer_http_requests_total{path="/analyze",status="400"} 2' in metrics
+    assert "resume_reviewer_batch_size_count 1" in metrics
+
+
+def test_repeated_requests_are_served_from_the_analysis_cache(monkeypatch):
+    cache = AnalysisCache()
+    monkeypatch.setattr(analysis_cache, "_default_cache", cache)
+    analyses, extractions = [], []
+
+    def analyze(resume_text, job_desc_text, resume_sections, job_type="general", context=None):
+        analyses.append(resume_text)
+        return {"total_score": 0.5, "job_type": job_type}
+    monkeypatch.setattr(service, "analyze_resume", analyze)
+    original = service.extract_text_bounded
+    monkeypatch.setattr(service, "extract_text_bounded",
+                        lambda *args, **kwargs: extractions.append(args) or original(*args, **kwargs))
+    pdf_bytes = make_pdf(["Skills", "Python"])
+
+    async def test(port):
+        body = {"resume_text": "Python developer", "job_desc_text": "Python engineer"}
+        return ([await request(port, "POST", "/analyze", body) for _ in range(2)],
+                [await request(port, "POST", "/extract", pdf_bytes, "application/pdf") for _ in range(2)])
+
+    analyzed, extracted = run_service(test, monkeypatch, None)
+    assert [status for status, _, _ in analyzed + extracted] == [200] * 4
+    assert analyzed[0][2] == analyzed[1][2] and extracted[0][2] == extracted[1][2]
+    assert len(analyses) == 1 and len(extractions) == 1
+    assert cache.stats["memory_hits"] == 2
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import tfidf_model
+from matcher import calculate_tfidf_similarity, calculate_tfidf_similarity_batch
+from tfidf_model import TFIDF_MODEL_ENV, fit_model, get_tfidf_model, load_model
+
+CORPUS = [
+    "Backend engineer building Python services on AWS.",
+    "Frontend developer writing React and TypeScript.",
+    "Data engineer maintaining Python pipelines with Spark.",
+    "Experienced Python developer with AWS and Docker.",
+]
+RESUMES = ["Built Python services on AWS with Docker.", "React developer", ""]
+JOB = "Python engineer for AWS services"
+
+
+def test_transform_matches_fitted_vectorizer(tmp_path):
+    fit_model(CORPUS, tmp_path)
+    model = load_model(tmp_path)
+    assert isinstance(model.idf, np.memmap)
+
+    vectorizer = TfidfVectorizer(stop_words="english").fit(CORPUS)
+    expected = cosine_similarity(vectorizer.transform(RESUMES[:2]), vectorizer.transform([JOB]))[:, 0]
+    assert model.similarity(RESUMES[0], JOB) == pytest.approx(expected[0])
+    np.testing.assert_allclose(model.similarity_batch(RESUMES, JOB), list(expected) + [0.0])
+
+
+def test_matcher_uses_model_when_present(tmp_path, monkeypatch):
+    monkeypatch.setenv(TFIDF_MODEL_ENV, str(tmp_path / "missing"))
+    two_document_score = calculate_tfidf_similarity(RESUMES[0], JOB)
+    assert get_tfidf_model() is None
+
+    monkeypatch.setenv(TFIDF_MODEL_ENV, str(tmp_path))
+    model = fit_model(CORPUS, tmp_path)
+    assert get_tfidf_model() is get_tfidf_model()
+    assert get_tfidf_model().digest == model.digest
+    assert calculate_tfidf_similarity(RESUMES[0], JOB) == pytest.approx(model.similarity(RESUMES[0], JOB))
+    assert calculate_tfidf_similarity(RESUMES[0], JOB) != pytest.approx(two_document_score)
+    np.testing.assert_allclose(calculate_tfidf_similarity_batch(RESUMES, JOB), model.similarity_batch(RESUMES, JOB))
+
+
+def test_cli_fits_from_text_files(tmp_path):
+    corpus_dir = tmp_path / "corpus"
+    corpus_dir.mkdir()
+    for i, text in enumerate(CORPUS):
+        (corpus_dir / ("doc%d.txt" % i)).write_text(text)
+
+    tfidf_model.main(["fit", str(corpus_dir), "--model-dir", str(tmp_path / "model")])
+
+    model = load_model(tmp_path / "model")
+    assert "python" in model.vocabulary
+    assert sorted(path.name for path in (tmp_path / "model").iterdir()) == ["idf.npy", "model.json"]
@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import tracing
+from job_specific_scorer import JobSpecificScorer
+from matcher import analyze_resume
+from parser import extract_sections
+
+RESUME = "Skills\nPython, Java\n\nExperience\n- Reduced latency by 40%\n- Built APIs"
+JOB_DESC = "Python developer with API experience"
+
+
+def test_spans_are_free_when_no_trace_is_active():
+    assert tracing.current_trace() is None
+    assert tracing.span("a") is tracing.span("b")
+    assert tracing.request("analyze_resume") is tracing.span("a")
+
+
+def test_trace_records_stages_and_criteria(tmp_path):
+    path = tmp_path / "criteria.json"
+    path.write_text(json.dumps([
+        {"Category": "Section", "Type": "Structure", "Keyword/Pattern": "Skills", "Weight": 0.5, "Notes": ""},
+        {"Category": "Keywords", "Type": "Skills", "Keyword/Pattern": "Python, Java", "Weight": 0.5, "Notes": ""},
+    ]))
+    registry = tracing.Registry()
+    with tracing.trace("test", registry=registry) as trace:
+        sections = extract_sections(RESUME)
+        JobSpecificScorer(path).score_software_engineering_resume(RESUME, sections)
+        JobSpecificScorer(path).score_software_engineering_resume(RESUME, sections)
+
+    timings = trace.as_dict()["stages"]
+    assert timings["sections"]["count"] == 1
+    assert timings["criterion:Section/Skills"]["count"] == 2
+    assert timings["criterion:Keywords/Python, Java"]["count"] == 2
+    assert registry.requests["test"].count == 1
+    assert registry.calls["criterion:Section/Skills"] == 2
+
+
+def test_prometheus_export():
+    registry = tracing.Registry(buckets=(0.01, 0.1))
+    finished = tracing.Trace('analyze "x"')
+    finished.add("tfidf", 0.05)
+    finished.add("tfidf", 0.02)
+    registry.observe(finished)
+
+    text = tracing.export_prometheus(registry)
+    assert "# TYPE resume_reviewer_stage_seconds histogram" in text
+    assert 'resume_reviewer_stage_seconds_bucket{stage="tfidf",le="0.01"} 0' in text
+    assert 'resume_reviewer_stage_seconds_bucket{stage="tfidf",le="0.1"} 1' in text
+    assert 'resume_reviewer_stage_seconds_bucket{stage="tfidf",le="+Inf"} 1' in text
+    assert 'resume_reviewer_stage_calls_total{stage="tfidf"} 2' in text
+    assert 'resume_reviewer_request_seconds_count{name="analyze \\"x\\""} 1' in text
+
+
+def test_enabled_tracing_attaches_timings_to_analysis(monkeypatch):
+    sections = extract_sections(RESUME)
+    assert "trace" not in analyze_resume(RESUME, JOB_DESC, sections, "software_engineering")
+
+    monkeypatch.setattr(tracing, "_enabled", True)
+    tracing.REGISTRY.clear()
+    analysis = analyze_resume(RESUME, JOB_DESC, sections, "software_engineering")
+
+    stages = analysis["trace"]["stages"]
+    assert {"tfidf", "keywords", "spacy.parse", "job_specific"} <= set(stages)
+    assert any(stage.startswith("criterion:") for stage in stages)
+    assert tracing.REGISTRY.requests["analyze_resume"].count == 1
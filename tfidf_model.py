@@ -0,0 +1,193 @@
+"""
+Corpus-fitted TF-IDF model for the keyword similarity score.
+
+``fit`` learns a vocabulary and IDF weights from a corpus of resumes and job
+postings and saves them to a model directory. At request time the model only
+transforms texts, so IDF weights come from the whole corpus instead of the two
+documents being compared, and no vectorizer is refitted per call.
+
+Only the vocabulary and the IDF weights are persisted; document vectors are
+computed on demand with ``transform``. Model directory layout:
+    model.json                   vocabulary, settings and a digest of the model
+    idf.npy                      IDF weight per vocabulary column
+
+The IDF array is loaded with ``mmap_mode='r'``, so worker processes that load
+the same model share the pages through the OS cache instead of each holding a copy.
+
+Usage:
+    python tfidf_model.py fit corpus/resumes corpus/postings --model-dir data/tfidf_model
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+MODEL_VERSION = 1
+
+# Directory of the fitted model; the default location is used when unset.
+TFIDF_MODEL_ENV = "RESUME_REVIEWER_TFIDF_MODEL"
+DEFAULT_MODEL_DIR = Path(__file__).resolve().parent / "data" / "tfidf_model"
+
+
+class TfidfModel:
+    """
+    A fitted, transform-only TF-IDF model.
+
+    Transforms match ``TfidfVectorizer(stop_words='english')`` with a fixed
+    vocabulary and IDF: raw term counts scaled by IDF and L2-normalized.
+    Terms outside the vocabulary are ignored.
+    """
+
+    def __init__(self, vocabulary, idf, digest, model_dir=None):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.digest = digest
+        self.model_dir = Path(model_dir) if model_dir is not None else None
+        self._counter = CountVectorizer(stop_words='english', vocabulary=vocabulary)
+
+    def transform(self, texts):
+        """Returns the L2-normalized TF-IDF vectors of ``texts`` as a CSR matrix."""
+        counts = self._counter.transform(texts).astype(np.float64)
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def similarity(self, resume_text, job_desc_text):
+        """Cosine similarity of two texts under the fitted weights."""
+        if not resume_text or not job_desc_text:
+            return 0.0
+        vectors = self.transform([resume_text, job_desc_text])
+        return float(vectors[0].multiply(vectors[1]).sum())
+
+    def similarity_batch(self, resume_texts, job_desc_text):
+        """Cosine similarity of every resume against one job description."""
+        similarities = np.zeros(len(resume_texts))
+        if not job_desc_text or not resume_texts:
+            return similarities
+        job_vector = self.transform([job_desc_text]).toarray().ravel()
+        similarities[:] = self.transform(resume_texts) @ job_vector
+        return similarities
+
+
+def fit_model(texts, model_dir, min_df=1, max_df=1.0):
+    """
+    Fits a TF-IDF model on a corpus and saves it to ``model_dir``.
+
+    Args:
+        texts: The corpus of resume and job description texts.
+        model_dir: Directory to write the model to.
+        min_df: Ignore terms that occur in fewer documents (count or proportion).
+        max_df: Ignore terms that occur in more documents (count or proportion).
+
+    Returns:
+        The fitted TfidfModel.
+    """
+    vectorizer = TfidfVectorizer(stop_words='english', min_df=min_df, max_df=max_df)
+    vectorizer.fit(texts)
+    vocabulary = {term: int(column) for term, column in sorted(vectorizer.vocabulary_.items(), key=lambda t: t[1])}
+    idf = vectorizer.idf_.astype(np.float64)
+
+    digest = hashlib.sha256(json.dumps(vocabulary).encode("utf-8") + idf.tobytes()).hexdigest()
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    np.save(model_dir / "idf.npy", idf)
+    # model.json is written last: its presence marks a complete model.
+    tmp_path = model_dir / "model.json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MODEL_VERSION, "digest": digest, "documents": len(texts),
+                   "vocabulary": vocabulary}, f)
+    os.replace(tmp_path, model_dir / "model.json")
+    _model_cache.pop(model_dir.resolve(), None)
+    return TfidfModel(vocabulary, idf, digest, model_dir)
+
+
+def load_model(model_dir):
+    """Loads a model saved by ``fit_model``; the IDF array is memory-mapped."""
+    model_dir = Path(model_dir)
+    with open(model_dir / "model.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != MODEL_VERSION:
+        raise ValueError("Unsupported TF-IDF model version: %r" % data.get("version"))
+    idf = np.load(model_dir / "idf.npy", mmap_mode='r')
+    return TfidfModel(data["vocabulary"], idf, data["digest"], model_dir)
+
+
+class _CachedModel(NamedTuple):
+    mtime_ns: int
+    model: Optional[TfidfModel]
+
+
+_model_cache: Dict[Path, _CachedModel] = {}
+_model_lock = threading.Lock()
+
+
+def get_tfidf_model():
+    """
+    Returns the fitted model used for keyword scoring, or None if there is none.
+
+    The model directory is taken from ``RESUME_REVIEWER_TFIDF_MODEL`` or
+    defaults to ``data/tfidf_model``. Models are loaded once per process and
+    reloaded when ``model.json`` is rewritten.
+    """
+    model_dir = Path(os.environ.get(TFIDF_MODEL_ENV) or DEFAULT_MODEL_DIR).resolve()
+    try:
+        mtime_ns = os.stat(model_dir / "model.json").st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _model_cache.get(model_dir)
+    if cached and cached.mtime_ns == mtime_ns:
+        return cached.model
+    with _model_lock:
+        cached = _model_cache.get(model_dir)
+        if not cached or cached.mtime_ns != mtime_ns:
+            cached = _model_cache[model_dir] = _CachedModel(mtime_ns, load_model(model_dir))
+        return cached.model
+
+
+def _read_corpus(inputs):
+    from parser import extract_text_from_pdf
+
+    texts = []
+    for root in inputs:
+        paths = [root] if os.path.isfile(root) else sorted(
+            os.path.join(directory, name) for directory, _, names in os.walk(root) for name in names)
+        for path in paths:
+            if path.lower().endswith(".txt"):
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            elif path.lower().endswith(".pdf"):
+                with open(path, "rb") as f:
+                    text = extract_text_from_pdf(f)
+            else:
+                continue
+            texts.append(text)
+    return texts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the corpus TF-IDF model used for keyword scoring.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    fit = subcommands.add_parser("fit", help="Fit on .txt/.pdf files found in the given files or directories")
+    fit.add_argument("inputs", nargs="+")
+    fit.add_argument("--model-dir", default=str(DEFAULT_MODEL_DIR))
+    fit.add_argument("--min-df", type=float, default=1)
+    fit.add_argument("--max-df", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    texts = _read_corpus(args.inputs)
+    if not texts:
+        parser.error("no .txt or .pdf documents found")
+    min_df = int(args.min_df) if args.min_df >= 1 else args.min_df
+    max_df = int(args.max_df) if args.max_df > 1 else args.max_df
+    model = fit_model(texts, args.model_dir, min_df=min_df, max_df=max_df)
+    print("Fitted %d terms on %d documents into %s" % (len(model.vocabulary), len(texts), args.model_dir))
+
+
+if __name__ == "__main__":
+    main()
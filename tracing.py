@@ -0,0 +1,286 @@
+"""
+Opt-in timing instrumentation for the analysis pipeline.
+
+Code marks its stages with ``span`` or the ``traced`` decorator::
+
+    with tracing.span("keywords"):
+        resume_keywords = keywords_from_doc(context.resume_doc)
+
+    @tracing.traced("sections")
+    def extract_sections(text): ...
+
+When no trace is active, ``span`` returns a shared no-op context manager and
+``traced`` calls straight through, so instrumented code costs one
+context-variable lookup per stage. A trace is active inside ``trace()``, or
+inside ``request()`` when tracing is enabled with ``enable()`` or the
+``RESUME_REVIEWER_TRACING`` environment variable. It records wall time and
+call count per stage; stage times include any nested stages (for example
+``keywords`` includes ``spacy.parse``).
+
+Finished traces are aggregated into per-stage histograms in ``REGISTRY``,
+which ``export_prometheus`` renders in the Prometheus text exposition format.
+"""
+import contextvars
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+
+# Set to 1/true/yes to trace every analyze_resume call.
+TRACING_ENV = "RESUME_REVIEWER_TRACING"
+
+# Histogram bucket upper bounds, in seconds.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL_SPAN = nullcontext()
+_current = contextvars.ContextVar("resume_reviewer_trace", default=None)
+_enabled = os.environ.get(TRACING_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable(enabled=True):
+    """Turns tracing of every ``request()`` on or off for the whole process."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+class Trace:
+    """Wall time and call count per stage for one request."""
+
+    def __init__(self, name="request"):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    def add(self, stage, seconds):
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        """A JSON-serializable snapshot, with stages ordered by time spent."""
+        return {
+            "name": self.name,
+            "total_ms": self.elapsed() * 1000,
+            "stages": {
+                stage: {"count": count, "ms": seconds * 1000}
+                for stage, (count, seconds) in sorted(self.stages.items(), key=lambda item: -item[1][1])
+            },
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "stage", "started")
+
+    def __init__(self, trace, stage):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+def span(stage):
+    """Times the enclosed block as ``stage`` of the active trace, if any."""
+    active = _current.get()
+    if active is None:
+        return _NULL_SPAN
+    return _Span(active, stage)
+
+
+def traced(stage):
+    """Decorator that times every call of a function as ``stage`` of the active trace."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            active = _current.get()
+            if active is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                active.add(stage, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def current_trace():
+    """The active Trace, or None."""
+    return _current.get()
+
+
+@contextmanager
+def trace(name="request", registry=None):
+    """
+    Traces the enclosed block unconditionally and yields the Trace.
+
+    On exit the trace is recorded in ``registry`` (default: ``REGISTRY``).
+    Nested ``trace``/``request`` blocks add to the outer trace instead.
+    """
+    active = _current.get()
+    if active is not None:
+        yield active
+        return
+    new_trace = Trace(name)
+    token = _current.set(new_trace)
+    try:
+        yield new_trace
+    finally:
+        _current.reset(token)
+        (registry or REGISTRY).observe(new_trace)
+
+
+def request(name):
+    """
+    Context manager for one unit of work such as an ``analyze_resume`` call.
+
+    Yields the active trace: the enclosing one, a new one if tracing is
+    enabled, or None when tracing is off.
+    """
+    active = _current.get()
+    if active is not None:
+        return nullcontext(active)
+    if not _enabled:
+        return _NULL_SPAN
+    return trace(name)
+
+
+class Histogram:
+    """Cumulative histogram of observed durations, in seconds."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def cumulative(self):
+        """``(upper bound, count)`` pairs including the ``+Inf`` bucket."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class Registry:
+    """Aggregates finished traces into histograms of request and stage time."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.stages = {}
+        self.calls = {}
+
+    def observe(self, finished):
+        elapsed = finished.elapsed()
+        with self._lock:
+            self._histogram(self.requests, finished.name).observe(elapsed)
+            for stage, (count, seconds) in finished.stages.items():
+                self._histogram(self.stages, stage).observe(seconds)
+                self.calls[stage] = self.calls.get(stage, 0) + count
+
+    def observe_snapshot(self, snapshot):
+        """Records a trace received as ``Trace.as_dict()``, e.g. from a worker process."""
+        with self._lock:
+            self._histogram(self.requests, snapshot["name"]).observe(snapshot["total_ms"] / 1000)
+            for stage, timing in snapshot["stages"].items():
+                self._histogram(self.stages, stage).observe(timing["ms"] / 1000)
+                self.calls[stage] = self.calls.get(stage, 0) + timing["count"]
+
+    def _histogram(self, histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def clear(self):
+        with self._lock:
+            self.requests.clear()
+            self.stages.clear()
+            self.calls.clear()
+
+
+REGISTRY = Registry()
+
+
+def escape_label(value):
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _bound(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def histogram_lines(metric, histogram, labels=""):
+    """
+    Prometheus sample lines for one histogram.
+
+    Args:
+        metric: The metric name.
+        histogram: The Histogram to render.
+        labels: Already rendered labels such as ``'stage="tfidf"'``, or "".
+    """
+    bucket_prefix = labels + "," if labels else ""
+    suffix = "{%s}" % labels if labels else ""
+    lines = ['%s_bucket{%sle="%s"} %d' % (metric, bucket_prefix, _bound(bound), count)
+             for bound, count in histogram.cumulative()]
+    lines.append("%s_sum%s %r" % (metric, suffix, histogram.sum))
+    lines.append("%s_count%s %d" % (metric, suffix, histogram.count))
+    return lines
+
+
+def labelled_histogram_lines(metric, label, histograms):
+    """Prometheus sample lines for a ``{label value: Histogram}`` family."""
+    lines = []
+    for key in sorted(histograms):
+        lines += histogram_lines(metric, histograms[key], '%s="%s"' % (label, escape_label(key)))
+    return lines
+
+
+def export_prometheus(registry=None, prefix="resume_reviewer"):
+    """Renders the registry in the Prometheus text exposition format."""
+    registry = registry or REGISTRY
+    with registry._lock:
+        lines = [
+            "# HELP %s_request_seconds Wall time per traced request." % prefix,
+            "# TYPE %s_request_seconds histogram" % prefix,
+        ]
+        lines += labelled_histogram_lines("%s_request_seconds" % prefix, "name", registry.requests)
+        lines += [
+            "# HELP %s_stage_seconds Wall time per stage and request, including nested stages." % prefix,
+            "# TYPE %s_stage_seconds histogram" % prefix,
+        ]
+        lines += labelled_histogram_lines("%s_stage_seconds" % prefix, "stage", registry.stages)
+        lines += [
+            "# HELP %s_stage_calls_total Number of times each stage ran." % prefix,
+            "# TYPE %s_stage_calls_total counter" % prefix,
+        ]
+        lines += ['%s_stage_calls_total{stage="%s"} %d' % (prefix, escape_label(stage), count)
+                  for stage, count in sorted(registry.calls.items())]
+    return "\n".join(lines) + "\n"